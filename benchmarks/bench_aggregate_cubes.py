@@ -0,0 +1,95 @@
+"""Compara as consultas dos painéis nos cubos com o reagrupamento do DataFrame completo.
+
+Para cada tamanho mede a criação dos cubos, a atualização incremental com 1% dos registros
+alterados e a consulta "registros por raça com o assunto X", reagrupando o DataFrame, nos
+cubos sem cache e nos cubos com cache.
+
+Antes das medições, `check_round_trip` confere os cubos criados vazios, atualizados, consultados,
+gravados e lidos de volta com poucos registros.
+
+Uso: python -m benchmarks.bench_aggregate_cubes [tamanhos separados por vírgula]
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks.synthetic_data import SUBJECTS, synthetic_records
+from src.bi_fuctions.aggregate_cubes import AggregateCubes, build_cubes
+from src.transform_fuctions.transform_data import add_content_hash, build_dataframe
+
+GROUP_BY = ["race"]
+FILTERS = {"subject": SUBJECTS[1], "sex": ["Male", "Female"]}
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def median_ms(function, repeats=20):
+    return statistics.median(timed(function)[1] for _ in range(repeats)) * 1000
+
+
+def full_scan(df):
+    """Consulta sem os cubos: expande os assuntos e reagrupa todas as linhas."""
+    rows = df.assign(subject=df["subjects"].str.split(", ")).explode("subject")
+    rows = rows[(rows["subject"] == FILTERS["subject"]) & rows["sex"].isin(FILTERS["sex"])]
+    return rows.groupby(GROUP_BY, dropna=False).size()
+
+
+def check_round_trip(size=20):
+    """Cubos vazios, atualizados com poucos registros, consultados, gravados e lidos de volta."""
+    df = add_content_hash(build_dataframe(synthetic_records(size)))
+    cubes = AggregateCubes()
+    if cubes.query(GROUP_BY).shape[0] != 0:
+        raise RuntimeError("Os cubos vazios retornaram contagens.")
+
+    counts = cubes.refresh(df)
+    expected = full_scan(df).sort_index()
+    result = cubes.query(GROUP_BY, FILTERS).set_index(GROUP_BY)["records"].sort_index()
+    if counts["added"] != size or result.tolist() != expected.tolist():
+        raise RuntimeError("Os cubos não conferem com o reagrupamento do DataFrame.")
+    if cubes.refresh(df)["unchanged"] != size:
+        raise RuntimeError("A atualização sem alterações mudou os cubos.")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cubes.json.gz")
+        AggregateCubes().save(path)
+        if len(AggregateCubes.load(path)) != 0:
+            raise RuntimeError("Os cubos vazios não foram lidos de volta.")
+        cubes.save(path)
+        loaded = AggregateCubes.load(path)
+    if not loaded.query(GROUP_BY, FILTERS).equals(cubes.query(GROUP_BY, FILTERS)):
+        raise RuntimeError("Os cubos lidos de volta não conferem com os gravados.")
+
+
+def main(sizes=(10_000, 100_000, 500_000)):
+    check_round_trip()
+    print(f"{'registros':>10} {'criação':>9} {'delta 1%':>9} {'DataFrame':>11} {'cubos':>9} {'cache':>9}")
+    for size in sizes:
+        df = add_content_hash(build_dataframe(synthetic_records(size)))
+        cubes, build_seconds = timed(build_cubes, df)
+
+        changed = df.sample(frac=0.01, random_state=0).copy()
+        changed["sex"] = "Female"
+        changed = add_content_hash(changed)
+        _, refresh_seconds = timed(cubes.refresh, changed)
+
+        scan = median_ms(lambda: full_scan(df), repeats=3)
+        cold = median_ms(lambda: (cubes._cache.clear(), cubes.query(GROUP_BY, FILTERS)))
+        warm = median_ms(lambda: cubes.query(GROUP_BY, FILTERS))
+        print(
+            f"{size:>10,} {build_seconds:>8.2f}s {refresh_seconds * 1000:>7.0f}ms "
+            f"{scan:>9.1f}ms {cold:>7.2f}ms {warm:>7.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    if len(sys.argv) > 1:
+        main([int(size) for size in sys.argv[1].split(",")])
+    else:
+        main()
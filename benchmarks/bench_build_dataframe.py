@@ -0,0 +1,51 @@
+"""Compara a construção do DataFrame em passada única com a cadeia original de funções.
+
+Uso: python -m benchmarks.bench_build_dataframe [número de registros]
+"""
+import sys
+import time
+import tracemalloc
+from benchmarks.synthetic_data import synthetic_records
+from src.transform_fuctions.transform_data import (
+    build_dataframe,
+    change_type_values,
+    columns_with_values,
+    create_dataframe,
+    separete_values,
+    transform_data_for_columns,
+    transform_values_for_nan,
+)
+
+
+def legacy_chain(records):
+    data_dict = columns_with_values(transform_data_for_columns(records))
+    df = create_dataframe(data_dict)
+    df = separete_values(df)
+    df = transform_values_for_nan(df)
+    return change_type_values(df)
+
+
+def measure(function, records):
+    start = time.perf_counter()
+    df = function(records)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function(records)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main(count=100_000):
+    records = synthetic_records(count)
+    legacy_df, legacy_time, legacy_peak = measure(legacy_chain, records)
+    built_df, built_time, built_peak = measure(build_dataframe, records)
+    print(f"registros: {count}")
+    print(f"cadeia original: {legacy_time:.3f}s, pico {legacy_peak / 2**20:.1f} MiB")
+    print(f"passada única:   {built_time:.3f}s, pico {built_peak / 2**20:.1f} MiB")
+    print(f"mesmo resultado: {legacy_df.equals(built_df)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,113 @@
+"""Mede a escalabilidade da resolução de entidades e a qualidade dos pares encontrados.
+
+Os registros têm nomes gerados a partir de sílabas, locais de nascimento e faixas de idade
+aleatórios, e uma fração deles ganha uma duplicata com o nome alterado (ordem invertida,
+caixa, acento, erro de digitação ou troca do nome por um alias). Para cada tamanho são
+reportados o tempo, os pares candidatos por registro e a precisão e o recall dos pares.
+
+Uso: python -m benchmarks.bench_entity_resolution [tamanhos separados por vírgula]
+"""
+import logging
+import random
+import sys
+import time
+import pandas as pd
+from src.transform_fuctions.entity_resolution import find_duplicates
+
+SYLLABLES = [
+    "an", "bel", "car", "da", "el", "fer", "gar", "hu", "is", "jo", "ka", "lu", "ma", "nor",
+    "ol", "pa", "quin", "ro", "sa", "ter", "ul", "vi", "wen", "xa", "yo", "zan", "mi", "re",
+    "to", "ne",
+]
+ACCENTS = str.maketrans("aeiou", "áéíóú")
+
+
+def _word(rng, syllables):
+    return "".join(rng.choice(SYLLABLES) for _ in range(syllables)).capitalize()
+
+
+def _variant(rng, first, last, aliases):
+    """Gera uma grafia alternativa do mesmo nome."""
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"{last.upper()}, {first.upper()}", aliases
+    if kind == 1:
+        return f"{first} {last.translate(ACCENTS)}", aliases
+    if kind == 2:
+        position = rng.randrange(1, len(last))
+        return f"{first} {last[:position]}{last[position + 1:]}", aliases
+    if kind == 3 and aliases:
+        return aliases[0], [f"{first} {last}"]
+    return f"{first.lower()} {last.lower()}", aliases
+
+
+def synthetic_people(count, duplicate_rate=0.1, seed=0):
+    """Gera `count` registros, dos quais cerca de `duplicate_rate` são duplicatas de outros."""
+    rng = random.Random(seed)
+    originals = int(count / (1 + duplicate_rate))
+    rows, groups = [], []
+    for i in range(originals):
+        first, last = _word(rng, 2), _word(rng, 3)
+        aliases = [f"{_word(rng, 2)} {last}"] if rng.random() < 0.4 else []
+        age_min = rng.randrange(20, 70)
+        rows.append(
+            {
+                "name": f"{first} {last}",
+                "aliases": aliases,
+                "place_of_birth": f"City {rng.randrange(300)}, State" if rng.random() < 0.9 else None,
+                "age_min": age_min,
+                "age_max": age_min + rng.randrange(6),
+                "_first": first,
+                "_last": last,
+            }
+        )
+        groups.append(i)
+
+    while len(rows) < count:
+        group = rng.randrange(originals)
+        original = rows[group]
+        name, aliases = _variant(rng, original["_first"], original["_last"], original["aliases"])
+        rows.append({**original, "name": name, "aliases": aliases})
+        groups.append(group)
+
+    df = pd.DataFrame(rows).drop(columns=["_first", "_last"])
+    df.insert(0, "uid", [f"{i:032x}" for i in range(len(df))])
+    df["aliases"] = df["aliases"].map(", ".join)
+    for column in ("age_min", "age_max"):
+        df[column] = df[column].astype("Int64")
+    return df, groups
+
+
+def pair_quality(df, pairs, groups):
+    """Calcula a precisão e o recall dos pares em relação às duplicatas geradas."""
+    group_of = dict(zip(df["uid"], groups))
+    found = sum(group_of[left] == group_of[right] for left, right in zip(pairs["uid_left"], pairs["uid_right"]))
+    sizes = pd.Series(groups).value_counts()
+    expected = int((sizes * (sizes - 1) // 2).sum())
+    precision = found / len(pairs) if len(pairs) else 1.0
+    recall = found / expected if expected else 1.0
+    return precision, recall
+
+
+def main(sizes=(10_000, 20_000, 50_000, 100_000, 200_000)):
+    print(f"{'registros':>10} {'tempo':>8} {'us/registro':>12} {'candidatos/registro':>20} "
+          f"{'pares':>8} {'precisão':>9} {'recall':>7}")
+    for size in sizes:
+        df, groups = synthetic_people(size)
+        started_at = time.perf_counter()
+        pairs = find_duplicates(df)
+        seconds = time.perf_counter() - started_at
+        stats = pairs.attrs["entity_resolution"]
+        precision, recall = pair_quality(df, pairs, groups)
+        print(
+            f"{size:>10,} {seconds:>7.2f}s {seconds / size * 1e6:>12.1f} "
+            f"{stats['candidate_pairs'] / size:>20.2f} {len(pairs):>8,} {precision:>9.3f} {recall:>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    if len(sys.argv) > 1:
+        main([int(size) for size in sys.argv[1].split(",")])
+    else:
+        main()
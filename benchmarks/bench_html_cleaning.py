@@ -0,0 +1,51 @@
+"""Compara a limpeza de HTML em passada única com o laço original de substituições.
+
+Uso: python -m benchmarks.bench_html_cleaning [número de linhas]
+"""
+import re
+import sys
+import time
+from benchmarks.synthetic_data import synthetic_records
+from src.transform_fuctions.transform_data import (
+    build_dataframe,
+    transform_values_str_with_replace,
+)
+
+
+def legacy_transform_values_str_with_replace(df):
+    """Implementação anterior: 10 strings x 3 colunas = 30 passadas completas."""
+    strings_for_replace = [
+        "<p>", "</p>", "<ul>", "</ul>", "\r", "\n", "<li>", "</li>", "<a>", "</a>",
+    ]
+    for string in strings_for_replace:
+        df["details"] = df["details"].str.replace(re.escape(string), "", regex=True)
+        df["reward_text"] = df["reward_text"].str.replace(
+            re.escape(string), "", regex=True
+        )
+        df["caution"] = df["caution"].str.replace(re.escape(string), "", regex=True)
+    return df
+
+
+def synthetic_frame(rows):
+    df = build_dataframe(synthetic_records(rows))
+    return df[["details", "reward_text", "caution"]].astype(object)
+
+
+def timed(function, df):
+    start = time.perf_counter()
+    function(df.copy())
+    return time.perf_counter() - start
+
+
+def main(rows=200_000):
+    df = synthetic_frame(rows)
+    legacy = timed(legacy_transform_values_str_with_replace, df)
+    single_pass = timed(transform_values_str_with_replace, df)
+    print(f"linhas: {rows}")
+    print(f"laço original:  {legacy:.3f}s ({legacy / rows * 1e6:.2f} us/linha)")
+    print(f"passada única:  {single_pass:.3f}s ({single_pass / rows * 1e6:.2f} us/linha)")
+    print(f"ganho:          {legacy / single_pass:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,71 @@
+"""Mede a vazão da carga particionada no MySQL para diferentes números de partições.
+
+Usa as credenciais do `.env` (veja `get_credentials`) e recria a tabela de benchmark a cada
+medição. Uso: python -m benchmarks.bench_parallel_load [registros] [partições separadas por vírgula]
+"""
+import sys
+from benchmarks.synthetic_data import synthetic_records
+from src.load_fuctions.mysql_database import (
+    create_connection_pool,
+    get_credentials,
+    pooled_connection,
+)
+from src.load_fuctions.parallel_loader import load_partitioned
+from src.load_fuctions.schema_fuctions import generate_create_table
+from src.transform_fuctions.transform_data import (
+    add_content_hash,
+    build_dataframe,
+    change_type_values,
+    transform_values_str_with_replace,
+)
+
+TABLE_NAME = "bench_wanted"
+
+
+def synthetic_frame(count):
+    records = synthetic_records(count)
+    df = change_type_values(transform_values_str_with_replace(build_dataframe(records)))
+    return add_content_hash(df)
+
+
+def reset_table(pool, df):
+    with pooled_connection(pool) as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS `{TABLE_NAME}`")
+        cursor.execute(generate_create_table(df, TABLE_NAME, primary_key="uid"))
+        connection.commit()
+        cursor.close()
+
+
+def main(count=200_000, partition_counts=(1, 2, 4, 8)):
+    username, password, host, database = get_credentials()
+    pool = create_connection_pool(
+        username=username,
+        password=password,
+        host=host,
+        database=database,
+        pool_size=max(partition_counts) + 1,
+        pool_name="bench_parallel_load",
+    )
+    df = synthetic_frame(count)
+
+    baseline = None
+    print(f"registros: {count}")
+    for partitions in partition_counts:
+        reset_table(pool, df)
+        report = load_partitioned(pool, df, TABLE_NAME, partitions=partitions)
+        baseline = baseline or report["rows_per_second"]
+        print(
+            f"partições: {partitions:>2}  {report['rows_per_second']:>10,.0f} linhas/s  "
+            f"ganho {report['rows_per_second'] / baseline:.2f}x  consistente: {report['consistent']}"
+        )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    partitions = (
+        tuple(int(value) for value in sys.argv[2].split(","))
+        if len(sys.argv) > 2
+        else (1, 2, 4, 8)
+    )
+    main(count, partitions)
@@ -0,0 +1,85 @@
+"""Compara a busca no índice invertido com a varredura `str.contains` sobre o DataFrame.
+
+Mede a construção do índice, a latência das consultas com e sem os scores em cache, a
+atualização incremental de 1% dos registros e a gravação e leitura do índice.
+
+Uso: python -m benchmarks.bench_search [número de linhas]
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks.synthetic_data import synthetic_records
+from src.search_fuctions.inverted_index import InvertedIndex, build_index
+from src.transform_fuctions.transform_data import (
+    add_content_hash,
+    build_dataframe,
+    transform_values_str_with_replace,
+)
+
+QUERIES = {
+    "termo": ("tattoo", ["tattoo"]),
+    "AND": ("bank robbery", ["bank", "robbery"]),
+    "OR": ("fraud OR scar", None),
+    "prefixo": ("robb*", ["robb"]),
+}
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def median_ms(function, repeats):
+    timings = [timed(function)[1] for _ in range(repeats)]
+    return statistics.median(timings) * 1000
+
+
+def contains_scan(df, terms):
+    """Varredura usada antes do índice: todas as linhas, em todas as colunas, para cada termo."""
+    mask = None
+    for term in terms:
+        found = (
+            df["details"].str.contains(term, case=False, na=False)
+            | df["aliases"].str.contains(term, case=False, na=False)
+            | df["scars_and_marks"].str.contains(term, case=False, na=False)
+        )
+        mask = found if mask is None else mask & found
+    return df[mask]
+
+
+def main(rows=300_000, repeats=50):
+    df = add_content_hash(transform_values_str_with_replace(build_dataframe(synthetic_records(rows))))
+    index, seconds = timed(build_index, df)
+    print(f"linhas: {rows}")
+    print(f"construção do índice:      {seconds:.2f}s ({rows / seconds:,.0f} linhas/s)")
+
+    for name, (query, terms) in QUERIES.items():
+        matches = len(index.search(query, limit=None))
+        warm = median_ms(lambda: index.search(query), repeats)
+        cold = median_ms(lambda: (index._invalidate(), index.search(query)), repeats)
+        line = f"consulta {name:<8} {query!r:<16} {matches:>8} docs  {warm:.3f} ms (cache)  {cold:.3f} ms (sem cache)"
+        if terms:
+            line += f"  str.contains: {median_ms(lambda: contains_scan(df, terms), 3):.1f} ms"
+        print(line)
+
+    changed = df.sample(frac=0.01, random_state=0).copy()
+    changed["details"] = changed["details"] + " updated"
+    changed = add_content_hash(changed)
+    _, seconds = timed(index.update_from_dataframe, changed)
+    print(f"atualização de {len(changed)} registros: {seconds * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.npz")
+        _, seconds = timed(index.save, path)
+        print(f"gravação do índice:        {seconds:.2f}s ({os.path.getsize(path) / 1e6:.1f} MB)")
+        _, seconds = timed(InvertedIndex.load, path)
+        print(f"leitura do índice:         {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
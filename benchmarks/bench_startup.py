@@ -0,0 +1,95 @@
+"""Mede o tempo de inicialização da linha de comando e o custo das importações de cada subcomando.
+
+Cada cenário é executado em um processo novo, várias vezes, e a mediana é reportada. O
+cenário "importação completa" reproduz o `main.py` anterior, que importava todos os
+módulos (pandas, numpy, mysql.connector, requests, dotenv) antes de qualquer coisa.
+
+Uso: python -m benchmarks.bench_startup [repetições] [--output arquivo.json]
+"""
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("pandas", "numpy", "mysql.connector", "requests", "pyarrow", "dotenv")
+
+EXTRACT_IMPORTS = (
+    "src.extract_fuctions.extract_data",
+    "src.extract_fuctions.page_archive",
+    "src.extract_fuctions.rate_limiter",
+    "src.extract_fuctions.response_cache",
+    "src.extract_fuctions.watermark",
+)
+TRANSFORM_IMPORTS = (
+    "src.transform_fuctions.transform_data",
+    "src.load_fuctions.parquet_sink",
+)
+LOAD_IMPORTS = (
+    "src.load_fuctions.mysql_database",
+    "src.load_fuctions.query_fuctions",
+    "src.load_fuctions.bulk_loader",
+    "src.load_fuctions.parallel_loader",
+    "src.load_fuctions.parquet_sink",
+)
+
+
+def _imports(modules):
+    return ["-c", "import src.cli_fuctions.cli; import " + ", ".join(modules)]
+
+
+SCENARIOS = {
+    "main.py --help": ["main.py", "--help"],
+    "main.py extract --help": ["main.py", "extract", "--help"],
+    "main.py load --help": ["main.py", "load", "--help"],
+    "importações do extract": _imports(EXTRACT_IMPORTS),
+    "importações do transform": _imports(TRANSFORM_IMPORTS),
+    "importações do load": _imports(LOAD_IMPORTS),
+    "importação completa (antes)": _imports(
+        EXTRACT_IMPORTS + TRANSFORM_IMPORTS + LOAD_IMPORTS
+    ),
+}
+
+
+def run_once(arguments):
+    started_at = time.perf_counter()
+    subprocess.run([sys.executable, *arguments], check=True, capture_output=True)
+    return time.perf_counter() - started_at
+
+
+def heavy_modules_loaded(arguments):
+    """Lista os módulos pesados importados pelo cenário, a partir do `-X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()}
+    return [module for module in HEAVY_MODULES if module in imported]
+
+
+def main(repeats=5, output=None):
+    results = []
+    for name, arguments in SCENARIOS.items():
+        run_once(arguments)
+        timings = [run_once(arguments) for _ in range(repeats)]
+        median = statistics.median(timings)
+        heavy = heavy_modules_loaded(arguments)
+        results.append({"scenario": name, "median_seconds": round(median, 4), "heavy_modules": heavy})
+        print(f"{name:<30} {median * 1000:>8.1f} ms  {', '.join(heavy) or '-'}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump({"repeats": repeats, "results": results}, file, indent=2)
+        print(f"\nResultados gravados em {output}")
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    output = None
+    if "--output" in arguments:
+        index = arguments.index("--output")
+        output = arguments[index + 1]
+        del arguments[index : index + 2]
+    main(int(arguments[0]) if arguments else 5, output)
@@ -0,0 +1,144 @@
+"""Servidor HTTP local que imita o endpoint `/wanted/v1/list` da API do FBI Wanted.
+
+Os itens vêm de `synthetic_data.synthetic_item` e são gerados sob demanda para cada página,
+então mesmo um milhão de registros não fica em memória. A latência e a fração de respostas
+429 são configuráveis, e as páginas respondem a `If-None-Match` com 304.
+
+Uso isolado: python -m benchmarks.fake_api [registros] [porta]
+"""
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from benchmarks.synthetic_data import synthetic_items
+
+LIST_PATH = "/wanted/v1/list"
+
+
+class FakeWantedAPI:
+    """API falsa do FBI Wanted, usada como gerenciador de contexto.
+
+    Args:
+        total (int): Número total de registros servidos.
+        page_size (int): Itens por página quando a requisição não informa `pageSize` (default: 20).
+        max_page_size (int): Maior `pageSize` aceito, como o limite da API real (default: 1000).
+        latency (float): Atraso, em segundos, antes de cada resposta (default: 0).
+        throttle_rate (float): Fração das requisições respondidas com 429 (default: 0).
+        retry_after (int): Valor do header Retry-After nas respostas 429 (default: 0).
+        port (int): Porta local; 0 escolhe uma porta livre (default: 0).
+        seed (int): Semente do sorteio das respostas 429 (default: 0).
+    """
+
+    def __init__(
+        self,
+        total,
+        page_size=20,
+        max_page_size=1000,
+        latency=0.0,
+        throttle_rate=0.0,
+        retry_after=0,
+        port=0,
+        seed=0,
+    ):
+        self.total = total
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}{LIST_PATH}"
+
+    def page_body(self, page, page_size):
+        """Monta o corpo JSON de uma página, como a API real."""
+        start = (page - 1) * page_size
+        count = max(0, min(page_size, self.total - start))
+        body = {"total": self.total, "items": synthetic_items(count, start=start), "page": page}
+        return json.dumps(body).encode("utf-8")
+
+    def _should_throttle(self):
+        with self._lock:
+            self.requests += 1
+            throttle = self._random.random() < self.throttle_rate
+            self.throttled += throttle
+            return throttle
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path != LIST_PATH:
+                    self.send_error(404)
+                    return
+                if api.latency:
+                    time.sleep(api.latency)
+                if api._should_throttle():
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(api.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                query = parse_qs(parsed.query)
+                page = int(query.get("page", ["1"])[0])
+                page_size = int(query.get("pageSize", [api.page_size])[0])
+                body = api.page_body(page, min(page_size, api.max_page_size))
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    with FakeWantedAPI(total=total, port=port) as api:
+        print(f"API falsa com {total} registros em {api.url} (Ctrl+C para sair)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,281 @@
+"""Executa os cenários de benchmark do ETL e grava os resultados em JSON.
+
+Cada cenário roda para cada tamanho pedido: extração a partir da API falsa local
+(`fake_api.py`), cada função de transformação sobre registros sintéticos (`synthetic_data.py`)
+e a carga em um banco SQLite local. Os resultados ficam em `benchmarks/results/`, com o
+commit atual, e podem ser comparados com um arquivo anterior via `--compare`.
+
+Uso:
+    python -m benchmarks.run_benchmarks --sizes 1000,10000,100000
+    python -m benchmarks.run_benchmarks --sizes 1000000 --groups transform,load
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<anterior>.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+import pandas as pd
+from benchmarks.fake_api import FakeWantedAPI
+from benchmarks.synthetic_data import synthetic_items, synthetic_records
+from src.extract_fuctions.extract_data import iter_wanted_pages, iteration_data_wanted
+from src.extract_fuctions.rate_limiter import RateLimiter
+from src.load_fuctions.bulk_loader import insert_dataframe_batched, quote_identifier, upsert_dataframe
+from src.load_fuctions.parquet_sink import read_parquet_snapshot, write_parquet_snapshot
+from src.pipeline_fuctions.instrumentation import HttpStats, peak_rss_bytes
+from src.transform_fuctions.normalize_data import explode_child_tables
+from src.transform_fuctions.transform_data import (
+    add_content_hash,
+    build_dataframe,
+    change_type_values,
+    columns_with_values,
+    create_dataframe,
+    optimize_dtypes,
+    separete_values,
+    transform_data_for_columns,
+    transform_values_for_nan,
+    transform_values_str_with_replace,
+)
+
+GROUPS = ("extract", "transform", "load")
+RESULTS_DIR = os.path.join("benchmarks", "results")
+TABLE_NAME = "bench_wanted"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(function, *args, **kwargs):
+    """Executa a função uma vez e retorna o resultado e o tempo gasto em segundos."""
+    started_at = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started_at
+
+
+def bench_extract(size, page_size, latency, throttle_rate, max_workers):
+    stats = HttpStats()
+    with FakeWantedAPI(
+        total=size, max_page_size=page_size, latency=latency, throttle_rate=throttle_rate
+    ) as api:
+        pages, seconds = measure(
+            lambda: list(
+                iter_wanted_pages(
+                    url=api.url,
+                    headers={},
+                    max_workers=max_workers,
+                    page_size=page_size,
+                    rate_limiter=RateLimiter(rate=1000, burst=max_workers),
+                    http_stats=stats,
+                )
+            )
+        )
+    rows = sum(len(page["items"]) for page in pages)
+    if rows != size:
+        raise RuntimeError(f"Extração incompleta: {rows} de {size} registros.")
+    yield "extract.iter_wanted_pages", seconds, {"http": stats.to_dict()}
+
+
+def legacy_chain(records):
+    df = create_dataframe(columns_with_values(transform_data_for_columns(records)))
+    return change_type_values(transform_values_for_nan(separete_values(df)))
+
+
+def bench_transform(size):
+    items = synthetic_items(size)
+    records, seconds = measure(iteration_data_wanted, [{"items": items}])
+    del items
+    yield "extract.iteration_data_wanted", seconds, {}
+
+    _, seconds = measure(legacy_chain, records)
+    yield "transform.legacy_chain", seconds, {}
+
+    df, seconds = measure(build_dataframe, records)
+    yield "transform.build_dataframe", seconds, {}
+
+    df, seconds = measure(transform_values_str_with_replace, df)
+    yield "transform.transform_values_str_with_replace", seconds, {}
+
+    df, seconds = measure(change_type_values, df)
+    yield "transform.change_type_values", seconds, {}
+
+    optimized, seconds = measure(optimize_dtypes, df.copy())
+    yield "transform.optimize_dtypes", seconds, dict(optimized.attrs.get("memory_usage", {}))
+    del optimized
+
+    _, seconds = measure(add_content_hash, df)
+    yield "transform.add_content_hash", seconds, {}
+
+    with_lists = build_dataframe(records, keep_lists=True)
+    _, seconds = measure(explode_child_tables, with_lists)
+    yield "transform.explode_child_tables", seconds, {}
+
+
+def _create_sqlite_table(connection, df):
+    columns = ", ".join(quote_identifier(column) for column in df.columns)
+    connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(TABLE_NAME)}")
+    connection.execute(
+        f"CREATE TABLE {quote_identifier(TABLE_NAME)} ({columns}, PRIMARY KEY (`uid`))"
+    )
+
+
+def bench_load(size, batch_size):
+    df = build_dataframe(synthetic_records(size))
+    df = add_content_hash(change_type_values(transform_values_str_with_replace(df)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection = sqlite3.connect(os.path.join(directory, "bench.db"))
+        try:
+            _create_sqlite_table(connection, df)
+            _, seconds = measure(
+                insert_dataframe_batched, connection, df, TABLE_NAME, batch_size=batch_size
+            )
+            yield "load.insert_dataframe_batched", seconds, {}
+
+            _create_sqlite_table(connection, df)
+            _, seconds = measure(
+                upsert_dataframe, connection, df, TABLE_NAME, batch_size=batch_size
+            )
+            yield "load.upsert_dataframe.insert", seconds, {}
+
+            _, seconds = measure(
+                upsert_dataframe, connection, df, TABLE_NAME, batch_size=batch_size
+            )
+            yield "load.upsert_dataframe.unchanged", seconds, {}
+        finally:
+            connection.close()
+
+        dataset_dir = os.path.join(directory, "parquet")
+        _, seconds = measure(write_parquet_snapshot, df, dataset_dir)
+        yield "load.write_parquet_snapshot", seconds, {}
+
+        _, seconds = measure(
+            read_parquet_snapshot,
+            dataset_dir,
+            columns=["uid", "name", "age_min"],
+            filters=[("sex", "==", "Female"), ("age_min", ">=", 40)],
+        )
+        yield "load.read_parquet_snapshot.filtered", seconds, {}
+
+
+def run(args):
+    results = []
+    for size in args.sizes:
+        scenarios = []
+        if "extract" in args.groups:
+            scenarios.append(
+                bench_extract(
+                    size, args.page_size, args.latency, args.throttle_rate, args.max_workers
+                )
+            )
+        if "transform" in args.groups:
+            scenarios.append(bench_transform(size))
+        if "load" in args.groups:
+            scenarios.append(bench_load(size, args.batch_size))
+
+        for scenario in scenarios:
+            for name, seconds, extra in scenario:
+                result = {
+                    "scenario": name,
+                    "size": size,
+                    "seconds": round(seconds, 6),
+                    "rows_per_second": round(size / seconds, 2) if seconds else None,
+                    **extra,
+                }
+                results.append(result)
+                print(
+                    f"{name:<48} {size:>9,}  {seconds:>9.3f}s  "
+                    f"{result['rows_per_second'] or 0:>12,.0f} linhas/s"
+                )
+    return results
+
+
+def compare(results, previous_path):
+    with open(previous_path, "r", encoding="utf-8") as file:
+        previous = {
+            (result["scenario"], result["size"]): result["seconds"]
+            for result in json.load(file)["results"]
+        }
+    print(f"\nComparação com {previous_path} (tempo anterior / tempo atual):")
+    for result in results:
+        before = previous.get((result["scenario"], result["size"]))
+        if before and result["seconds"]:
+            print(
+                f"{result['scenario']:<48} {result['size']:>9,}  {before / result['seconds']:>6.2f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do ETL do FBI Wanted.")
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        type=lambda value: [int(size) for size in value.split(",")],
+        help="Tamanhos em registros, separados por vírgula (ex.: 1000,10000,100000,1000000).",
+    )
+    parser.add_argument(
+        "--groups",
+        default=",".join(GROUPS),
+        type=lambda value: value.split(","),
+        help="Grupos de cenários: extract, transform e load.",
+    )
+    parser.add_argument("--page-size", type=int, default=500, help="Itens por página da API falsa.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Latência por requisição, em segundos.")
+    parser.add_argument("--throttle-rate", type=float, default=0.02, help="Fração de respostas 429.")
+    parser.add_argument("--max-workers", type=int, default=8, help="Requisições simultâneas na extração.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Linhas por INSERT na carga.")
+    parser.add_argument("--output", help="Arquivo JSON de saída (default: benchmarks/results/).")
+    parser.add_argument("--compare", help="Arquivo JSON de uma execução anterior.")
+    args = parser.parse_args()
+
+    unknown = set(args.groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"Grupos desconhecidos: {', '.join(sorted(unknown))}.")
+
+    logging.disable(logging.INFO)
+    started_at = datetime.now(timezone.utc)
+    commit = _git_commit()
+    results = run(args)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{started_at.strftime('%Y%m%dT%H%M%SZ')}-{commit or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "started_at": started_at.isoformat(),
+                "commit": commit,
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "platform": platform.platform(),
+                "parameters": {
+                    key: value for key, value in vars(args).items() if key not in ("output", "compare")
+                },
+                "peak_rss_bytes": peak_rss_bytes(),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
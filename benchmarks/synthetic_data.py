@@ -0,0 +1,68 @@
+"""Gerador determinístico de itens sintéticos no formato da API do FBI Wanted.
+
+Os itens seguem o formato consumido por `iteration_data_wanted` (campos `title`, `race_raw`,
+listas de aliases, textos com HTML etc.), e os registros são produzidos pela mesma função
+usada na extração, de forma que os benchmarks exercitam o mesmo caminho do ETL.
+"""
+from datetime import datetime, timedelta, timezone
+from src.extract_fuctions.extract_data import _person_from_item
+
+SEXES = ["Male", "Female", None]
+RACES = ["White", "Black", "Hispanic", "Asian", "Native American", None]
+SUBJECTS = [
+    "Violent Crime - Murders",
+    "ViCAP Missing Persons",
+    "Cyber's Most Wanted",
+    "White-Collar Crime",
+    "Kidnappings and Missing Persons",
+]
+OCCUPATIONS = ["Mechanic", "Driver", "Accountant", "Nurse", "Construction Worker"]
+DETAILS_TEXTS = [
+    "<p>Wanted for <a href=\"https://www.fbi.gov\">bank robbery</a> &amp; fraud, case {i}.</p>\r\n",
+    "<ul><li>Armed since {i}</li>\r\n<li>Dangerous &#8211; do not approach</li></ul>",
+    "<p>{name} was last seen in City {city}, State.</p>",
+    None,
+]
+REWARD_TEXTS = [
+    "<p>The FBI is offering a reward of up to ${i} for information.</p>",
+    None,
+]
+BASE_MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def synthetic_item(i):
+    """Gera o item de índice `i`, sempre com o mesmo conteúdo para o mesmo índice."""
+    name = f"PERSON {i}"
+    city = i % 500
+    details = DETAILS_TEXTS[i % len(DETAILS_TEXTS)]
+    reward = REWARD_TEXTS[i % len(REWARD_TEXTS)]
+    return {
+        "uid": f"{i:032x}",
+        "title": name,
+        "age_max": None if i % 11 == 0 else 30 + i % 40,
+        "age_min": None if i % 7 == 0 else 25 + i % 40,
+        "sex": SEXES[i % len(SEXES)],
+        "warning_message": "SHOULD BE CONSIDERED ARMED AND DANGEROUS" if i % 5 == 0 else None,
+        "race_raw": RACES[i % len(RACES)],
+        "place_of_birth": f"City {city}, State",
+        "details": details.format(i=i, name=name, city=city) if details else None,
+        "occupations": OCCUPATIONS[i % 3 : i % 3 + i % 3] or None,
+        "field_offices": [f"office{i % 56}"],
+        "locations": [f"Location {i % 50}"],
+        "subjects": SUBJECTS[: 1 + i % 2],
+        "aliases": [f"Alias {i}", f"Nick {i % 97}"] if i % 4 else None,
+        "reward_text": reward.format(i=i) if reward else None,
+        "scars_and_marks": "Tattoo on left arm" if i % 4 == 0 else None,
+        "caution": "<p>Considered armed &amp; dangerous.</p>" if i % 6 == 0 else None,
+        "modified": (BASE_MODIFIED - timedelta(minutes=i)).isoformat(),
+    }
+
+
+def synthetic_items(count, start=0):
+    """Gera `count` itens a partir do índice `start`."""
+    return [synthetic_item(i) for i in range(start, start + count)]
+
+
+def synthetic_records(count):
+    """Gera `count` registros no formato devolvido por `iteration_data_wanted`."""
+    return [_person_from_item(synthetic_item(i)) for i in range(count)]
@@ -0,0 +1,345 @@
+import gzip
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+from colorama import Fore, Style
+
+SCALAR_DIMENSIONS = ["sex", "race", "age_bucket", "has_reward"]
+# Dimensões que vêm das colunas de listas: um registro conta uma vez em cada valor da lista.
+LIST_DIMENSIONS = {"subject": "subjects", "location": "locations"}
+DIMENSIONS = SCALAR_DIMENSIONS + list(LIST_DIMENSIONS)
+# Um cubo para cada combinação de dimensões de listas. Agregar um cubo que não tem uma
+# dimensão de lista nunca soma o mesmo registro duas vezes.
+CUBOIDS = [(), ("subject",), ("location",), ("subject", "location")]
+AGE_BINS = [-np.inf, 17, 29, 39, 49, 59, np.inf]
+AGE_LABELS = ["0-17", "18-29", "30-39", "40-49", "50-59", "60+"]
+UNKNOWN = "Não informado"
+LIST_SEPARATOR = ", "
+COUNT_COLUMN = "records"
+QUERY_CACHE_SIZE = 256
+HASH_COLUMN = "content_hash"
+RECORD_COLUMNS = [HASH_COLUMN, *SCALAR_DIMENSIONS, *LIST_DIMENSIONS.values()]
+
+
+def _as_tuple(value):
+    """Converte o valor de uma coluna de listas, em string ou lista, em uma tupla."""
+    if isinstance(value, str):
+        return tuple(value.split(LIST_SEPARATOR)) if value else ()
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(str(item) for item in value)
+    return ()
+
+
+def age_buckets(df):
+    """
+    Classifica cada registro em uma faixa de idade, a partir de `age_min` ou, na falta dele,
+    `age_max`.
+
+    Args:
+        df (pd.DataFrame): O DataFrame com as colunas `age_min` e `age_max`.
+
+    Returns:
+        pd.Series: A faixa de idade de cada registro, ou `UNKNOWN` sem nenhuma das idades.
+    """
+    ages = pd.to_numeric(df["age_min"], errors="coerce").fillna(
+        pd.to_numeric(df["age_max"], errors="coerce")
+    )
+    buckets = pd.cut(ages.astype(float), bins=AGE_BINS, labels=AGE_LABELS)
+    return buckets.astype(object).where(buckets.notna(), UNKNOWN)
+
+
+def record_dimensions(df, key="uid", hash_column="content_hash"):
+    """
+    Extrai de cada registro os valores das dimensões dos cubos.
+
+    Args:
+        df (pd.DataFrame): O DataFrame transformado.
+        key (str): Coluna com o identificador do registro (default: "uid").
+        hash_column (str): Coluna com o hash do conteúdo (default: "content_hash").
+
+    Returns:
+        pd.DataFrame: Indexado por `key`, com o hash em `HASH_COLUMN`, as dimensões escalares e
+            as listas de assuntos e localizações em tuplas.
+    """
+    dimensions = pd.DataFrame(index=pd.Index(df[key].to_numpy(), name=key))
+    dimensions[HASH_COLUMN] = (
+        df[hash_column].to_numpy() if hash_column in df.columns else None
+    )
+    for column in ("sex", "race"):
+        values = df[column].astype(object)
+        dimensions[column] = values.where(values.notna(), UNKNOWN).to_numpy()
+    dimensions["age_bucket"] = age_buckets(df).to_numpy()
+    reward = df["reward_text"].astype(object)
+    dimensions["has_reward"] = (reward.notna() & (reward != "")).to_numpy()
+    for dimension, column in LIST_DIMENSIONS.items():
+        dimensions[column] = [_as_tuple(value) for value in df[column].tolist()]
+    return dimensions
+
+
+def _empty_cells(cuboid):
+    """Cria as contagens vazias de um cubo, já com os níveis do índice nomeados."""
+    levels = SCALAR_DIMENSIONS + list(cuboid)
+    index = pd.MultiIndex.from_arrays([[] for _ in levels], names=levels)
+    return pd.Series(index=index, dtype=np.int64, name=COUNT_COLUMN)
+
+
+def _cells(dimensions, cuboid):
+    """Conta os registros por combinação de dimensões do cubo, expandindo as listas."""
+    # Agrupar um DataFrame vazio falha em algumas versões do pandas.
+    if dimensions.empty:
+        return _empty_cells(cuboid)
+    cells = dimensions[SCALAR_DIMENSIONS].copy()
+    for dimension in cuboid:
+        cells[dimension] = dimensions[LIST_DIMENSIONS[dimension]].map(
+            lambda values: values or (UNKNOWN,)
+        )
+        cells = cells.explode(dimension)
+    levels = SCALAR_DIMENSIONS + list(cuboid)
+    counts = cells.groupby(levels, observed=True, sort=False).size()
+    return counts.rename(COUNT_COLUMN)
+
+
+class AggregateCubes:
+    """Contagens pré-agregadas dos registros para os painéis do Mini BI.
+
+    Cada cubo guarda o número de registros por combinação das dimensões escalares (sexo,
+    raça, faixa de idade e presença de recompensa) e das dimensões de listas do cubo. Uma
+    consulta agrega o menor cubo que contém as dimensões usadas, então o seu custo depende
+    do número de combinações, não do número de registros.
+
+    As dimensões de cada registro ficam guardadas em um dicionário por uid, junto com o
+    `content_hash`, de forma que `refresh` aplica aos cubos apenas a diferença entre a
+    versão antiga e a nova dos registros alterados, sem copiar os demais. Os resultados das
+    consultas ficam em cache pela combinação de agrupamento e filtros até a próxima
+    atualização.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._cuboids = {cuboid: _empty_cells(cuboid) for cuboid in CUBOIDS}
+        self._cache = {}
+
+    def _record_frame(self, keys):
+        """Monta o DataFrame das dimensões guardadas dos registros pedidos."""
+        return pd.DataFrame(
+            [self._records[key] for key in keys],
+            columns=RECORD_COLUMNS,
+            index=pd.Index(list(keys), dtype=object),
+        )
+
+    def __len__(self):
+        return len(self._records)
+
+    def refresh(self, df, key="uid", hash_column="content_hash", remove_missing=False):
+        """
+        Atualiza os cubos com os registros novos ou alterados de um DataFrame.
+
+        Registros cujo `content_hash` não mudou são ignorados. Para os alterados, a
+        contribuição da versão antiga é subtraída e a da nova é somada, sem reagrupar os
+        demais registros.
+
+        Args:
+            df (pd.DataFrame): O DataFrame transformado, completo ou apenas com o delta da
+                extração incremental.
+            key (str): Coluna com o identificador do registro (default: "uid").
+            hash_column (str): Coluna com o hash do conteúdo; sem ela, todos os registros são
+                tratados como alterados (default: "content_hash").
+            remove_missing (bool): Se True, trata o DataFrame como a extração completa e
+                remove dos cubos os registros que não estão nele (default: False).
+
+        Returns:
+            dict: Quantidade de registros adicionados, atualizados, inalterados e removidos.
+        """
+        df = df.drop_duplicates(subset=[key], keep="last")
+        keys = df[key].tolist()
+        stored = [self._records.get(uid) for uid in keys]
+        exists = np.array([row is not None for row in stored], dtype=bool)
+        if hash_column in df.columns:
+            unchanged = [
+                row is not None and row[0] == content_hash
+                for row, content_hash in zip(stored, df[hash_column].tolist())
+            ]
+            changed = ~np.array(unchanged, dtype=bool)
+        else:
+            changed = np.ones(len(df), dtype=bool)
+
+        new = record_dimensions(df[changed], key=key, hash_column=hash_column)
+        old_keys = list(new.index[exists[changed]])
+        removed_keys = list(self._records.keys() - set(keys)) if remove_missing else []
+        old = self._record_frame(old_keys + removed_keys)
+
+        counts = {
+            "added": int((changed & ~exists).sum()),
+            "updated": len(old_keys),
+            "unchanged": int((~changed).sum()),
+            "removed": len(removed_keys),
+        }
+        if len(new) or len(old):
+            for cuboid in CUBOIDS:
+                delta = _cells(new, cuboid).sub(_cells(old, cuboid), fill_value=0)
+                updated = self._cuboids[cuboid].add(delta, fill_value=0)
+                self._cuboids[cuboid] = updated[updated != 0].astype(np.int64)
+            for uid in removed_keys:
+                del self._records[uid]
+            self._records.update(zip(new.index, new.itertuples(index=False, name=None)))
+            self._cache = {}
+
+        logging.info(
+            Fore.GREEN
+            + f"Cubos atualizados: {counts['added']} adicionados, {counts['updated']} "
+            + f"atualizados, {counts['unchanged']} inalterados, {counts['removed']} removidos."
+            + Style.RESET_ALL
+        )
+        return counts
+
+    def query(self, group_by, filters=None):
+        """
+        Conta os registros agrupados por uma ou mais dimensões.
+
+        Args:
+            group_by (str or list): Dimensão ou dimensões do agrupamento, entre `DIMENSIONS`.
+            filters (dict, optional): Valor ou lista de valores aceitos por dimensão, por exemplo
+                {"sex": "Female", "subject": ["ViCAP Missing Persons"]}. Padrão é None.
+
+        Returns:
+            pd.DataFrame: Uma linha por combinação, com as dimensões e a coluna `records`, em
+                ordem decrescente de contagem.
+
+        Raises:
+            ValueError: Caso alguma dimensão não exista.
+        """
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by)
+        filters = {
+            dimension: tuple(value) if isinstance(value, (list, tuple, set)) else (value,)
+            for dimension, value in (filters or {}).items()
+        }
+        unknown = set(group_by).union(filters) - set(DIMENSIONS)
+        if unknown or not group_by:
+            raise ValueError(
+                f"Dimensões inválidas: {', '.join(sorted(unknown)) or 'nenhuma'}. "
+                f"Use uma ou mais de {DIMENSIONS}."
+            )
+
+        cache_key = (
+            tuple(group_by),
+            frozenset((dimension, frozenset(values)) for dimension, values in filters.items()),
+        )
+        result = self._cache.get(cache_key)
+        if result is None:
+            result = self._aggregate(group_by, filters)
+            if len(self._cache) >= QUERY_CACHE_SIZE:
+                self._cache = {}
+            self._cache[cache_key] = result
+        return result.copy()
+
+    def _aggregate(self, group_by, filters):
+        used = set(group_by).union(filters)
+        cuboid = tuple(dimension for dimension in LIST_DIMENSIONS if dimension in used)
+        counts = self._cuboids[cuboid]
+
+        mask = np.ones(len(counts), dtype=bool)
+        for dimension, values in filters.items():
+            mask &= counts.index.get_level_values(dimension).isin(values)
+        counts = counts[mask]
+
+        result = counts.groupby(level=group_by, observed=True).sum().reset_index()
+        return result.sort_values(
+            [COUNT_COLUMN, *group_by], ascending=[False] + [True] * len(group_by), ignore_index=True
+        )
+
+    def save(self, path):
+        """
+        Grava as dimensões dos registros e os cubos em um arquivo JSON comprimido, de forma
+        atômica.
+
+        Args:
+            path (str): Caminho do arquivo .json.gz.
+        """
+        columns = list(zip(*self._records.values())) or [()] * len(RECORD_COLUMNS)
+        state = {
+            "uids": list(self._records),
+            "records": {
+                column: list(values) for column, values in zip(RECORD_COLUMNS, columns)
+            },
+            "cuboids": {
+                ",".join(cuboid): {
+                    "levels": list(self._cuboids[cuboid].index.names),
+                    "rows": [
+                        [*index, int(count)] for index, count in self._cuboids[cuboid].items()
+                    ],
+                }
+                for cuboid in CUBOIDS
+            },
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as file:
+            json.dump(state, file, default=_json_default)
+        os.replace(tmp_path, path)
+
+        logging.info(
+            Fore.GREEN
+            + f"Cubos com {len(self)} registros salvos em {path}."
+            + Style.RESET_ALL
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carrega os cubos gravados por `save`.
+
+        Args:
+            path (str): Caminho do arquivo .json.gz.
+
+        Returns:
+            AggregateCubes: Os cubos carregados.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            state = json.load(file)
+
+        cubes = cls()
+        records = state["records"]
+        for column in LIST_DIMENSIONS.values():
+            records[column] = [tuple(value) for value in records[column]]
+        cubes._records = dict(
+            zip(state["uids"], zip(*(records[column] for column in RECORD_COLUMNS)))
+        )
+
+        for name, cuboid in state["cuboids"].items():
+            levels = cuboid["levels"]
+            dimensions = tuple(name.split(",")) if name else ()
+            if not cuboid["rows"]:
+                cubes._cuboids[dimensions] = _empty_cells(dimensions)
+                continue
+            rows = pd.DataFrame(cuboid["rows"], columns=[*levels, COUNT_COLUMN])
+            cubes._cuboids[dimensions] = rows.set_index(levels)[COUNT_COLUMN].astype(np.int64)
+        return cubes
+
+
+def _json_default(value):
+    """Converte os tipos do numpy para tipos nativos na gravação em JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo não suportado no JSON: {type(value).__name__}")
+
+
+def build_cubes(df, key="uid", hash_column="content_hash"):
+    """
+    Cria os cubos a partir do DataFrame transformado.
+
+    Args:
+        df (pd.DataFrame): O DataFrame transformado.
+        key (str): Coluna com o identificador do registro (default: "uid").
+        hash_column (str): Coluna com o hash do conteúdo (default: "content_hash").
+
+    Returns:
+        AggregateCubes: Os cubos com todos os registros do DataFrame.
+    """
+    cubes = AggregateCubes()
+    cubes.refresh(df, key=key, hash_column=hash_column)
+    return cubes
@@ -0,0 +1,380 @@
+"""Linha de comando do ETL do FBI Wanted.
+
+Este módulo importa apenas a biblioteca padrão: o pandas, o mysql.connector, o requests e o
+pyarrow só são carregados pelo subcomando que precisa deles (veja `commands.py`), de forma
+que `--help` e execuções curtas não pagam o custo de importação de todo o projeto.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+SUBCOMMANDS = ("extract", "transform", "load", "run", "replay", "search", "bi")
+JSON_PATH = "src/extract_fuctions/request_data.json"
+ARCHIVE_DIR = "archive"
+PARQUET_DIR = "data/wanted"
+SEARCH_INDEX_PATH = "data/search_index.npz"
+CUBES_PATH = "data/cubes.json.gz"
+REPORTS_DIR = "reports"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(level="INFO"):
+    """Configura o logging uma única vez para todo o processo."""
+    logging.basicConfig(level=level.upper(), format=LOG_FORMAT)
+
+
+def _add_extract_options(parser):
+    group = parser.add_argument_group("extração")
+    group.add_argument(
+        "--request-config",
+        default=os.getenv("FBI_REQUEST_CONFIG", JSON_PATH),
+        help="JSON com a URL e os headers da API (env: FBI_REQUEST_CONFIG).",
+    )
+    group.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Extrai apenas os registros novos ou alterados desde a última execução.",
+    )
+    group.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Número de requisições simultâneas à API.",
+    )
+    group.add_argument(
+        "--rate",
+        type=float,
+        default=float(os.getenv("FBI_RATE", "10")),
+        help="Orçamento de requisições por segundo à API, compartilhado pelas sessões "
+        "(env: FBI_RATE).",
+    )
+    group.add_argument(
+        "--burst",
+        type=int,
+        default=int(os.getenv("FBI_BURST", "8")),
+        help="Número máximo de requisições liberadas de uma só vez (env: FBI_BURST).",
+    )
+
+
+def _add_database_options(parser):
+    group = parser.add_argument_group(
+        "banco de dados",
+        "Sem as flags, as credenciais vêm das variáveis DB_USERNAME, DB_PASSWORD, DB_HOST e "
+        "DB_NAME ou do arquivo src/load_fuctions/.env. A senha só é lida do ambiente.",
+    )
+    group.add_argument("--db-user", help="Usuário do MySQL (env: DB_USERNAME).")
+    group.add_argument("--db-host", help="Host do MySQL (env: DB_HOST).")
+    group.add_argument("--db-name", help="Banco de dados de destino (env: DB_NAME).")
+    group.add_argument(
+        "--pool-size",
+        type=int,
+        default=5,
+        help="Número de conexões mantidas no pool do MySQL.",
+    )
+
+
+def _add_transform_options(parser):
+    group = parser.add_argument_group("transformação")
+    group.add_argument(
+        "--resolve-entities",
+        action="store_true",
+        help="Agrupa os registros duplicados e grava o grupo de cada um na coluna entity_id. "
+        "Com --incremental, só os registros do delta são comparados entre si.",
+    )
+    group.add_argument(
+        "--cubes",
+        action="store_true",
+        help="Atualiza os cubos de agregação do Mini BI com os registros novos ou alterados.",
+    )
+    _add_cubes_path_option(group)
+
+
+def _add_cubes_path_option(parser):
+    parser.add_argument(
+        "--cubes-path",
+        default=os.getenv("FBI_CUBES_PATH", CUBES_PATH),
+        help="Arquivo dos cubos de agregação (env: FBI_CUBES_PATH).",
+    )
+
+
+def _add_load_options(parser, sink=True):
+    group = parser.add_argument_group("carga")
+    if sink:
+        group.add_argument(
+            "--sink",
+            choices=["mysql", "parquet"],
+            default=os.getenv("FBI_SINK", "mysql"),
+            help="Destino dos dados: MySQL ou um dataset Parquet particionado por data (env: FBI_SINK).",
+        )
+    group.add_argument(
+        "--parquet-dir",
+        default=os.getenv("FBI_PARQUET_DIR", PARQUET_DIR),
+        help="Diretório do dataset Parquet (env: FBI_PARQUET_DIR).",
+    )
+    group.add_argument(
+        "--load-method",
+        choices=["upsert", "batched", "infile"],
+        default="upsert",
+        help="Carga idempotente por hash, INSERTs em lotes ou LOAD DATA LOCAL INFILE.",
+    )
+    group.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Quantidade de linhas por INSERT na carga em lotes.",
+    )
+    group.add_argument(
+        "--soft-delete",
+        action="store_true",
+        help="Marca como removidos os registros que não vieram na extração completa.",
+    )
+    group.add_argument(
+        "--partitions",
+        type=int,
+        default=1,
+        help="Número de partições carregadas em paralelo, cada uma em sua conexão.",
+    )
+
+
+def _add_pipeline_options(parser):
+    group = parser.add_argument_group("pipeline")
+    group.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Sobrepõe extração, transformação e carga em threads ligadas por filas limitadas.",
+    )
+    group.add_argument(
+        "--queue-size",
+        type=int,
+        default=4,
+        help="Número máximo de lotes em espera entre duas etapas no modo --pipeline.",
+    )
+    group.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continua uma execução --pipeline interrompida a partir do último checkpoint.",
+    )
+
+
+def _add_report_options(parser):
+    group = parser.add_argument_group("relatório")
+    group.add_argument(
+        "--report",
+        help="Arquivo JSON do relatório da execução (default: reports/<comando>-<horário>.json).",
+    )
+    group.add_argument(
+        "--profile",
+        choices=["cprofile", "tracemalloc"],
+        help="Ativa o cProfile ou o tracemalloc durante a execução.",
+    )
+    group.add_argument(
+        "--log-level",
+        default=os.getenv("FBI_LOG_LEVEL", "INFO"),
+        help="Nível do log (env: FBI_LOG_LEVEL).",
+    )
+
+
+def build_parser():
+    """Monta o parser com os subcomandos extract, transform, load, run, replay, search e bi."""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="ETL dos dados do FBI Wanted. Sem subcomando, executa `run`.",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="{" + ",".join(SUBCOMMANDS) + "}")
+
+    extract = subparsers.add_parser(
+        "extract", help="Requisita as páginas da API e as grava em um arquivo .jsonl.gz."
+    )
+    _add_extract_options(extract)
+    extract.add_argument(
+        "--archive",
+        help="Arquivo .jsonl.gz de destino (default: archive/pages-<horário>.jsonl.gz).",
+    )
+    _add_report_options(extract)
+
+    transform = subparsers.add_parser(
+        "transform", help="Transforma um arquivo de páginas em um snapshot Parquet."
+    )
+    transform.add_argument("--input", required=True, help="Arquivo .jsonl.gz gerado por extract.")
+    transform.add_argument(
+        "--parquet-dir",
+        default=os.getenv("FBI_PARQUET_DIR", PARQUET_DIR),
+        help="Diretório do dataset Parquet (env: FBI_PARQUET_DIR).",
+    )
+    transform.add_argument("--snapshot-date", help="Data do snapshot (default: hoje).")
+    transform.add_argument(
+        "--merge",
+        action="store_true",
+        help="Combina as páginas com o snapshot mais recente pelo uid, para arquivos gravados "
+        "por extract --incremental.",
+    )
+    _add_transform_options(transform)
+    _add_report_options(transform)
+
+    load = subparsers.add_parser("load", help="Carrega um snapshot Parquet no MySQL.")
+    load.add_argument(
+        "--snapshot-date", default="latest", help="Data do snapshot (default: o mais recente)."
+    )
+    _add_load_options(load, sink=False)
+    _add_database_options(load)
+    _add_report_options(load)
+
+    run = subparsers.add_parser("run", help="Executa extração, transformação e carga.")
+    _add_extract_options(run)
+    run.add_argument(
+        "--archive",
+        help="Arquivo .jsonl.gz onde as páginas brutas da API são acrescentadas.",
+    )
+    run.add_argument(
+        "--replay",
+        help="Arquivo .jsonl.gz gerado com --archive, lido no lugar da API.",
+    )
+    _add_transform_options(run)
+    _add_load_options(run)
+    _add_database_options(run)
+    _add_pipeline_options(run)
+    _add_report_options(run)
+
+    replay = subparsers.add_parser(
+        "replay", help="Reprocessa um arquivo de páginas, sem acessar a API."
+    )
+    replay.add_argument("replay", metavar="archive", help="Arquivo .jsonl.gz gerado com --archive.")
+    _add_transform_options(replay)
+    _add_load_options(replay)
+    _add_database_options(replay)
+    _add_pipeline_options(replay)
+    _add_report_options(replay)
+
+    search = subparsers.add_parser(
+        "search", help="Busca registros por texto livre em um snapshot Parquet."
+    )
+    search.add_argument(
+        "query",
+        help='Termos combinados com AND, cláusulas separadas por OR e prefixos com *, '
+        'por exemplo "dragon tattoo OR bogo*".',
+    )
+    search.add_argument(
+        "--index",
+        default=os.getenv("FBI_SEARCH_INDEX", SEARCH_INDEX_PATH),
+        help="Arquivo do índice invertido (env: FBI_SEARCH_INDEX).",
+    )
+    search.add_argument(
+        "--update",
+        action="store_true",
+        help="Atualiza o índice com o snapshot antes da busca, reindexando só o que mudou.",
+    )
+    search.add_argument(
+        "--parquet-dir",
+        default=os.getenv("FBI_PARQUET_DIR", PARQUET_DIR),
+        help="Diretório do dataset Parquet (env: FBI_PARQUET_DIR).",
+    )
+    search.add_argument(
+        "--snapshot-date", default="latest", help="Data do snapshot (default: o mais recente)."
+    )
+    search.add_argument("--limit", type=int, default=10, help="Número máximo de resultados.")
+    _add_report_options(search)
+
+    bi = subparsers.add_parser(
+        "bi", help="Consulta as contagens pré-agregadas dos cubos do Mini BI."
+    )
+    bi.add_argument(
+        "--group-by",
+        required=True,
+        type=lambda value: value.split(","),
+        help="Dimensões do agrupamento, separadas por vírgula: sex, race, age_bucket, "
+        "has_reward, subject e location.",
+    )
+    bi.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        metavar="DIMENSÃO=VALOR",
+        help='Filtro por dimensão, repetível; valores alternativos separados por "|", '
+        'por exemplo --filter "sex=Male|Female".',
+    )
+    _add_cubes_path_option(bi)
+    _add_report_options(bi)
+
+    return parser
+
+
+def validate_args(parser, args):
+    """Rejeita combinações de opções incompatíveis."""
+    option = lambda name, default=None: getattr(args, name, default)
+
+    if option("rate", 1) <= 0 or option("burst", 1) < 1:
+        parser.error("--rate deve ser positivo e --burst deve ser pelo menos 1.")
+    if option("soft_delete") and option("incremental"):
+        parser.error("--soft-delete não pode ser usado com --incremental.")
+    if option("partitions", 1) > 1 and (
+        option("soft_delete") or option("load_method") == "infile"
+    ):
+        parser.error("--partitions não pode ser usado com --soft-delete nem com --load-method infile.")
+    if option("pipeline") and (
+        option("soft_delete") or option("partitions", 1) > 1 or option("resolve_entities")
+    ):
+        parser.error(
+            "--pipeline não pode ser usado com --soft-delete, --partitions nem --resolve-entities."
+        )
+    if option("pipeline") and option("cubes"):
+        parser.error("--pipeline não pode ser usado com --cubes.")
+    if any("=" not in value for value in option("filter", [])):
+        parser.error("Use --filter DIMENSÃO=VALOR.")
+    if option("sink") == "parquet" and (
+        option("pipeline") or option("soft_delete") or option("partitions", 1) > 1
+    ):
+        parser.error("--sink parquet não pode ser usado com --pipeline, --soft-delete nem --partitions.")
+    if option("resume") and (not option("pipeline") or option("incremental")):
+        parser.error("--resume exige --pipeline e não pode ser usado com --incremental.")
+    if option("replay") and option("incremental"):
+        parser.error("--replay não pode ser usado com --incremental.")
+
+
+def main(argv=None):
+    """
+    Executa o subcomando pedido e grava o relatório da execução.
+
+    Para manter a compatibilidade com `python main.py --pipeline`, uma chamada sem
+    subcomando é tratada como `run`.
+
+    Args:
+        argv (list, optional): Argumentos da linha de comando. Padrão é None, que usa `sys.argv`.
+
+    Returns:
+        int: O código de saída do processo.
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        argv = ["run", *argv]
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    validate_args(parser, args)
+    configure_logging(args.log_level)
+
+    from src.cli_fuctions import commands
+    from src.pipeline_fuctions.instrumentation import RunReport, profiling
+
+    started_at = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    report_path = args.report or os.path.join(
+        REPORTS_DIR, f"{args.command}-{started_at}.json"
+    )
+    profile_path = os.path.join(
+        REPORTS_DIR,
+        f"profile-{args.command}-{started_at}."
+        + ("pstats" if args.profile == "cprofile" else "txt"),
+    )
+
+    report = RunReport(arguments=vars(args))
+    try:
+        with profiling(mode=args.profile, output_path=profile_path):
+            getattr(commands, f"{args.command}_command")(args=args, report=report)
+        report.status = "succeeded"
+    except commands.ConfigurationError as e:
+        logging.error(str(e))
+        return 2
+    finally:
+        report.write(path=report_path)
+    return 0
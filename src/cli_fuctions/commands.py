@@ -0,0 +1,506 @@
+"""Subcomandos da linha de comando.
+
+Cada subcomando importa as dependências pesadas (pandas, requests, mysql.connector, pyarrow)
+dentro da própria função, para que os demais não paguem o custo dessas importações.
+"""
+import logging
+import os
+from datetime import datetime, timezone
+from colorama import Fore, Style
+
+CACHE_DIR = "cache/fbi_wanted"
+WATERMARK_PATH = "cache/watermark.json"
+CHECKPOINT_PATH = "cache/checkpoint.json"
+TABLE_NAME = "wanted"
+SOFT_DELETE_COLUMN = "deleted_at"
+
+
+class ConfigurationError(ValueError):
+    """Erro levantado quando falta alguma configuração obrigatória, como as credenciais."""
+
+
+def resolve_credentials(args):
+    """
+    Obtém as credenciais do MySQL das flags, das variáveis de ambiente ou do arquivo .env.
+
+    Args:
+        args (argparse.Namespace): Argumentos com `db_user`, `db_host` e `db_name`.
+
+    Returns:
+        tuple: username, password, host e database.
+
+    Raises:
+        ConfigurationError: Caso alguma credencial não tenha sido informada.
+    """
+    from src.load_fuctions.mysql_database import get_credentials
+
+    username, password, host, database = get_credentials()
+    credentials = {
+        "DB_USERNAME": args.db_user or username,
+        "DB_PASSWORD": password,
+        "DB_HOST": args.db_host or host,
+        "DB_NAME": args.db_name or database,
+    }
+    missing = [name for name, value in credentials.items() if not value]
+    if missing:
+        raise ConfigurationError(
+            f"Credenciais ausentes: {', '.join(missing)}. Defina as variáveis de ambiente, "
+            "o arquivo src/load_fuctions/.env ou as flags --db-user, --db-host e --db-name."
+        )
+    return tuple(credentials.values())
+
+
+def prepare_database(args):
+    """Garante que o banco de dados existe e retorna as credenciais usadas."""
+    from src.load_fuctions.mysql_database import connect_to_mysql, disconnect_database
+    from src.load_fuctions.query_fuctions import create_database, show_databases
+
+    username, password, host, database = resolve_credentials(args)
+    connection, cursor = None, None
+    try:
+        connection, cursor = connect_to_mysql(
+            username=username, password=password, host=host
+        )
+        create_database(cursor=cursor, database=database)
+        show_databases(cursor=cursor)
+    finally:
+        disconnect_database(connection=connection, cursor=cursor)
+
+    return username, password, host, database
+
+
+def create_pool(args, pool_size):
+    """Prepara o banco de dados e cria o pool de conexões da carga."""
+    from src.load_fuctions.mysql_database import create_connection_pool
+
+    username, password, host, database = prepare_database(args)
+    return create_connection_pool(
+        username=username,
+        password=password,
+        host=host,
+        database=database,
+        pool_size=pool_size,
+        allow_local_infile=args.load_method == "infile",
+    )
+
+
+def ensure_table(pool, df, create=True, **schema_options):
+    """
+    Cria a tabela de destino a partir do DataFrame, se ela ainda não existir, adiciona as
+    colunas ausentes (como o `entity_id`) e alarga as colunas VARCHAR menores que os valores.
+    """
+    from src.load_fuctions.mysql_database import pooled_connection
+    from src.load_fuctions.query_fuctions import alter_table, create_table
+
+    with pooled_connection(pool) as connection:
+        cursor = connection.cursor()
+        try:
+            if create:
+                create_table(
+                    cursor=cursor,
+                    table=TABLE_NAME,
+                    df=df,
+                    primary_key="uid",
+                    soft_delete_column=SOFT_DELETE_COLUMN,
+                    **schema_options,
+                )
+            alter_table(
+                cursor=cursor, table=TABLE_NAME, df=df, primary_key="uid", **schema_options
+            )
+        finally:
+            cursor.close()
+
+
+def load_into_mysql(args, df, report):
+    """Carrega o DataFrame completo no MySQL com o método e as partições escolhidos."""
+    from src.load_fuctions.bulk_loader import load_dataframe
+    from src.load_fuctions.mysql_database import pooled_connection
+    from src.load_fuctions.parallel_loader import load_partitioned
+
+    timed = report.instrument
+    pool = create_pool(args, pool_size=max(args.pool_size, args.partitions))
+    ensure_table(pool=pool, df=df)
+
+    upsert_options = {}
+    if args.load_method == "upsert" and args.soft_delete:
+        upsert_options["soft_delete_column"] = SOFT_DELETE_COLUMN
+
+    if args.partitions > 1:
+        timed("load.load_partitioned", load_partitioned, rows_in=lambda _: len(df))(
+            pool=pool,
+            df=df,
+            table=TABLE_NAME,
+            partitions=args.partitions,
+            method=args.load_method,
+            batch_size=args.batch_size,
+        )
+    else:
+        with pooled_connection(pool) as connection:
+            timed("load.load_dataframe", load_dataframe, rows_in=lambda _: len(df))(
+                connection=connection,
+                df=df,
+                table=TABLE_NAME,
+                method=args.load_method,
+                batch_size=args.batch_size,
+                **upsert_options,
+            )
+
+
+def open_pages(args, report, checkpoint=None):
+    """
+    Abre o fluxo de páginas, a partir da API ou de um arquivo gravado com --archive.
+
+    Com um checkpoint, o plano de páginas da execução (a URL, o total e o tamanho de página
+    informados pela API, ou o caminho e o tamanho do arquivo) é associado a ele, e as páginas
+    que ele registra como carregadas são puladas.
+
+    Returns:
+        tuple: O iterável de páginas e a marca d'água da extração incremental (ou None).
+    """
+    watermark = None
+    replay = getattr(args, "replay", None)
+
+    if replay:
+        from src.extract_fuctions.page_archive import read_page_archive
+
+        logging.info(
+            Fore.YELLOW
+            + f"Reprocessando as páginas arquivadas em {replay}:\n"
+            + Style.RESET_ALL
+        )
+        pages = read_page_archive(archive_path=replay)
+        if checkpoint is not None:
+            skip_pages = checkpoint.bind_plan(
+                {"archive": os.path.abspath(replay), "size": os.path.getsize(replay)}
+            )
+            if skip_pages:
+                pages = (page for page in pages if page.get("page") not in skip_pages)
+    else:
+        from src.extract_fuctions.extract_data import iter_wanted_pages, load_json
+        from src.extract_fuctions.page_archive import archive_pages
+        from src.extract_fuctions.rate_limiter import RateLimiter
+        from src.extract_fuctions.response_cache import ResponseCache
+        from src.extract_fuctions.watermark import (
+            INCREMENTAL_PARAMS,
+            Watermark,
+            take_until_watermark,
+        )
+
+        logging.info(
+            Fore.YELLOW
+            + f"Iniciando etapa de coleta de dados da FBI Wanted:\n"
+            + Style.RESET_ALL
+        )
+        url, headers = load_json(json_path=args.request_config)
+
+        def bind_plan(plan):
+            return checkpoint.bind_plan({"source": url, **plan})
+
+        pages = iter_wanted_pages(
+            url=url,
+            headers=headers,
+            max_pages=None,
+            max_workers=args.max_workers,
+            max_pages_per_session=10,
+            max_attempts=5,
+            rate_limiter=RateLimiter(rate=args.rate, burst=args.burst),
+            cache=ResponseCache(cache_dir=CACHE_DIR),
+            params=INCREMENTAL_PARAMS if args.incremental else None,
+            http_stats=report.http,
+            on_plan=bind_plan if checkpoint is not None else None,
+        )
+        if args.archive:
+            pages = archive_pages(pages=pages, archive_path=args.archive)
+        if args.incremental:
+            watermark = Watermark(path=WATERMARK_PATH)
+            pages = take_until_watermark(pages=pages, watermark=watermark)
+
+    pages = report.instrument_iter(
+        "extract.pages", pages, rows=lambda page: len(page.get("items", []))
+    )
+    return pages, watermark
+
+
+def transform_pages(pages, report, resolve_entities=False):
+    """Aplica a extração dos registros e todas as transformações, medindo cada função."""
+    from src.extract_fuctions.extract_data import extract_data_wanted, iteration_data_wanted
+    from src.transform_fuctions.transform_data import (
+        add_content_hash,
+        build_dataframe,
+        change_type_values,
+        optimize_dtypes,
+        transform_values_str_with_replace,
+    )
+
+    timed = report.instrument
+    response_json = extract_data_wanted(informatios_response=list(pages))
+    extract_data = timed(
+        "extract.iteration_data_wanted",
+        iteration_data_wanted,
+        rows_in=lambda data: sum(len(page.get("items", [])) for page in data),
+    )(data=response_json)
+
+    df = timed("transform.build_dataframe", build_dataframe)(records=extract_data)
+    df = timed(
+        "transform.transform_values_str_with_replace", transform_values_str_with_replace
+    )(df=df)
+    df = timed("transform.change_type_values", change_type_values)(df=df)
+    df = timed("transform.optimize_dtypes", optimize_dtypes)(df=df)
+    df = timed("transform.add_content_hash", add_content_hash)(df=df)
+    # O entity_id fica fora do hash: uma nova duplicata não marca como alterados os
+    # registros que não mudaram.
+    if resolve_entities:
+        from src.transform_fuctions.entity_resolution import resolve_entities as resolve
+
+        df = timed("transform.resolve_entities", resolve)(df=df)
+
+    logging.info(
+        Fore.GREEN + f"Dados coletados e tratados com sucesso:\n" + Style.RESET_ALL
+    )
+    return df
+
+
+def refresh_cubes(args, df, report, remove_missing):
+    """Atualiza os cubos do Mini BI com o DataFrame transformado e os grava em disco."""
+    from src.bi_fuctions.aggregate_cubes import AggregateCubes
+
+    cubes = (
+        AggregateCubes.load(args.cubes_path)
+        if os.path.exists(args.cubes_path)
+        else AggregateCubes()
+    )
+    report.instrument("bi.refresh_cubes", cubes.refresh)(df=df, remove_missing=remove_missing)
+    cubes.save(args.cubes_path)
+
+
+def run_pipeline_mode(args, report, pages, checkpoint):
+    """Executa transformação e carga lote a lote, sobrepostas à extração."""
+    from src.extract_fuctions.extract_data import iter_page_batches
+    from src.load_fuctions.bulk_loader import load_dataframe, read_stored_hashes
+    from src.load_fuctions.mysql_database import pooled_connection
+    from src.pipeline_fuctions.checkpoint import checkpoint_pages
+    from src.pipeline_fuctions.pipeline_runner import run_pipeline
+    from src.transform_fuctions.transform_data import add_content_hash, transform_batch
+
+    pool = create_pool(args, pool_size=args.pool_size)
+    table_ready = []
+    # Os hashes gravados são lidos uma única vez e atualizados a cada lote, em vez de um
+    # SELECT da tabela inteira por lote no upsert.
+    upsert_options = {}
+
+    def batch_rows(batch):
+        return len(batch[1])
+
+    def transform_stage(batch):
+        page_numbers, records = batch
+        df = transform_batch(records=records)
+        checkpoint.mark("transformed", page_numbers)
+        return page_numbers, add_content_hash(df=df)
+
+    def load_stage(batch):
+        page_numbers, df = batch
+        # A tabela é criada a partir do primeiro lote; os seguintes só adicionam colunas e
+        # alargam os VARCHAR que não comportam os seus valores.
+        ensure_table(pool=pool, df=df, create=not table_ready)
+        table_ready.append(True)
+        with pooled_connection(pool) as connection:
+            if args.load_method == "upsert" and not upsert_options:
+                upsert_options["stored_hashes"] = read_stored_hashes(
+                    connection=connection, table=TABLE_NAME
+                )
+            load_report = load_dataframe(
+                connection=connection,
+                df=df,
+                table=TABLE_NAME,
+                method=args.load_method,
+                batch_size=args.batch_size,
+                **upsert_options,
+            )
+        if upsert_options:
+            upsert_options["stored_hashes"].update(zip(df["uid"], df["content_hash"]))
+        checkpoint.mark("loaded", page_numbers)
+        return load_report
+
+    pages = checkpoint_pages(pages=pages, checkpoint=checkpoint)
+    reports, _ = run_pipeline(
+        source=iter_page_batches(pages=pages, batch_size=args.batch_size),
+        stages=[
+            (
+                "transform",
+                report.instrument(
+                    "transform", transform_stage, rows_in=batch_rows, rows_out=batch_rows
+                ),
+            ),
+            ("load", report.instrument("load", load_stage, rows_in=batch_rows)),
+        ],
+        queue_size=args.queue_size,
+    )
+    logging.info(
+        Fore.GREEN
+        + f"{sum(load_report['rows'] for load_report in reports)} linhas carregadas em "
+        + f"{len(reports)} lotes."
+        + Style.RESET_ALL
+    )
+    checkpoint.clear()
+
+
+def extract_command(args, report):
+    """Requisita as páginas da API e as grava em um arquivo .jsonl.gz, sem pandas nem MySQL."""
+    if not args.archive:
+        started_at = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        args.archive = os.path.join("archive", f"pages-{started_at}.jsonl.gz")
+
+    pages, watermark = open_pages(args, report)
+    for _ in pages:
+        pass
+
+    # A marca d'água avança porque as páginas novas já estão gravadas no arquivo.
+    if watermark is not None:
+        watermark.save()
+
+
+def transform_command(args, report):
+    """Transforma um arquivo de páginas e grava o resultado como snapshot Parquet."""
+    from src.extract_fuctions.page_archive import read_page_archive
+    from src.load_fuctions.parquet_sink import write_parquet_snapshot
+
+    pages = report.instrument_iter(
+        "extract.pages",
+        read_page_archive(archive_path=args.input),
+        rows=lambda page: len(page.get("items", [])),
+    )
+    df = transform_pages(pages, report, resolve_entities=args.resolve_entities)
+    report.instrument("load.write_parquet_snapshot", write_parquet_snapshot)(
+        df=df,
+        dataset_dir=args.parquet_dir,
+        snapshot_date=args.snapshot_date,
+        merge_key="uid" if args.merge else None,
+    )
+    # O arquivo pode ter vindo de uma extração incremental, então nada é removido dos cubos.
+    if args.cubes:
+        refresh_cubes(args, df, report, remove_missing=False)
+
+
+def load_command(args, report):
+    """Carrega no MySQL um snapshot Parquet gravado por `transform` ou `run --sink parquet`."""
+    from src.load_fuctions.parquet_sink import read_parquet_snapshot
+
+    df = report.instrument("load.read_parquet_snapshot", read_parquet_snapshot)(
+        dataset_dir=args.parquet_dir, snapshot_date=args.snapshot_date
+    )
+    df = df.drop(columns=["snapshot_date"])
+    load_into_mysql(args, df, report)
+
+
+def run_command(args, report):
+    """Executa a extração, a transformação e a carga, registrando cada etapa no relatório."""
+    checkpoint = None
+    if args.pipeline:
+        from src.pipeline_fuctions.checkpoint import Checkpoint
+
+        checkpoint = Checkpoint(path=CHECKPOINT_PATH, resume=args.resume)
+
+    pages, watermark = open_pages(args, report, checkpoint=checkpoint)
+
+    if args.pipeline:
+        run_pipeline_mode(args, report, pages, checkpoint)
+    else:
+        df = transform_pages(pages, report, resolve_entities=args.resolve_entities)
+        print(df.head())
+
+        if args.sink == "parquet":
+            from src.load_fuctions.parquet_sink import write_parquet_snapshot
+
+            report.instrument(
+                "load.write_parquet_snapshot", write_parquet_snapshot, rows_in=lambda _: len(df)
+            )(
+                df=df,
+                dataset_dir=args.parquet_dir,
+                # O delta incremental é combinado com o snapshot anterior, senão a
+                # partição do dia ficaria apenas com os registros alterados.
+                merge_key="uid" if args.incremental else None,
+            )
+        else:
+            load_into_mysql(args, df, report)
+
+    # Os cubos e a marca d'água só avançam depois que a carga terminou sem erros.
+    if args.cubes:
+        refresh_cubes(args, df, report, remove_missing=not args.incremental)
+    if watermark is not None:
+        watermark.save()
+
+
+def replay_command(args, report):
+    """Reprocessa um arquivo de páginas gravado com --archive, sem acessar a API."""
+    args.incremental = False
+    args.archive = None
+    run_command(args, report)
+
+
+def search_command(args, report):
+    """Busca registros por texto livre, usando o índice invertido do snapshot Parquet."""
+    from src.load_fuctions.parquet_sink import read_parquet_snapshot
+    from src.search_fuctions.inverted_index import SEARCH_COLUMNS, InvertedIndex, build_index
+
+    if args.update or not os.path.exists(args.index):
+        df = report.instrument("load.read_parquet_snapshot", read_parquet_snapshot)(
+            dataset_dir=args.parquet_dir,
+            columns=["uid", "content_hash", *SEARCH_COLUMNS],
+            snapshot_date=args.snapshot_date,
+        )
+        if os.path.exists(args.index):
+            index = InvertedIndex.load(args.index)
+            report.instrument("search.update_from_dataframe", index.update_from_dataframe)(
+                df=df, remove_missing=True
+            )
+        else:
+            index = report.instrument("search.build_index", build_index)(df=df)
+        index.save(args.index)
+    else:
+        index = InvertedIndex.load(args.index)
+
+    results = report.instrument("search.query", index.search, rows_in=lambda _: len(index))(
+        query=args.query, limit=args.limit
+    )
+    if not results:
+        print("Nenhum registro encontrado.")
+        return
+
+    # Só as linhas encontradas são lidas do Parquet, com o filtro aplicado no scan.
+    scores = dict(results)
+    df = read_parquet_snapshot(
+        dataset_dir=args.parquet_dir,
+        columns=["uid", "name"],
+        filters=[("uid", "in", list(scores))],
+        snapshot_date=args.snapshot_date,
+    )
+    df["score"] = df["uid"].map(scores)
+    print(df.sort_values("score", ascending=False).to_string(index=False))
+
+
+def bi_command(args, report):
+    """Consulta os cubos do Mini BI, agrupando e filtrando pelas dimensões pedidas."""
+    from src.bi_fuctions.aggregate_cubes import AggregateCubes
+
+    if not os.path.exists(args.cubes_path):
+        raise ConfigurationError(
+            f"Cubos não encontrados em {args.cubes_path}. Execute `run --cubes` ou "
+            "`transform --cubes` antes."
+        )
+    cubes = AggregateCubes.load(args.cubes_path)
+    filters = {}
+    for value in args.filter:
+        dimension, values = value.split("=", 1)
+        filters[dimension] = values.split("|")
+    if "has_reward" in filters:
+        filters["has_reward"] = [
+            value.lower() in ("true", "1", "sim") for value in filters["has_reward"]
+        ]
+
+    try:
+        result = report.instrument("bi.query", cubes.query, rows_in=lambda _: len(cubes))(
+            group_by=args.group_by, filters=filters
+        )
+    except ValueError as e:
+        raise ConfigurationError(str(e)) from e
+    print(result.to_string(index=False))
@@ -1,13 +1,13 @@
 import requests
 from json import load
 import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style
-from requests.exceptions import HTTPError
+from requests.exceptions import HTTPError, RequestException
 from src.extract_fuctions.requests_fuctions import create_session
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
 
 def load_json(json_path):
     """Carrega um arquivo JSON com os requisitos para uma sessão de requisição.
@@ -27,15 +27,96 @@ def load_json(json_path):
     return fbi_wanted_url, request_headers
 
 
-def request_wanted_fbi(url, headers, max_pages, max_pages_per_session, max_attempts):
+def plan_pages(total, page_size):
+    """Calcula o plano de páginas necessário para cobrir todos os registros da API.
+
+    Args:
+        total (int): Número total de registros informado pela API no campo "total".
+        page_size (int): Quantidade de registros por página.
+
+    Returns:
+        list: Lista com os números das páginas a serem requisitadas, começando em 1.
+    """
+    if not total or not page_size:
+        return [1]
+    return list(range(1, math.ceil(total / page_size) + 1))
+
+
+def shard_pages(pages, shard_index, shard_count):
+    """Seleciona a fatia do plano de páginas que cabe a um shard.
+
+    Args:
+        pages (list): Plano de páginas retornado por `plan_pages`.
+        shard_index (int): Índice do shard atual, começando em 0.
+        shard_count (int): Número total de shards.
+
+    Returns:
+        list: Páginas atribuídas ao shard, intercaladas para equilibrar a carga.
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError("O índice do shard deve estar entre 0 e shard_count - 1.")
+    return list(pages)[shard_index::shard_count]
+
+
+def discover_page_plan(session, url, headers, page_size=None, cache=None, params=None):
+    """Requisita a primeira página e descobre quantas páginas existem a partir do campo "total".
+
+    O tamanho de página usado no cálculo é o número de itens efetivamente retornados pela API,
+    de forma que o plano continua correto mesmo se a API limitar o `page_size` solicitado.
+
+    Args:
+        session (requests.Session): Sessão usada na requisição.
+        url (str): URL da página do FBI Wanted.
+        headers (dict): Dicionário contendo os headers para a requisição.
+        page_size (int, optional): Quantidade de registros por página enviada à API. Padrão é None.
+        cache (ResponseCache, optional): Cache em disco usado para requisições condicionais. Padrão é None.
+        params (dict, optional): Parâmetros de query adicionais, como a ordenação. Padrão é None.
+
+    Returns:
+        tuple: O conteúdo JSON da primeira página (dict) e o plano de páginas (list).
+    """
+    first_page = request_page(
+        session, url, headers, 1, page_size=page_size, cache=cache, params=params
+    )
+    logging.info(
+        Fore.GREEN + "Requisição feita com sucesso para a página: 1." + Style.RESET_ALL
+    )
+    total = first_page.get("total", 0)
+    items_count = len(first_page.get("items", []))
+    pages = plan_pages(total=total, page_size=items_count)
+
+    logging.info(
+        Fore.GREEN
+        + f"API informou {total} registros em {len(pages)} páginas de {items_count} itens."
+        + Style.RESET_ALL
+    )
+    return first_page, pages
+
+
+def request_wanted_fbi(
+    url,
+    headers,
+    max_pages,
+    max_pages_per_session,
+    max_attempts,
+    page_size=None,
+    rate_limiter=None,
+    cache=None,
+    http_stats=None,
+):
     """Faz uma requisição GET para a página do FBI Wanted.
 
     Args:
         url (str): URL da página do FBI Wanted.
         headers (dict): Dicionário contendo os headers para a requisição.
-        max_pages (int): Número máximo de páginas a ser requisitado no total.
+        max_pages (int): Número máximo de páginas a ser requisitado no total. Se None, o número
+            de páginas é descoberto a partir do campo "total" da primeira página.
         max_pages_per_session (int): Número máximo de páginas por sessão antes de reabrir a sessão.
         max_attempts (int): Número máximo de tentativas para cada conjunto de requisições.
+        page_size (int, optional): Quantidade de registros por página enviada à API. Padrão é None.
+        rate_limiter (RateLimiter, optional): Limitador compartilhado por todas as sessões. Padrão é None.
+        cache (ResponseCache, optional): Cache em disco usado para requisições condicionais. Padrão é None.
+        http_stats (HttpStats, optional): Contadores de requisições, bytes e retries. Padrão é None.
 
     Returns:
         list: Lista de respostas das páginas requisitadas.
@@ -43,23 +124,31 @@ def request_wanted_fbi(url, headers, max_pages, max_pages_per_session, max_attem
     informations_response = []
     page_num = 1
 
+    if max_pages is None:
+        session = create_session(rate_limiter=rate_limiter, http_stats=http_stats)
+        first_page, pages = discover_page_plan(
+            session, url, headers, page_size=page_size, cache=cache
+        )
+        session.close()
+        informations_response.append(first_page)
+        max_pages = len(pages)
+        page_num = 2
+
     for attempt in range(max_attempts):
-        session = create_session()
+        session = create_session(rate_limiter=rate_limiter, http_stats=http_stats)
 
         while page_num <= max_pages:
             try:
-                response = session.get(
-                    url=url, params={"page": page_num}, headers=headers
-                )
-                response.raise_for_status()
-                informations_response.append(response.json())
-
-                if response.status_code == 200:
-                    logging.info(
-                        Fore.GREEN
-                        + f"Requisição feita com sucesso para a página: {page_num}. Status Code: {response.status_code}"
-                        + Style.RESET_ALL
+                informations_response.append(
+                    request_page(
+                        session, url, headers, page_num, page_size=page_size, cache=cache
                     )
+                )
+                logging.info(
+                    Fore.GREEN
+                    + f"Requisição feita com sucesso para a página: {page_num}."
+                    + Style.RESET_ALL
+                )
 
                 page_num += 1
                 
@@ -89,6 +178,310 @@ def request_wanted_fbi(url, headers, max_pages, max_pages_per_session, max_attem
                 session.close()
                 break
 
+    if cache is not None:
+        cache.evict()
+
+    return informations_response
+
+
+def _page_params(page_num, page_size=None, params=None):
+    """Monta os parâmetros de query de uma página."""
+    page_params = dict(params or {})
+    page_params["page"] = page_num
+    if page_size:
+        page_params["pageSize"] = page_size
+    return page_params
+
+
+def request_page(
+    session, url, headers, page_num, page_size=None, cache=None, params=None
+):
+    """Requisita uma única página do FBI Wanted.
+
+    Quando um cache é informado, a requisição é feita de forma condicional com os validadores
+    da última resposta e o corpo armazenado é reaproveitado em caso de 304. No modo offline do
+    cache, a página é servida sem acessar a rede.
+
+    Args:
+        session (requests.Session): Sessão usada na requisição.
+        url (str): URL da página do FBI Wanted.
+        headers (dict): Dicionário contendo os headers para a requisição.
+        page_num (int): Número da página a ser requisitada.
+        page_size (int, optional): Quantidade de registros por página. Padrão é None.
+        cache (ResponseCache, optional): Cache em disco das páginas. Padrão é None.
+        params (dict, optional): Parâmetros de query adicionais, como a ordenação. Padrão é None.
+
+    Returns:
+        dict: Conteúdo JSON da página requisitada.
+
+    Raises:
+        HTTPError: Caso a resposta retorne um status de erro.
+        LookupError: Caso o cache esteja no modo offline e não possua a página.
+    """
+    params = _page_params(page_num, page_size, params)
+    entry = None
+
+    if cache is not None:
+        entry = cache.get(url, params)
+        if cache.offline:
+            if entry is None:
+                raise LookupError(f"Página {page_num} não encontrada no cache offline.")
+            return entry["body"]
+        if entry is not None:
+            headers = {**headers, **cache.conditional_headers(entry)}
+
+    response = session.get(url=url, params=params, headers=headers)
+
+    if entry is not None and response.status_code == 304:
+        cache.refresh(url, params)
+        return entry["body"]
+
+    response.raise_for_status()
+    page_data = response.json()
+
+    if cache is not None:
+        cache.store(url, params, response, page_data)
+
+    return page_data
+
+
+def _iter_pages_concurrent(
+    url,
+    headers,
+    pages,
+    max_workers,
+    max_pages_per_session,
+    max_attempts,
+    page_size=None,
+    rate_limiter=None,
+    cache=None,
+    params=None,
+    http_stats=None,
+):
+    """Requisita as páginas informadas em paralelo e as devolve na ordem do plano.
+
+    Cada thread do pool mantém a própria sessão criada por `create_session`, reabrindo-a
+    a cada `max_pages_per_session` requisições. A iteração é interrompida na primeira página
+    sem itens ou quando uma página esgota o número de tentativas.
+
+    Yields:
+        tuple: O número da página (int) e o seu conteúdo JSON (dict).
+    """
+    local = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def fetch(page_num):
+        if getattr(local, "requests_count", 0) >= max_pages_per_session:
+            local.session.close()
+            del local.session
+        if not hasattr(local, "session"):
+            local.session = create_session(
+                pool_maxsize=1, rate_limiter=rate_limiter, http_stats=http_stats
+            )
+            local.requests_count = 0
+            with sessions_lock:
+                sessions.append(local.session)
+        local.requests_count += 1
+        return request_page(
+            local.session,
+            url,
+            headers,
+            page_num,
+            page_size=page_size,
+            cache=cache,
+            params=params,
+        )
+
+    pages = list(pages)
+    window = max_workers * 2
+    pending = {}
+    attempts = {}
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for page_num in pages:
+                while next_index < len(pages) and len(pending) < window:
+                    pending[pages[next_index]] = executor.submit(fetch, pages[next_index])
+                    next_index += 1
+
+                while True:
+                    try:
+                        page_data = pending.pop(page_num).result()
+                        break
+                    except RequestException as e:
+                        # Erros de conexão, timeouts e retries esgotados do urllib3 também
+                        # são tentados de novo, não só as respostas com status de erro.
+                        attempts[page_num] = attempts.get(page_num, 0) + 1
+                        logging.error(
+                            Fore.RED
+                            + f"Ocorreu um erro durante a requisição da página {page_num}, "
+                            + f"{type(e).__name__}: {e}"
+                            + Style.RESET_ALL
+                        )
+                        if attempts[page_num] >= max_attempts:
+                            return
+                        pending[page_num] = executor.submit(fetch, page_num)
+
+                logging.info(
+                    Fore.GREEN
+                    + f"Requisição feita com sucesso para a página: {page_num}."
+                    + Style.RESET_ALL
+                )
+
+                if not page_data.get("items"):
+                    logging.info(
+                        Fore.YELLOW
+                        + f"Página {page_num} retornou sem itens, encerrando as requisições."
+                        + Style.RESET_ALL
+                    )
+                    return
+
+                yield page_num, page_data
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=True)
+            for session in sessions:
+                session.close()
+
+
+def iter_wanted_pages(
+    url,
+    headers,
+    max_pages=None,
+    max_workers=8,
+    max_pages_per_session=10,
+    max_attempts=5,
+    page_size=None,
+    rate_limiter=None,
+    cache=None,
+    with_page_numbers=False,
+    params=None,
+    skip_pages=None,
+    http_stats=None,
+    on_plan=None,
+):
+    """Gera as páginas do FBI Wanted à medida que chegam, na ordem das páginas.
+
+    As páginas são requisitadas em paralelo, mas só ficam em memória as que estão em trânsito,
+    de forma que o consumo de memória não depende do número total de páginas.
+
+    Args:
+        url (str): URL da página do FBI Wanted.
+        headers (dict): Dicionário contendo os headers para a requisição.
+        max_pages (int, optional): Número máximo de páginas a ser requisitado no total. Se None,
+            o número de páginas é descoberto a partir do campo "total" da primeira página.
+        max_workers (int): Número de requisições simultâneas (default: 8).
+        max_pages_per_session (int): Número máximo de páginas por sessão antes de reabrir a sessão.
+        max_attempts (int): Número máximo de tentativas para cada página.
+        page_size (int, optional): Quantidade de registros por página enviada à API. Padrão é None.
+        rate_limiter (RateLimiter, optional): Limitador compartilhado por todas as sessões. Padrão é None.
+        cache (ResponseCache, optional): Cache em disco usado para requisições condicionais. Padrão é None.
+        with_page_numbers (bool): Se True, gera tuplas (número da página, página). Padrão é False.
+        params (dict, optional): Parâmetros de query adicionais, como a ordenação. Padrão é None.
+        skip_pages (set, optional): Páginas que não devem ser requisitadas nem geradas, como as
+            já carregadas em uma execução retomada. Padrão é None.
+        http_stats (HttpStats, optional): Contadores de requisições, bytes e retries. Padrão é None.
+        on_plan (callable, optional): Chamada com o plano descoberto na primeira página, no
+            formato {"total": int, "page_size": int}, antes das demais requisições. As páginas
+            que ela retornar também são puladas, como as de um checkpoint gravado com o mesmo
+            plano. Não é chamada quando `max_pages` é informado. Padrão é None.
+
+    Yields:
+        dict: Conteúdo JSON de cada página, ou uma tupla (int, dict) se `with_page_numbers` for True.
+    """
+    skip_pages = set(skip_pages or ())
+
+    if max_pages is None:
+        session = create_session(rate_limiter=rate_limiter, http_stats=http_stats)
+        first_page, pages = discover_page_plan(
+            session, url, headers, page_size=page_size, cache=cache, params=params
+        )
+        session.close()
+        if on_plan is not None:
+            plan = {
+                "total": first_page.get("total", 0),
+                "page_size": len(first_page.get("items", [])),
+            }
+            skip_pages |= set(on_plan(plan) or ())
+        if 1 not in skip_pages:
+            yield (1, first_page) if with_page_numbers else first_page
+        pages = pages[1:]
+    else:
+        pages = range(1, max_pages + 1)
+    pages = [page_num for page_num in pages if page_num not in skip_pages]
+
+    for page_num, page_data in _iter_pages_concurrent(
+        url=url,
+        headers=headers,
+        pages=pages,
+        max_workers=max_workers,
+        max_pages_per_session=max_pages_per_session,
+        max_attempts=max_attempts,
+        page_size=page_size,
+        rate_limiter=rate_limiter,
+        cache=cache,
+        params=params,
+        http_stats=http_stats,
+    ):
+        yield (page_num, page_data) if with_page_numbers else page_data
+
+    if cache is not None:
+        cache.evict()
+
+
+def request_wanted_fbi_concurrent(
+    url,
+    headers,
+    max_pages=None,
+    max_workers=8,
+    max_pages_per_session=10,
+    max_attempts=5,
+    page_size=None,
+    rate_limiter=None,
+    cache=None,
+    http_stats=None,
+):
+    """Faz requisições GET concorrentes para as páginas do FBI Wanted.
+
+    Args:
+        url (str): URL da página do FBI Wanted.
+        headers (dict): Dicionário contendo os headers para a requisição.
+        max_pages (int, optional): Número máximo de páginas a ser requisitado no total. Se None,
+            o número de páginas é descoberto a partir do campo "total" da primeira página.
+        max_workers (int): Número de requisições simultâneas (default: 8).
+        max_pages_per_session (int): Número máximo de páginas por sessão antes de reabrir a sessão.
+        max_attempts (int): Número máximo de tentativas para cada página.
+        page_size (int, optional): Quantidade de registros por página enviada à API. Padrão é None.
+        rate_limiter (RateLimiter, optional): Limitador compartilhado por todas as sessões. Padrão é None.
+        cache (ResponseCache, optional): Cache em disco usado para requisições condicionais. Padrão é None.
+        http_stats (HttpStats, optional): Contadores de requisições, bytes e retries. Padrão é None.
+
+    Returns:
+        list: Lista de respostas das páginas requisitadas, na ordem das páginas.
+    """
+    informations_response = list(
+        iter_wanted_pages(
+            url=url,
+            headers=headers,
+            max_pages=max_pages,
+            max_workers=max_workers,
+            max_pages_per_session=max_pages_per_session,
+            max_attempts=max_attempts,
+            page_size=page_size,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            http_stats=http_stats,
+        )
+    )
+
+    logging.info(
+        Fore.GREEN
+        + f"{len(informations_response)} páginas requisitadas com sucesso!"
+        + Style.RESET_ALL
+    )
     return informations_response
 
 
@@ -109,17 +502,38 @@ def extract_data_wanted(informatios_response):
     return data
 
 
-def iteration_data_wanted(data):
-    """Itera sobre os dados extraídos e retorna uma lista de informações específicas.
+def _person_from_item(item):
+    """Seleciona os campos de interesse de um item da API."""
+    return {
+        "uid": item.get("uid"),
+        "name": item.get("title"),
+        "age_max": item.get("age_max"),
+        "age_min": item.get("age_min"),
+        "sex": item.get("sex"),
+        "warning_message": item.get("warning_message"),
+        "race": item.get("race_raw"),
+        "place_of_birth": item.get("place_of_birth"),
+        "details": item.get("details"),
+        "occupations": item.get("occupations") or [],
+        "locations": item.get("locations") or [],
+        "subjects": item.get("subjects") or [],
+        "aliases": item.get("aliases") or [],
+        "reward_text": item.get("reward_text"),
+        "scars_and_marks": item.get("scars_and_marks"),
+        "caution": item.get("caution"),
+    }
+
+
+def iter_data_wanted(data):
+    """Gera, de forma preguiçosa, as informações específicas de cada item das páginas.
 
     Args:
-        data (list): Lista de listas de dicionários com os dados extraídos da resposta.
+        data (iterable): Páginas da API, como a lista de `request_wanted_fbi` ou o gerador de
+            `iter_wanted_pages`.
 
-    Returns:
-        list: Lista de dicionários com os valores extraídos das chaves especificadas em cada item dos dados.
+    Yields:
+        dict: Dicionário com os valores extraídos das chaves especificadas em cada item.
     """
-    extracted_data = []
-
     for page_data in data:
         if "items" not in page_data:
             raise KeyError(
@@ -127,23 +541,67 @@ def iteration_data_wanted(data):
             )
 
         for item in page_data.get("items", []):
-            person = {
-                "name": item.get("title"),
-                "age_max": item.get("age_max"),
-                "age_min": item.get("age_min"),
-                "sex": item.get("sex"),
-                "warning_message": item.get("warning_message"),
-                "race": item.get("race_raw"),
-                "place_of_birth": item.get("place_of_birth"),
-                "details": item.get("details"),
-                "occupations": item.get("occupations") or [],
-                "locations": item.get("locations") or [],
-                "subjects": item.get("subjects") or [],
-                "aliases": item.get("aliases") or [],
-                "reward_text": item.get("reward_text"),
-                "scars_and_marks": item.get("scars_and_marks"),
-                "caution": item.get("caution"),
-            }
-            extracted_data.append(person)
+            yield _person_from_item(item)
+
+
+def iteration_data_wanted(data):
+    """Itera sobre os dados extraídos e retorna uma lista de informações específicas.
+
+    Args:
+        data (list): Lista de listas de dicionários com os dados extraídos da resposta.
+
+    Returns:
+        list: Lista de dicionários com os valores extraídos das chaves especificadas em cada item dos dados.
+    """
+    return list(iter_data_wanted(data))
+
+
+def iter_batches(records, batch_size):
+    """Agrupa um iterável de registros em lotes de tamanho limitado.
+
+    Args:
+        records (iterable): Registros gerados por `iter_data_wanted`.
+        batch_size (int): Quantidade máxima de registros por lote.
+
+    Yields:
+        list: Lotes com no máximo `batch_size` registros.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size deve ser pelo menos 1.")
+
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_page_batches(pages, batch_size):
+    """Agrupa os registros de páginas inteiras em lotes, mantendo os números das páginas.
+
+    Diferente de `iter_batches`, uma página nunca é dividida entre dois lotes, de forma que
+    a confirmação de um lote no banco pode ser registrada como a conclusão das suas páginas.
+    Cada lote reúne páginas até alcançar pelo menos `batch_size` registros.
+
+    Args:
+        pages (iterable): Páginas da API, que trazem o próprio número no campo "page".
+        batch_size (int): Quantidade mínima de registros por lote, exceto no último.
+
+    Yields:
+        tuple: A lista com os números das páginas do lote e a lista de registros.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size deve ser pelo menos 1.")
 
-    return extracted_data
+    page_numbers, batch = [], []
+    for page_data in pages:
+        page_numbers.append(page_data.get("page"))
+        batch.extend(iter_data_wanted(data=[page_data]))
+        if len(batch) >= batch_size:
+            yield page_numbers, batch
+            page_numbers, batch = [], []
+    if page_numbers:
+        yield page_numbers, batch
@@ -0,0 +1,182 @@
+import gzip
+import json
+import logging
+import os
+import zlib
+from datetime import datetime, timezone
+from colorama import Fore, Style
+
+# wbits que faz o zlib ler o cabeçalho e o rodapé do formato gzip.
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+CHUNK_SIZE = 1 << 20
+
+
+def _gzip_members(file, chunk_size=CHUNK_SIZE):
+    """Descomprime os membros gzip de um arquivo, um pedaço de cada vez.
+
+    Cada execução de `archive_pages` acrescenta um membro ao arquivo. Um membro sem rodapé,
+    deixado por uma execução interrompida, é descomprimido até onde os dados chegaram.
+
+    Args:
+        file: Arquivo aberto em modo binário.
+        chunk_size (int): Quantidade de bytes lida por vez (default: 1 MiB).
+
+    Yields:
+        tuple: A posição do início do membro, os bytes descomprimidos e a posição do fim do
+            último membro completo.
+    """
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    member_start = complete = fed = 0
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        while chunk:
+            try:
+                data = decompressor.decompress(chunk)
+            except zlib.error:
+                return
+            fed += len(chunk)
+            start = member_start
+            chunk = b""
+            if decompressor.eof:
+                chunk = decompressor.unused_data
+                complete = member_start + fed - len(chunk)
+                member_start, fed = complete, 0
+                decompressor = zlib.decompressobj(GZIP_WBITS)
+            yield start, data, complete
+
+
+def repair_page_archive(archive_path):
+    """Remove do arquivo o membro incompleto deixado por uma execução interrompida.
+
+    As linhas completas desse membro são regravadas em um membro novo, de forma que as
+    páginas já arquivadas não se percam e as execuções seguintes possam acrescentar
+    membros depois dele.
+
+    Args:
+        archive_path (str): Caminho do arquivo `.jsonl.gz`.
+
+    Returns:
+        int: Quantidade de bytes descartados do final do arquivo.
+    """
+    size = os.path.getsize(archive_path)
+    complete, partial = 0, []
+    with open(archive_path, "rb") as file:
+        for start, data, complete in _gzip_members(file):
+            # Os dados de um membro que terminou descartam os acumulados até aqui.
+            partial = partial + [data] if start == complete else []
+    if complete == size:
+        return 0
+
+    lines = b"".join(partial)
+    lines = lines[: lines.rfind(b"\n") + 1]
+    recovered = lines.count(b"\n")
+    with open(archive_path, "r+b") as file:
+        file.truncate(complete)
+    if lines:
+        with gzip.open(archive_path, "ab") as archive:
+            archive.write(lines)
+
+    logging.warning(
+        Fore.YELLOW
+        + f"Membro incompleto de {size - complete} bytes removido de {archive_path}; "
+        + f"{recovered} linhas completas foram regravadas."
+        + Style.RESET_ALL
+    )
+    return size - complete
+
+
+def archive_pages(pages, archive_path):
+    """Grava cada página bruta da API em um arquivo JSONL comprimido, sem interromper o fluxo.
+
+    O arquivo é aberto em modo de acréscimo, com uma linha por página contendo o horário da
+    coleta e o JSON da página. As páginas recebidas são repassadas adiante sem alteração.
+
+    Args:
+        pages (iterable): Páginas da API, como as geradas por `iter_wanted_pages`.
+        archive_path (str): Caminho do arquivo `.jsonl.gz` de destino.
+
+    Yields:
+        dict: As mesmas páginas recebidas, na mesma ordem.
+    """
+    directory = os.path.dirname(archive_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Um membro incompleto no meio do arquivo impediria a leitura dos membros seguintes.
+    if os.path.exists(archive_path):
+        repair_page_archive(archive_path)
+
+    archived = 0
+    try:
+        with gzip.open(archive_path, "at", encoding="utf-8") as archive:
+            for page_data in pages:
+                line = {
+                    "fetched_at": datetime.now(timezone.utc).isoformat(),
+                    "page": page_data.get("page"),
+                    "data": page_data,
+                }
+                archive.write(json.dumps(line, ensure_ascii=False) + "\n")
+                archive.flush()
+                archived += 1
+                yield page_data
+    finally:
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+
+    logging.info(
+        Fore.GREEN
+        + f"{archived} páginas arquivadas em {archive_path}."
+        + Style.RESET_ALL
+    )
+
+
+def read_page_archive(archive_path):
+    """Lê as páginas de um arquivo gerado por `archive_pages`, sem acessar a rede.
+
+    As linhas completas de um membro final incompleto, deixado por uma execução
+    interrompida, também são lidas. O que não pode ser descomprimido é ignorado e a
+    quantidade de bytes ignorados aparece no log.
+
+    Args:
+        archive_path (str): Caminho do arquivo `.jsonl.gz`.
+
+    Yields:
+        dict: O JSON de cada página, na ordem em que foi arquivada.
+    """
+    replayed = 0
+    size = os.path.getsize(archive_path)
+    complete, pending = 0, b""
+    with open(archive_path, "rb") as file:
+        for _, data, complete in _gzip_members(file):
+            *lines, pending = (pending + data).split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    page_data = json.loads(line)["data"]
+                except ValueError:
+                    logging.warning(
+                        Fore.YELLOW
+                        + f"Linha incompleta ignorada no arquivo {archive_path}."
+                        + Style.RESET_ALL
+                    )
+                    continue
+                replayed += 1
+                yield page_data
+
+    if complete < size:
+        logging.warning(
+            Fore.YELLOW
+            + f"{size - complete} bytes finais de {archive_path} não formam um membro gzip "
+            + f"completo; as linhas completas foram lidas e {len(pending)} bytes da última "
+            + "linha foram ignorados."
+            + Style.RESET_ALL
+        )
+
+    logging.info(
+        Fore.GREEN
+        + f"{replayed} páginas lidas de {archive_path}."
+        + Style.RESET_ALL
+    )
@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from colorama import Fore, Style
+
+THROTTLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(retry_after):
+    """Converte o header Retry-After em segundos de espera.
+
+    Args:
+        retry_after (str): Valor do header, em segundos ou no formato de data HTTP.
+
+    Returns:
+        float: Segundos de espera, ou None se o header estiver ausente ou for inválido.
+    """
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Token bucket compartilhado entre as sessões de requisição, com ajuste adaptativo da taxa.
+
+    A taxa começa no orçamento informado e é reduzida multiplicativamente a cada resposta 429 ou
+    5xx, voltando a subir aos poucos a cada resposta bem-sucedida até o orçamento máximo. Um
+    header Retry-After pausa todas as sessões que compartilham o limitador pelo tempo indicado.
+
+    Args:
+        rate (float): Orçamento de requisições por segundo.
+        burst (int): Número máximo de requisições liberadas de uma só vez.
+        min_rate (float): Menor taxa permitida após as reduções (default: 0.5).
+        increase_step (float): Incremento aditivo aplicado à taxa a cada sucesso (default: 0.5).
+        decrease_factor (float): Fator multiplicativo aplicado à taxa a cada erro (default: 0.5).
+    """
+
+    def __init__(
+        self, rate, burst, min_rate=0.5, increase_step=0.5, decrease_factor=0.5
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate deve ser positivo e burst deve ser pelo menos 1.")
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = burst
+        self.min_rate = min(min_rate, self.max_rate)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled_responses = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # Durante uma pausa `updated_at` fica no futuro, e nenhum token é creditado até lá.
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = max(self.updated_at, now)
+
+    def acquire(self):
+        """Bloqueia até que exista um token disponível e o consome."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def observe(self, status_code, retry_after=None):
+        """Ajusta a taxa de acordo com o status de uma resposta recebida.
+
+        Args:
+            status_code (int): Status HTTP da resposta.
+            retry_after (str, optional): Valor do header Retry-After da resposta. Padrão é None.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if status_code in THROTTLE_STATUS_CODES:
+                self.throttled_responses += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = 1 / self.rate
+                self.blocked_until = max(self.blocked_until, now + delay)
+                # O tempo anterior à resposta e o da pausa não geram tokens.
+                self.tokens = 0.0
+                self.updated_at = max(self.updated_at, self.blocked_until)
+                logging.warning(
+                    Fore.YELLOW
+                    + f"Resposta {status_code} recebida, reduzindo a taxa para {self.rate:.2f} req/s "
+                    + f"e pausando por {delay:.2f}s."
+                    + Style.RESET_ALL
+                )
+            elif status_code < 400 and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
@@ -1,15 +1,70 @@
 import requests
 from requests.packages.urllib3.util.retry import Retry # type: ignore
 from requests.adapters import HTTPAdapter
+from src.extract_fuctions.rate_limiter import THROTTLE_STATUS_CODES
 
 
-def create_session():
-    """Cria uma sessão com uma política de retry configurada."""
+class RateLimitedAdapter(HTTPAdapter):
+    """Adapter que passa cada requisição pelo `RateLimiter` compartilhado.
+
+    As respostas 429 e 5xx são repassadas ao limitador, que reduz a taxa e respeita o header
+    Retry-After, e a requisição é repetida até `max_throttle_retries` vezes.
+    """
+
+    def __init__(self, rate_limiter, max_throttle_retries=5, **kwargs):
+        self.rate_limiter = rate_limiter
+        self.max_throttle_retries = max_throttle_retries
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        for attempt in range(self.max_throttle_retries + 1):
+            self.rate_limiter.acquire()
+            response = super().send(request, **kwargs)
+            self.rate_limiter.observe(
+                response.status_code, response.headers.get("Retry-After")
+            )
+            if (
+                response.status_code not in THROTTLE_STATUS_CODES
+                or attempt == self.max_throttle_retries
+            ):
+                response.throttle_retries = attempt
+                return response
+            response.close()
+
+
+def create_session(pool_maxsize=10, rate_limiter=None, http_stats=None):
+    """Cria uma sessão com uma política de retry configurada.
+
+    Args:
+        pool_maxsize (int): Número máximo de conexões mantidas no pool do adapter (default: 10).
+        rate_limiter (RateLimiter, optional): Limitador compartilhado entre as sessões. Quando
+            informado, as respostas 429 e 5xx são tratadas pelo limitador em vez do backoff do urllib3.
+        http_stats (HttpStats, optional): Contadores de requisições, bytes e retries, alimentados
+            por um hook de resposta da sessão. Padrão é None.
+    """
     session = requests.Session()
-    retries = Retry(
-        total=5, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504]
-    )
-    adapter = HTTPAdapter(max_retries=retries)
+    if http_stats is not None:
+        session.hooks["response"].append(http_stats.record)
+    if rate_limiter is None:
+        retries = Retry(
+            total=5, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504]
+        )
+        adapter = HTTPAdapter(
+            max_retries=retries, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize
+        )
+    else:
+        retries = Retry(
+            total=5,
+            backoff_factor=2,
+            status_forcelist=[],
+            respect_retry_after_header=False,
+        )
+        adapter = RateLimitedAdapter(
+            rate_limiter=rate_limiter,
+            max_retries=retries,
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+        )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from colorama import Fore, Style
+
+
+class ResponseCache:
+    """Cache em disco das páginas da API com suporte a requisições condicionais.
+
+    Cada entrada guarda o corpo JSON da página e os validadores (ETag e Last-Modified) da
+    resposta, em um arquivo por combinação de URL e parâmetros. Entradas mais antigas que
+    `ttl_seconds` são removidas, assim como as menos usadas quando o cache passa de `max_bytes`.
+
+    O mtime de cada arquivo é o horário de gravação (`stored_at`) e o atime é o último uso,
+    de forma que `get` e `evict` expiram as entradas pelo mesmo relógio.
+
+    Args:
+        cache_dir (str): Diretório onde as entradas são gravadas.
+        ttl_seconds (int): Tempo de vida de uma entrada em segundos (default: 1 dia).
+        max_bytes (int): Tamanho máximo do cache em bytes (default: 200 MB).
+        offline (bool): Se True, serve as páginas apenas do cache, sem acessar a rede.
+    """
+
+    def __init__(
+        self, cache_dir, ttl_seconds=24 * 60 * 60, max_bytes=200 * 1024 * 1024, offline=False
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, params):
+        key = json.dumps([url, sorted((params or {}).items())], default=str)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, url, params):
+        """Retorna a entrada armazenada para a URL e os parâmetros, ou None se não existir."""
+        path = self._path(url, params)
+        try:
+            stored_at = os.stat(path).st_mtime
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - stored_at > self.ttl_seconds and not self.offline:
+            os.remove(path)
+            return None
+
+        # Só o atime registra o uso; o mtime continua sendo o horário de gravação.
+        os.utime(path, (time.time(), stored_at))
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Monta os headers If-None-Match e If-Modified-Since a partir de uma entrada."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, params, response, body):
+        """Grava o corpo JSON e os validadores de uma resposta.
+
+        Args:
+            url (str): URL requisitada.
+            params (dict): Parâmetros de query da requisição.
+            response (requests.Response): Resposta de onde os validadores são lidos.
+            body (dict): Conteúdo JSON da resposta.
+        """
+        entry = {
+            "url": url,
+            "params": params,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "body": body,
+        }
+        self._write(self._path(url, params), entry)
+
+    def _write(self, path, entry):
+        """Grava a entrada de forma atômica, com o mtime igual ao horário de gravação.
+
+        O arquivo temporário tem nome único, então threads do mesmo processo que gravam a mesma
+        entrada não escrevem no mesmo arquivo.
+        """
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=os.path.dirname(path),
+            prefix=os.path.basename(path) + ".",
+            suffix=".tmp",
+            delete=False,
+        ) as file:
+            json.dump(entry, file)
+            tmp_path = file.name
+        try:
+            os.utime(tmp_path, (entry["stored_at"], entry["stored_at"]))
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    def refresh(self, url, params):
+        """Renova o horário de gravação de uma entrada revalidada com um 304."""
+        path = self._path(url, params)
+        with open(path, "r", encoding="utf-8") as file:
+            entry = json.load(file)
+        entry["stored_at"] = time.time()
+        self._write(path, entry)
+
+    def evict(self):
+        """Remove as entradas expiradas e, se necessário, as menos usadas até caber em `max_bytes`.
+
+        A expiração usa o horário de gravação (mtime), como `get`, e a ordem de uso vem do atime.
+
+        Returns:
+            int: Número de entradas removidas.
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            if now - stat.st_mtime > self.ttl_seconds:
+                os.remove(path)
+                removed += 1
+            else:
+                entries.append((stat.st_atime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(path)
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            logging.info(
+                Fore.YELLOW
+                + f"{removed} entradas removidas do cache em {self.cache_dir}."
+                + Style.RESET_ALL
+            )
+        return removed
@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from colorama import Fore, Style
+
+INCREMENTAL_PARAMS = {"sort_on": "modified", "sort_order": "desc"}
+
+
+def _parse_timestamp(value):
+    """Converte um timestamp ISO 8601 da API em datetime com fuso horário."""
+    if not value:
+        return None
+    timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+class Watermark:
+    """Marca d'água persistida com o registro modificado mais recente já extraído.
+
+    Guarda o maior `modified` visto e os uids dos itens com exatamente esse timestamp, para
+    que itens empatados não sejam descartados nem duplicados na próxima execução.
+
+    Args:
+        path (str): Caminho do arquivo JSON onde a marca d'água é persistida.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.modified = None
+        self.uids = set()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            self.modified = state.get("modified")
+            self.uids = set(state.get("uids", []))
+
+        self._threshold = _parse_timestamp(self.modified)
+        self._threshold_uids = set(self.uids)
+
+    def is_new(self, item):
+        """Indica se o item foi criado ou modificado depois da última execução."""
+        if self._threshold is None:
+            return True
+        modified = _parse_timestamp(item.get("modified"))
+        if modified is None or modified > self._threshold:
+            return True
+        return modified == self._threshold and item.get("uid") not in self._threshold_uids
+
+    def is_older(self, item):
+        """Indica se o item é anterior à marca d'água, ou seja, se a paginação pode parar."""
+        modified = _parse_timestamp(item.get("modified"))
+        return (
+            self._threshold is not None
+            and modified is not None
+            and modified < self._threshold
+        )
+
+    def observe(self, item):
+        """Avança a marca d'água com o timestamp e o uid de um item extraído."""
+        modified = item.get("modified")
+        timestamp = _parse_timestamp(modified)
+        if timestamp is None:
+            return
+        current = _parse_timestamp(self.modified)
+        if current is None or timestamp > current:
+            self.modified = modified
+            self.uids = {item.get("uid")}
+        elif timestamp == current:
+            self.uids.add(item.get("uid"))
+
+    def save(self):
+        """Grava a marca d'água de forma atômica."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"modified": self.modified, "uids": sorted(self.uids)}, file)
+        os.replace(tmp_path, self.path)
+
+        logging.info(
+            Fore.GREEN
+            + f"Marca d'água salva em {self.path}: {self.modified}."
+            + Style.RESET_ALL
+        )
+
+
+def take_until_watermark(pages, watermark):
+    """Filtra as páginas, mantendo apenas os itens novos ou alterados desde a última execução.
+
+    As páginas devem vir ordenadas por `modified` de forma decrescente (veja
+    `INCREMENTAL_PARAMS`). A paginação é interrompida na primeira página que contém um item
+    anterior à marca d'água, e as requisições ainda pendentes são canceladas.
+
+    Args:
+        pages (iterable): Páginas da API, como as geradas por `iter_wanted_pages`.
+        watermark (Watermark): Marca d'água carregada da execução anterior.
+
+    Yields:
+        dict: Páginas contendo somente os itens novos ou alterados.
+    """
+    new_items = 0
+    try:
+        for page_data in pages:
+            items = page_data.get("items", [])
+            fresh = [item for item in items if watermark.is_new(item)]
+            for item in fresh:
+                watermark.observe(item)
+            new_items += len(fresh)
+
+            if fresh:
+                yield {**page_data, "items": fresh}
+
+            if any(watermark.is_older(item) for item in items):
+                break
+    finally:
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+
+    logging.info(
+        Fore.GREEN
+        + f"{new_items} itens novos ou alterados desde a última execução."
+        + Style.RESET_ALL
+    )
@@ -0,0 +1,394 @@
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from colorama import Fore, Style
+
+# Limite de parâmetros por instrução em versões antigas do SQLite.
+SQLITE_MAX_VARIABLES = 999
+# `INSERT ... AS alias` existe a partir do MySQL 8.0.19; VALUES() foi descontinuado no 8.0.20.
+ROW_ALIAS_MIN_VERSION = (8, 0, 19)
+ROW_ALIAS = "new"
+MYSQL_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\x00": "\\0"}
+)
+
+
+def quote_identifier(identifier):
+    """Envolve um nome de tabela ou coluna em crases, escapando as crases internas."""
+    return "`" + str(identifier).replace("`", "``") + "`"
+
+
+def _placeholder(connection):
+    """Retorna o marcador de parâmetro usado pelo driver da conexão."""
+    return "?" if isinstance(connection, sqlite3.Connection) else "%s"
+
+
+def dataframe_to_rows(df):
+    """
+    Converte um DataFrame em tuplas de tipos nativos do Python, trocando valores ausentes por None.
+
+    Args:
+        df (pd.DataFrame): O DataFrame a ser convertido.
+
+    Returns:
+        list: Lista de tuplas, uma por linha, na ordem das colunas do DataFrame.
+    """
+    values = df.astype(object).where(df.notna(), None)
+    return list(values.itertuples(index=False, name=None))
+
+
+def _report(method, table, rows, started_at):
+    """Registra no log e retorna as estatísticas de uma carga."""
+    seconds = time.perf_counter() - started_at
+    rows_per_second = rows / seconds if seconds > 0 else float("inf")
+    logging.info(
+        Fore.GREEN
+        + f"{rows} linhas carregadas em {table} via {method} em {seconds:.2f}s ({rows_per_second:,.0f} linhas/s)."
+        + Style.RESET_ALL
+    )
+    return {
+        "method": method,
+        "table": table,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows_per_second,
+    }
+
+
+def insert_dataframe_batched(connection, df, table, batch_size=1000):
+    """
+    Insere um DataFrame com INSERTs de múltiplas linhas, em lotes, dentro de uma única transação.
+
+    Funciona tanto com conexões do `mysql.connector` quanto com `sqlite3`, o que permite testar a
+    carga sem um servidor MySQL. Em caso de erro, a transação inteira é desfeita.
+
+    Args:
+        connection: Conexão com o banco de dados.
+        df (pd.DataFrame): O DataFrame a ser inserido.
+        table (str): Nome da tabela de destino.
+        batch_size (int): Quantidade de linhas por instrução INSERT (default: 1000).
+
+    Returns:
+        dict: Estatísticas da carga (linhas, segundos e linhas por segundo).
+
+    Raises:
+        Error: Caso ocorra um erro durante a inserção.
+    """
+    started_at = time.perf_counter()
+    cursor = connection.cursor()
+    try:
+        rows = _execute_batched_inserts(connection, cursor, df, table, batch_size)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logging.error(
+            Fore.RED + f"Erro ao inserir os dados em {table}, transação desfeita." + Style.RESET_ALL
+        )
+        raise
+    finally:
+        cursor.close()
+
+    return _report("insert em lotes", table, rows, started_at)
+
+
+def _supports_row_alias(connection):
+    """Indica se o servidor MySQL aceita o alias de linha em `INSERT ... AS new ON DUPLICATE KEY`.
+
+    O MariaDB e as versões do MySQL anteriores à 8.0.19 só aceitam a função VALUES().
+    """
+    get_server_info = getattr(connection, "get_server_info", None)
+    server_info = (get_server_info() if get_server_info is not None else None) or ""
+    version = re.match(r"(\d+)\.(\d+)\.(\d+)", server_info)
+    if version is None or "mariadb" in server_info.lower():
+        return False
+    return tuple(int(part) for part in version.groups()) >= ROW_ALIAS_MIN_VERSION
+
+
+def _upsert_suffix(connection, columns, key):
+    """Monta a cláusula que transforma o INSERT em upsert no dialeto da conexão."""
+    updates = [column for column in columns if column != key]
+    if isinstance(connection, sqlite3.Connection):
+        assignments = ", ".join(
+            f"{quote_identifier(column)} = excluded.{quote_identifier(column)}"
+            for column in updates
+        )
+        return f" ON CONFLICT ({quote_identifier(key)}) DO UPDATE SET {assignments}"
+
+    if _supports_row_alias(connection):
+        alias = quote_identifier(ROW_ALIAS)
+        assignments = ", ".join(
+            f"{quote_identifier(column)} = {alias}.{quote_identifier(column)}"
+            for column in updates
+        )
+        return f" AS {alias} ON DUPLICATE KEY UPDATE {assignments}"
+
+    assignments = ", ".join(
+        f"{quote_identifier(column)} = VALUES({quote_identifier(column)})"
+        for column in updates
+    )
+    return f" ON DUPLICATE KEY UPDATE {assignments}"
+
+
+def _execute_batched_inserts(connection, cursor, df, table, batch_size, upsert_key=None):
+    """Executa os INSERTs de múltiplas linhas de um DataFrame, sem confirmar a transação."""
+    columns = list(df.columns)
+    rows = dataframe_to_rows(df)
+    placeholder = _placeholder(connection)
+
+    if isinstance(connection, sqlite3.Connection):
+        batch_size = max(1, min(batch_size, SQLITE_MAX_VARIABLES // len(columns)))
+
+    row_placeholder = "(" + ", ".join([placeholder] * len(columns)) + ")"
+    insert_prefix = (
+        f"INSERT INTO {quote_identifier(table)} "
+        f"({', '.join(quote_identifier(column) for column in columns)}) VALUES "
+    )
+    suffix = _upsert_suffix(connection, columns, upsert_key) if upsert_key else ""
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        sql = insert_prefix + ", ".join([row_placeholder] * len(batch)) + suffix
+        cursor.execute(sql, [value for row in batch for value in row])
+
+    return len(rows)
+
+
+def _select_stored_hashes(cursor, table, key, hash_column, soft_delete_column=None):
+    """Lê os hashes gravados na tabela, por chave."""
+    stored_hash = quote_identifier(hash_column)
+    if soft_delete_column is not None:
+        # Linhas removidas logicamente voltam como alteradas caso reapareçam.
+        stored_hash = (
+            f"CASE WHEN {quote_identifier(soft_delete_column)} IS NULL "
+            f"THEN {stored_hash} END"
+        )
+    cursor.execute(
+        f"SELECT {quote_identifier(key)}, {stored_hash} FROM {quote_identifier(table)}"
+    )
+    return dict(cursor.fetchall())
+
+
+def read_stored_hashes(connection, table, key="uid", hash_column="content_hash"):
+    """
+    Lê os hashes de conteúdo já gravados na tabela.
+
+    Args:
+        connection: Conexão com o banco de dados.
+        table (str): Nome da tabela.
+        key (str): Coluna com o identificador estável do registro (default: "uid").
+        hash_column (str): Coluna com o hash de conteúdo (default: "content_hash").
+
+    Returns:
+        dict: Dicionário com a chave de cada registro e o seu hash.
+    """
+    cursor = connection.cursor()
+    try:
+        return _select_stored_hashes(cursor, table, key, hash_column)
+    finally:
+        cursor.close()
+
+
+def count_rows(connection, table):
+    """Retorna o número de linhas de uma tabela."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table)}")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def upsert_dataframe(
+    connection,
+    df,
+    table,
+    key="uid",
+    hash_column="content_hash",
+    batch_size=1000,
+    soft_delete_column=None,
+    stored_hashes=None,
+):
+    """
+    Grava somente as linhas novas ou alteradas de um DataFrame, comparando os hashes de conteúdo.
+
+    Os hashes já gravados na tabela são lidos uma única vez e apenas as linhas cujo hash mudou
+    são enviadas com INSERT ... AS new ON DUPLICATE KEY UPDATE (VALUES() no MariaDB e no MySQL
+    anterior ao 8.0.19, ON CONFLICT no SQLite), tornando a
+    carga idempotente. Com `soft_delete_column`, as linhas que não vieram no DataFrame recebem a
+    data de remoção; por isso essa opção só deve ser usada com extrações completas, nunca com
+    a extração incremental.
+
+    Args:
+        connection: Conexão com o banco de dados.
+        df (pd.DataFrame): O DataFrame com as colunas `key` e `hash_column`.
+        table (str): Nome da tabela de destino, com chave primária ou única em `key`.
+        key (str): Coluna com o identificador estável do registro (default: "uid").
+        hash_column (str): Coluna com o hash de conteúdo (default: "content_hash").
+        batch_size (int): Quantidade de linhas por instrução INSERT (default: 1000).
+        soft_delete_column (str, optional): Coluna DATETIME preenchida nas linhas que
+            desapareceram da extração. Padrão é None, que desativa a remoção lógica.
+        stored_hashes (dict, optional): Hashes já gravados, por chave, lidos com
+            `read_stored_hashes`. Se None, são lidos da tabela. Padrão é None.
+
+    Returns:
+        dict: Estatísticas da carga, incluindo linhas inseridas, atualizadas, restauradas (removidas
+            logicamente que reapareceram), inalteradas e removidas.
+
+    Raises:
+        Error: Caso ocorra um erro durante a carga.
+    """
+    started_at = time.perf_counter()
+    placeholder = _placeholder(connection)
+    df = df.drop_duplicates(subset=[key], keep="last")
+    cursor = connection.cursor()
+    try:
+        if stored_hashes is None:
+            stored_hashes = _select_stored_hashes(
+                cursor, table, key, hash_column, soft_delete_column
+            )
+
+        previous_hashes = df[key].map(stored_hashes)
+        changed = df[previous_hashes.ne(df[hash_column]) | previous_hashes.isna()]
+        if soft_delete_column is not None:
+            changed = changed.assign(**{soft_delete_column: None})
+        # Com a remoção lógica, as linhas removidas voltam com hash None: elas já existem
+        # na tabela e são restauradas, não inseridas.
+        exists = changed[key].isin(set(stored_hashes))
+        inserted = int((~exists).sum())
+        restored = int((exists & changed[key].map(stored_hashes).isna()).sum())
+        _execute_batched_inserts(
+            connection, cursor, changed, table, batch_size, upsert_key=key
+        )
+
+        deleted = 0
+        if soft_delete_column is not None:
+            missing = list(set(stored_hashes) - set(df[key]))
+            for start in range(0, len(missing), SQLITE_MAX_VARIABLES):
+                batch = missing[start : start + SQLITE_MAX_VARIABLES]
+                cursor.execute(
+                    f"UPDATE {quote_identifier(table)} "
+                    f"SET {quote_identifier(soft_delete_column)} = CURRENT_TIMESTAMP "
+                    f"WHERE {quote_identifier(soft_delete_column)} IS NULL "
+                    f"AND {quote_identifier(key)} IN ({', '.join([placeholder] * len(batch))})",
+                    batch,
+                )
+                deleted += max(cursor.rowcount, 0)
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logging.error(
+            Fore.RED + f"Erro ao atualizar os dados em {table}, transação desfeita." + Style.RESET_ALL
+        )
+        raise
+    finally:
+        cursor.close()
+
+    report = _report("upsert por hash", table, len(changed), started_at)
+    report.update(
+        {
+            "inserted": inserted,
+            "updated": len(changed) - inserted - restored,
+            "restored": restored,
+            "unchanged": len(df) - len(changed),
+            "deleted": deleted,
+        }
+    )
+    logging.info(
+        Fore.GREEN
+        + f"Upsert em {table}: {report['inserted']} novas, {report['updated']} alteradas, "
+        + f"{report['restored']} restauradas, "
+        + f"{report['unchanged']} inalteradas e {report['deleted']} removidas."
+        + Style.RESET_ALL
+    )
+    return report
+
+
+def _mysql_text_value(value):
+    """Formata um valor no formato de texto padrão do LOAD DATA (tabulação e \\N para nulos)."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return str(int(value))
+    return str(value).translate(MYSQL_ESCAPES)
+
+
+def load_data_local_infile(connection, df, table):
+    """
+    Carrega um DataFrame no MySQL gravando um CSV temporário e usando LOAD DATA LOCAL INFILE.
+
+    A conexão precisa ter sido aberta com `allow_local_infile=True` e o servidor precisa aceitar
+    `local_infile`. É o caminho mais rápido para cargas grandes.
+
+    Args:
+        connection: Conexão do `mysql.connector` com o banco de dados.
+        df (pd.DataFrame): O DataFrame a ser carregado.
+        table (str): Nome da tabela de destino.
+
+    Returns:
+        dict: Estatísticas da carga (linhas, segundos e linhas por segundo).
+
+    Raises:
+        Error: Caso ocorra um erro durante a carga.
+    """
+    started_at = time.perf_counter()
+    columns = ", ".join(quote_identifier(column) for column in df.columns)
+    rows = dataframe_to_rows(df)
+
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", newline="", suffix=".csv", delete=False
+    ) as csv_file:
+        for row in rows:
+            csv_file.write("\t".join(_mysql_text_value(value) for value in row) + "\n")
+        csv_path = csv_file.name.replace("\\", "/")
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE '{csv_path}' INTO TABLE {quote_identifier(table)} "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+            f"LINES TERMINATED BY '\\n' ({columns})"
+        )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logging.error(
+            Fore.RED + f"Erro ao carregar os dados em {table} via LOAD DATA, transação desfeita." + Style.RESET_ALL
+        )
+        raise
+    finally:
+        cursor.close()
+        os.remove(csv_path)
+
+    return _report("LOAD DATA LOCAL INFILE", table, len(rows), started_at)
+
+
+def load_dataframe(connection, df, table, method="batched", batch_size=1000, **options):
+    """
+    Carrega um DataFrame no banco de dados com o método escolhido.
+
+    Args:
+        connection: Conexão com o banco de dados.
+        df (pd.DataFrame): O DataFrame a ser carregado.
+        table (str): Nome da tabela de destino.
+        method (str): "batched" para INSERTs em lotes, "infile" para LOAD DATA LOCAL INFILE ou
+            "upsert" para gravar somente as linhas novas ou alteradas.
+        batch_size (int): Quantidade de linhas por instrução nos métodos "batched" e "upsert" (default: 1000).
+        **options: Argumentos adicionais repassados para `upsert_dataframe`.
+
+    Returns:
+        dict: Estatísticas da carga (linhas, segundos e linhas por segundo).
+    """
+    if method == "batched":
+        return insert_dataframe_batched(connection, df, table, batch_size=batch_size)
+    if method == "infile":
+        return load_data_local_infile(connection, df, table)
+    if method == "upsert":
+        return upsert_dataframe(connection, df, table, batch_size=batch_size, **options)
+    raise ValueError(
+        f"Método de carga desconhecido: {method}. Use 'batched', 'infile' ou 'upsert'."
+    )
@@ -1,9 +1,6 @@
 import logging
 from colorama import Fore, Style
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
 
 def user_auth_interaction():
     """
@@ -1,13 +1,13 @@
 from dotenv import load_dotenv
 from os import getenv
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
+from contextlib import contextmanager
+import time
 import logging
 from colorama import Fore, Style
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
 
 def get_credentials():
     """
@@ -25,7 +25,7 @@ def get_credentials():
     return DB_USERNAME, DB_PASSWORD, DB_HOST, DB_NAME
 
 
-def connect_to_mysql(username, password, host, database=None):
+def connect_to_mysql(username, password, host, database=None, allow_local_infile=False):
     """
     Estabelece uma conexão com o banco de dados MySQL.
 
@@ -34,6 +34,7 @@ def connect_to_mysql(username, password, host, database=None):
         password (str): Senha do banco de dados.
         host (str): Host do banco de dados (ex: localhost).
         database (str, optional): Nome do banco de dados. Padrão é None.
+        allow_local_infile (bool, optional): Habilita o LOAD DATA LOCAL INFILE. Padrão é False.
 
     Returns:
         tuple: Uma tupla contendo a conexão e o cursor do banco de dados.
@@ -44,7 +45,11 @@ def connect_to_mysql(username, password, host, database=None):
     """
     try:
         connection = mysql.connector.connect(
-            user=username, password=password, host=host, database=database
+            user=username,
+            password=password,
+            host=host,
+            database=database,
+            allow_local_infile=allow_local_infile,
         )
         if connection.is_connected():
             logging.info(
@@ -61,23 +66,128 @@ def connect_to_mysql(username, password, host, database=None):
         )
         return None, None
 
-def connect_to_database(user, password, host, database, connection):
+def connect_to_database(user, password, host, database, connection=None):
+    """
+    Conecta ao banco de dados informado, reaproveitando uma conexão já aberta quando possível.
+
+    Args:
+        user (str): Nome de usuário do banco de dados.
+        password (str): Senha do banco de dados.
+        host (str): Host do banco de dados (ex: localhost).
+        database (str): Nome do banco de dados.
+        connection (optional): Conexão já aberta com o servidor. Se estiver ativa, apenas troca
+            o banco de dados em uso, sem um novo handshake. Padrão é None.
+
+    Returns:
+        tuple: Uma tupla contendo a conexão e o cursor do banco de dados.
+               Retorna (None, None) em caso de falha na conexão.
+    """
     try:
-        connect_to_mysql(username=user, password=password, host=host, database=database)
-        if connection.is_connected():
-            logging.info(
-                Fore.GREEN
-                + f"Conexão ao MySQL realizada com sucesso! Conectado ao banco de dados: {database}."
-                + Style.RESET_ALL
+        if connection is None or not connection.is_connected():
+            return connect_to_mysql(
+                username=user, password=password, host=host, database=database
             )
-            cursor = connection.cursor(buffered=True)
-            return connection, cursor
+
+        connection.database = database
+        logging.info(
+            Fore.GREEN
+            + f"Conexão ao MySQL realizada com sucesso! Conectado ao banco de dados: {database}."
+            + Style.RESET_ALL
+        )
+        cursor = connection.cursor(buffered=True)
+        return connection, cursor
     except Error as e:
         logging.error(
             Fore.RED + f"Erro ao conectar ao banco de dados {database}: {e}" + Style.RESET_ALL
         )
         return None, None
-    
+
+
+def create_connection_pool(
+    username,
+    password,
+    host,
+    database,
+    pool_size=5,
+    pool_name="fbi_wanted",
+    allow_local_infile=False,
+):
+    """
+    Cria um pool de conexões com o banco de dados MySQL.
+
+    Args:
+        username (str): Nome de usuário do banco de dados.
+        password (str): Senha do banco de dados.
+        host (str): Host do banco de dados (ex: localhost).
+        database (str): Nome do banco de dados.
+        pool_size (int, optional): Número de conexões mantidas no pool. Padrão é 5.
+        pool_name (str, optional): Nome do pool. Padrão é "fbi_wanted".
+        allow_local_infile (bool, optional): Habilita o LOAD DATA LOCAL INFILE. Padrão é False.
+
+    Returns:
+        MySQLConnectionPool: O pool de conexões.
+
+    Raises:
+        Error: Caso ocorra um erro ao tentar criar o pool.
+    """
+    pool = pooling.MySQLConnectionPool(
+        pool_name=pool_name,
+        pool_size=pool_size,
+        pool_reset_session=True,
+        user=username,
+        password=password,
+        host=host,
+        database=database,
+        allow_local_infile=allow_local_infile,
+    )
+    logging.info(
+        Fore.GREEN
+        + f"Pool de conexões {pool_name} criado com {pool_size} conexões."
+        + Style.RESET_ALL
+    )
+    return pool
+
+
+@contextmanager
+def pooled_connection(pool, timeout=30, health_check_attempts=3):
+    """
+    Retira uma conexão do pool, verifica se ela está ativa e a devolve ao final do bloco.
+
+    Se todas as conexões estiverem em uso, aguarda até `timeout` segundos por uma livre.
+    Caso ocorra um erro dentro do bloco, a transação em aberto é desfeita.
+
+    Args:
+        pool (MySQLConnectionPool): O pool criado por `create_connection_pool`.
+        timeout (float, optional): Tempo máximo de espera por uma conexão livre. Padrão é 30.
+        health_check_attempts (int, optional): Tentativas de reconexão no health check. Padrão é 3.
+
+    Yields:
+        PooledMySQLConnection: Uma conexão ativa do pool.
+
+    Raises:
+        PoolError: Caso nenhuma conexão fique livre dentro do tempo limite.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    try:
+        connection.ping(reconnect=True, attempts=health_check_attempts, delay=1)
+        yield connection
+    except Exception:
+        if connection.is_connected():
+            connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
 def disconnect_database(connection, cursor):
     """
     Encerra a conexão com o banco de dados MySQL e fecha o cursor.
@@ -0,0 +1,134 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from colorama import Fore, Style
+from src.load_fuctions.bulk_loader import (
+    count_rows,
+    insert_dataframe_batched,
+    read_stored_hashes,
+    upsert_dataframe,
+)
+from src.load_fuctions.mysql_database import pooled_connection
+
+
+def partition_dataframe(df, partitions, key="uid"):
+    """
+    Divide um DataFrame em partições pelo hash da chave de cada registro.
+
+    Registros com a mesma chave sempre caem na mesma partição, de forma que duas partições
+    nunca disputam a mesma linha da tabela.
+
+    Args:
+        df (pd.DataFrame): O DataFrame a ser dividido.
+        partitions (int): Número de partições.
+        key (str): Coluna usada no particionamento (default: "uid").
+
+    Returns:
+        list: Lista com um DataFrame por partição.
+    """
+    if partitions < 1:
+        raise ValueError("partitions deve ser pelo menos 1.")
+    buckets = pd.util.hash_pandas_object(df[key], index=False).to_numpy() % partitions
+    return [df[buckets == partition] for partition in range(partitions)]
+
+
+def _load_partition(pool, partition, table, method, batch_size, key, stored_hashes):
+    """Carrega uma partição em uma conexão própria do pool, em uma transação própria."""
+    with pooled_connection(pool) as connection:
+        if method == "upsert":
+            return upsert_dataframe(
+                connection,
+                partition,
+                table,
+                key=key,
+                batch_size=batch_size,
+                stored_hashes=stored_hashes,
+            )
+        return insert_dataframe_batched(connection, partition, table, batch_size=batch_size)
+
+
+def load_partitioned(
+    pool, df, table, partitions=4, key="uid", method="batched", batch_size=1000
+):
+    """
+    Carrega um DataFrame em paralelo, com uma conexão do pool e uma transação por partição.
+
+    Ao final, confere se o número de linhas da tabela corresponde ao esperado. A remoção
+    lógica do `upsert_dataframe` não é suportada aqui, já que cada partição enxerga apenas
+    parte das chaves.
+
+    Args:
+        pool (MySQLConnectionPool): Pool com pelo menos `partitions` conexões.
+        df (pd.DataFrame): O DataFrame a ser carregado.
+        table (str): Nome da tabela de destino.
+        partitions (int): Número de partições carregadas ao mesmo tempo (default: 4).
+        key (str): Coluna usada no particionamento e no upsert (default: "uid").
+        method (str): "batched" para INSERTs em lotes ou "upsert" para gravar somente as linhas
+            novas ou alteradas (default: "batched").
+        batch_size (int): Quantidade de linhas por instrução INSERT (default: 1000).
+
+    Returns:
+        dict: Estatísticas da carga, com os relatórios de cada partição e o resultado da
+              verificação de consistência.
+
+    Raises:
+        Error: Caso a carga de alguma partição falhe.
+    """
+    if method not in ("batched", "upsert"):
+        raise ValueError(f"Método de carga desconhecido: {method}. Use 'batched' ou 'upsert'.")
+
+    started_at = time.perf_counter()
+    stored_hashes = None
+    with pooled_connection(pool) as connection:
+        rows_before = count_rows(connection, table)
+        if method == "upsert":
+            df = df.drop_duplicates(subset=[key], keep="last")
+            stored_hashes = read_stored_hashes(connection, table, key=key)
+
+    with ThreadPoolExecutor(max_workers=partitions) as executor:
+        futures = [
+            executor.submit(
+                _load_partition, pool, partition, table, method, batch_size, key, stored_hashes
+            )
+            for partition in partition_dataframe(df, partitions, key=key)
+        ]
+        reports = [future.result() for future in futures]
+
+    with pooled_connection(pool) as connection:
+        rows_after = count_rows(connection, table)
+
+    if method == "upsert":
+        expected_rows = rows_before + sum(report["inserted"] for report in reports)
+    else:
+        expected_rows = rows_before + len(df)
+
+    seconds = time.perf_counter() - started_at
+    consistent = rows_after == expected_rows
+    if consistent:
+        logging.info(
+            Fore.GREEN
+            + f"{len(df)} linhas processadas em {table} com {partitions} partições em {seconds:.2f}s "
+            + f"({len(df) / seconds:,.0f} linhas/s). Contagem conferida: {rows_after} linhas."
+            + Style.RESET_ALL
+        )
+    else:
+        logging.error(
+            Fore.RED
+            + f"Contagem inconsistente em {table}: esperado {expected_rows}, encontrado {rows_after}."
+            + Style.RESET_ALL
+        )
+
+    return {
+        "method": method,
+        "table": table,
+        "partitions": partitions,
+        "rows": len(df),
+        "seconds": seconds,
+        "rows_per_second": len(df) / seconds if seconds > 0 else float("inf"),
+        "rows_before": rows_before,
+        "rows_after": rows_after,
+        "expected_rows": expected_rows,
+        "consistent": consistent,
+        "partition_reports": reports,
+    }
@@ -0,0 +1,252 @@
+import logging
+import os
+import time
+from datetime import date
+import pandas as pd
+from colorama import Fore, Style
+from src.transform_fuctions.transform_data import COLUMNS, INTEGER_COLUMNS
+
+PARTITION_COLUMN = "snapshot_date"
+# Colunas usadas nos filtros mais comuns; ordenar por elas deixa as estatísticas de cada
+# row group mais seletivas e permite pular row groups inteiros na leitura.
+SORT_COLUMNS = ["sex", "race", "place_of_birth"]
+FILTER_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+
+def _require_pyarrow():
+    """Importa o pyarrow, que é necessário apenas para o destino Parquet."""
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as fs
+    except ImportError as e:
+        raise ImportError(
+            "O destino Parquet requer o pyarrow. Instale com: pip install pyarrow"
+        ) from e
+    return pa, ds, fs
+
+
+def parquet_schema(extra_columns=()):
+    """
+    Monta o esquema fixo do dataset, independente dos dtypes do DataFrame de entrada.
+
+    As idades são sempre `int16` e os textos sempre `string`, de forma que os arquivos de
+    execuções diferentes (com ou sem `optimize_dtypes`) continuam compatíveis entre si.
+
+    Args:
+        extra_columns (iterable): Colunas adicionais do DataFrame, como `content_hash`, gravadas
+            como `string`.
+
+    Returns:
+        pyarrow.Schema: O esquema das colunas de dados, sem a coluna de partição.
+    """
+    pa, _, _ = _require_pyarrow()
+    fields = [
+        pa.field(column, pa.int16() if column in INTEGER_COLUMNS else pa.string())
+        for column in COLUMNS
+    ]
+    fields += [pa.field(column, pa.string()) for column in extra_columns]
+    return pa.schema(fields)
+
+
+def _to_table(df, schema):
+    """Converte o DataFrame para uma tabela Arrow com o esquema fixo."""
+    pa, _, _ = _require_pyarrow()
+    arrays = []
+    for field in schema:
+        column = df[field.name]
+        if field.name in INTEGER_COLUMNS:
+            values = column.astype("Int16")
+        else:
+            values = column.astype(object).where(column.notna(), None)
+        arrays.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_parquet_snapshot(
+    df,
+    dataset_dir,
+    snapshot_date=None,
+    compression="zstd",
+    row_group_size=100_000,
+    sort_by=SORT_COLUMNS,
+    merge_key=None,
+):
+    """
+    Grava o DataFrame como um snapshot em um dataset Parquet particionado por data.
+
+    Cada execução grava a partição `snapshot_date=AAAA-MM-DD`, substituindo a partição do
+    mesmo dia se ela já existir, de forma que repetir a execução não duplica linhas.
+
+    Com `merge_key`, o DataFrame é tratado como o delta de uma extração incremental: ele é
+    combinado com o snapshot mais recente, e as linhas antigas com a mesma chave são
+    substituídas. Assim, o novo snapshot continua com todos os registros.
+
+    Args:
+        df (pd.DataFrame): O DataFrame final da transformação.
+        dataset_dir (str): Diretório raiz do dataset.
+        snapshot_date (str or date, optional): Data do snapshot. Padrão é None, que usa a data atual.
+        compression (str): Codec de compressão do Parquet (default: "zstd").
+        row_group_size (int): Número máximo de linhas por row group (default: 100.000).
+        sort_by (list): Colunas usadas para ordenar as linhas antes da gravação (default:
+            `SORT_COLUMNS`).
+        merge_key (str, optional): Coluna usada para combinar o DataFrame com o snapshot mais
+            recente, como "uid". Padrão é None, que grava apenas o DataFrame.
+
+    Returns:
+        dict: Relatório com a partição gravada, o número de linhas e o tempo gasto.
+    """
+    pa, ds, _ = _require_pyarrow()
+    started_at = time.perf_counter()
+    snapshot_date = str(snapshot_date or date.today().isoformat())
+    if merge_key is not None:
+        df = merge_with_latest_snapshot(df, dataset_dir, key=merge_key)
+
+    extra_columns = [column for column in df.columns if column not in COLUMNS]
+    table = _to_table(df, parquet_schema(extra_columns))
+    sort_keys = [(column, "ascending") for column in sort_by if column in table.column_names]
+    if sort_keys:
+        table = table.sort_by(sort_keys)
+    table = table.append_column(
+        PARTITION_COLUMN, pa.array([snapshot_date] * table.num_rows, type=pa.string())
+    )
+
+    ds.write_dataset(
+        table,
+        base_dir=dataset_dir,
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive"
+        ),
+        existing_data_behavior="delete_matching",
+        file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, table.num_rows),
+        basename_template="part-{i}.parquet",
+    )
+
+    seconds = time.perf_counter() - started_at
+    partition = os.path.join(dataset_dir, f"{PARTITION_COLUMN}={snapshot_date}")
+    logging.info(
+        Fore.GREEN
+        + f"{table.num_rows} linhas gravadas em {partition} ({compression}) em {seconds:.2f}s."
+        + Style.RESET_ALL
+    )
+    return {
+        "method": "parquet",
+        "partition": partition,
+        "rows": table.num_rows,
+        "seconds": seconds,
+    }
+
+
+def merge_with_latest_snapshot(df, dataset_dir, key="uid"):
+    """
+    Combina o delta de uma extração incremental com o snapshot mais recente do dataset.
+
+    Args:
+        df (pd.DataFrame): O DataFrame com os registros novos ou alterados.
+        dataset_dir (str): Diretório raiz do dataset.
+        key (str): Coluna que identifica o registro (default: "uid").
+
+    Returns:
+        pd.DataFrame: As linhas do snapshot cuja chave não está no delta, seguidas do delta.
+    """
+    if not list_snapshots(dataset_dir):
+        return df
+    stored = read_parquet_snapshot(dataset_dir).drop(columns=[PARTITION_COLUMN])
+    kept = stored[~stored[key].isin(df[key])]
+    logging.info(
+        Fore.GREEN
+        + f"{len(df)} linhas do delta combinadas com {len(kept)} linhas do snapshot anterior."
+        + Style.RESET_ALL
+    )
+    return pd.concat([kept.astype(object), df.astype(object)], ignore_index=True)
+
+
+def list_snapshots(dataset_dir):
+    """Retorna as datas dos snapshots gravados no dataset, em ordem crescente."""
+    if not os.path.isdir(dataset_dir):
+        return []
+    prefix = f"{PARTITION_COLUMN}="
+    return sorted(
+        name[len(prefix):] for name in os.listdir(dataset_dir) if name.startswith(prefix)
+    )
+
+
+def _filter_expression(filters):
+    """Converte filtros no formato [(coluna, operador, valor), ...] em uma expressão do Arrow."""
+    _, ds, _ = _require_pyarrow()
+    expression = None
+    for column, operator, value in filters:
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Operador desconhecido: {operator}. Use um de {FILTER_OPERATORS}.")
+        field = ds.field(column)
+        if operator == "in":
+            condition = field.isin(list(value))
+        elif operator == "not in":
+            condition = ~field.isin(list(value))
+        else:
+            condition = {
+                "==": field == value,
+                "!=": field != value,
+                "<": field < value,
+                "<=": field <= value,
+                ">": field > value,
+                ">=": field >= value,
+            }[operator]
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_parquet_snapshot(dataset_dir, columns=None, filters=None, snapshot_date="latest"):
+    """
+    Lê um snapshot do dataset Parquet, carregando apenas as colunas e os row groups necessários.
+
+    Os filtros são aplicados no próprio scan: partições de outras datas não são abertas e
+    row groups cujas estatísticas não atendem aos filtros são pulados. Os arquivos locais
+    são lidos com memory map.
+
+    Args:
+        dataset_dir (str): Diretório raiz do dataset.
+        columns (list, optional): Colunas a carregar. Padrão é None, que carrega todas.
+        filters (list, optional): Filtros no formato [(coluna, operador, valor), ...], combinados
+            com AND, por exemplo [("sex", "==", "Female"), ("age_min", ">=", 30)]. Padrão é None.
+        snapshot_date (str, optional): Data do snapshot, "latest" para o mais recente ou None
+            para todos os snapshots (default: "latest").
+
+    Returns:
+        pd.DataFrame: As linhas e colunas selecionadas.
+
+    Raises:
+        FileNotFoundError: Caso o dataset não tenha nenhum snapshot.
+    """
+    pa, ds, fs = _require_pyarrow()
+    snapshots = list_snapshots(dataset_dir)
+    if not snapshots:
+        raise FileNotFoundError(f"Nenhum snapshot Parquet encontrado em {dataset_dir}.")
+
+    filters = list(filters or [])
+    if snapshot_date == "latest":
+        snapshot_date = snapshots[-1]
+    if snapshot_date is not None:
+        filters.append((PARTITION_COLUMN, "==", str(snapshot_date)))
+
+    dataset = ds.dataset(
+        dataset_dir,
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive"
+        ),
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+    table = dataset.to_table(columns=columns, filter=_filter_expression(filters))
+
+    logging.info(
+        Fore.GREEN
+        + f"{table.num_rows} linhas lidas de {dataset_dir} (snapshot {snapshot_date or 'todos'})."
+        + Style.RESET_ALL
+    )
+    # As idades voltam como inteiros anuláveis, como na saída de `change_type_values`.
+    integer_types = {pa.int16(): pd.Int16Dtype()}
+    return table.to_pandas(types_mapper=integer_types.get)
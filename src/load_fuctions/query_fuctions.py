@@ -1,12 +1,9 @@
 import logging
 from colorama import Fore, Style
 from mysql.connector import Error
+from src.load_fuctions.schema_fuctions import generate_alter_table, generate_create_table
 
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
 def create_database(cursor, database):
     """
     Cria um banco de dados MySQL se ele não existir.
@@ -50,5 +47,101 @@ def show_databases(cursor):
     except Error as e:
         logging.error(
             Fore.RED + f"ERRO: {e}" + Style.RESET_ALL
-        )    
-    
\ No newline at end of file
+        )
+
+
+def create_table(
+    cursor,
+    table,
+    df,
+    primary_key=None,
+    index_columns=None,
+    soft_delete_column=None,
+    **schema_options,
+):
+    """
+    Cria uma tabela com tipos e índices inferidos a partir do DataFrame, se ela não existir.
+
+    Args:
+        cursor: O cursor MySQL usado para executar comandos SQL.
+        table (str): Nome da tabela a ser criada.
+        df (pd.DataFrame): DataFrame cujas colunas definem a tabela.
+        primary_key (str, optional): Coluna usada como chave primária. Padrão é None.
+        index_columns (list, optional): Colunas com índices secundários. Padrão é None, que
+            usa as colunas de filtro definidas em `schema_fuctions.INDEX_COLUMNS`.
+        soft_delete_column (str, optional): Coluna DATETIME usada na remoção lógica. Padrão é None.
+        **schema_options: Demais opções repassadas para `generate_create_table`, como
+            `enum_columns`, `text_columns` e `min_varchar_length`.
+
+    Raises:
+        Error: Caso ocorra um erro ao tentar criar a tabela.
+    """
+    options = {
+        "primary_key": primary_key,
+        "soft_delete_column": soft_delete_column,
+        **schema_options,
+    }
+    if index_columns is not None:
+        options["index_columns"] = index_columns
+
+    try:
+        cursor.execute(generate_create_table(df, table, **options))
+        logging.info(Fore.GREEN + f"Tabela {table} criada com sucesso!" + Style.RESET_ALL)
+    except Error as e:
+        logging.error(
+            Fore.RED + f"Erro ao tentar criar a tabela: {e}" + Style.RESET_ALL
+        )
+
+
+def read_table_columns(cursor, table):
+    """
+    Lê o tipo e o comprimento máximo de cada coluna de uma tabela do banco atual.
+
+    Args:
+        cursor: O cursor MySQL usado para executar comandos SQL.
+        table (str): Nome da tabela.
+
+    Returns:
+        dict: Dicionário no formato {coluna: (tipo, comprimento)}; o comprimento é None nas
+            colunas que não são de texto.
+    """
+    cursor.execute(
+        "SELECT COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH "
+        "FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table,),
+    )
+    return {name: (data_type, length) for name, data_type, length in cursor.fetchall()}
+
+
+def alter_table(cursor, table, df, primary_key=None, index_columns=None, **schema_options):
+    """
+    Ajusta uma tabela existente ao DataFrame, adicionando as colunas ausentes e alargando as
+    colunas VARCHAR.
+
+    Args:
+        cursor: O cursor MySQL usado para executar comandos SQL.
+        table (str): Nome da tabela.
+        df (pd.DataFrame): DataFrame que será carregado na tabela.
+        primary_key (str, optional): Coluna usada como chave primária. Padrão é None.
+        index_columns (list, optional): Colunas com índices secundários. Padrão é None, que
+            usa as colunas de filtro definidas em `schema_fuctions.INDEX_COLUMNS`.
+        **schema_options: Demais opções repassadas para `generate_alter_table`, como
+            `text_columns` e `min_varchar_length`.
+
+    Raises:
+        Error: Caso ocorra um erro ao tentar alterar a tabela.
+    """
+    options = {"primary_key": primary_key, **schema_options}
+    if index_columns is not None:
+        options["index_columns"] = index_columns
+
+    try:
+        statement = generate_alter_table(df, table, read_table_columns(cursor, table), **options)
+        if statement is None:
+            return
+        cursor.execute(statement)
+        logging.info(Fore.GREEN + f"Tabela {table} alterada: {statement}" + Style.RESET_ALL)
+    except Error as e:
+        logging.error(
+            Fore.RED + f"Erro ao tentar alterar a tabela: {e}" + Style.RESET_ALL
+        )
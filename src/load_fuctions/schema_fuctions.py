@@ -0,0 +1,250 @@
+import math
+from pandas.api import types
+from src.transform_fuctions.transform_data import LIST_COLUMNS
+
+INDEX_COLUMNS = ["sex", "race", "place_of_birth", "age_min", "age_max"]
+# Textos livres e as listas concatenadas, que não têm tamanho máximo, viram TEXT; os demais
+# textos recebem um VARCHAR mínimo com folga, alargado por `generate_alter_table` quando uma
+# carga posterior traz valores maiores.
+TEXT_COLUMNS = [
+    "details",
+    "reward_text",
+    "caution",
+    "warning_message",
+    "scars_and_marks",
+    *LIST_COLUMNS,
+]
+COMPACT_INTEGER_COLUMNS = ["age_max", "age_min"]
+# Maior VARCHAR indexável por inteiro no InnoDB com utf8mb4 (3072 bytes / 4 bytes por caractere).
+MAX_VARCHAR_LENGTH = 768
+MAX_ENUM_VALUES = 64
+MIN_VARCHAR_LENGTH = 255
+TEXT_INDEX_PREFIX = 191
+
+INTEGER_TYPES = [
+    ("SMALLINT", -(2**15), 2**15 - 1),
+    ("INT", -(2**31), 2**31 - 1),
+    ("BIGINT", -(2**63), 2**63 - 1),
+]
+
+
+def _quote(identifier):
+    return "`" + str(identifier).replace("`", "``") + "`"
+
+
+def _quote_value(value):
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _varchar_length(max_length, minimum=MIN_VARCHAR_LENGTH):
+    """Arredonda o maior comprimento observado para cima, deixando folga para novos valores,
+    sem passar de `MAX_VARCHAR_LENGTH`."""
+    rounded = 2 ** math.ceil(math.log2(max(max_length, 1) * 1.5))
+    return min(MAX_VARCHAR_LENGTH, max(minimum, rounded))
+
+
+def infer_column_type(
+    series, enum=False, text=False, compact=False, min_varchar_length=MIN_VARCHAR_LENGTH
+):
+    """
+    Infere o tipo MySQL mais justo para uma coluna a partir do dtype e dos valores observados.
+
+    Args:
+        series (pd.Series): A coluna do DataFrame.
+        enum (bool): Se True, usa ENUM quando a coluna tem poucos valores distintos.
+        text (bool): Se True, usa TEXT independentemente do comprimento observado.
+        compact (bool): Se True, usa o menor tipo inteiro (a partir de SMALLINT) que comporta os
+            valores observados; caso contrário, as colunas inteiras viram BIGINT.
+        min_varchar_length (int): Menor comprimento usado em colunas VARCHAR (default: 255).
+
+    Returns:
+        str: O tipo da coluna, por exemplo "SMALLINT", "VARCHAR(64)" ou "TEXT".
+    """
+    values = series.dropna()
+
+    if types.is_bool_dtype(series):
+        return "TINYINT(1)"
+    if types.is_integer_dtype(series):
+        if not compact:
+            return "BIGINT"
+        low = int(values.min()) if len(values) else 0
+        high = int(values.max()) if len(values) else 0
+        for sql_type, type_min, type_max in INTEGER_TYPES:
+            if type_min <= low and high <= type_max:
+                return sql_type
+    if types.is_float_dtype(series):
+        return "DOUBLE"
+    if types.is_datetime64_any_dtype(series):
+        return "DATETIME"
+    if len(values) and isinstance(values.iloc[0], (list, tuple)):
+        return "JSON"
+
+    strings = values.astype(str)
+    max_length = int(strings.str.len().max()) if len(strings) else 0
+    distinct = strings.unique()
+
+    if enum and 0 < len(distinct) <= MAX_ENUM_VALUES:
+        return "ENUM(" + ", ".join(_quote_value(value) for value in sorted(distinct)) + ")"
+    if text or max_length > MAX_VARCHAR_LENGTH:
+        return "TEXT" if max_length * 4 < 2**16 else "MEDIUMTEXT"
+    return f"VARCHAR({_varchar_length(max_length, min_varchar_length)})"
+
+
+def generate_create_table(
+    df,
+    table,
+    primary_key=None,
+    index_columns=INDEX_COLUMNS,
+    enum_columns=(),
+    text_columns=TEXT_COLUMNS,
+    compact_integer_columns=COMPACT_INTEGER_COLUMNS,
+    soft_delete_column=None,
+    min_varchar_length=MIN_VARCHAR_LENGTH,
+):
+    """
+    Gera o comando CREATE TABLE IF NOT EXISTS com tipos justos e índices para um DataFrame.
+
+    As idades viram SMALLINT, os textos curtos viram VARCHAR dimensionado pelo maior valor
+    observado (de `MIN_VARCHAR_LENGTH` a `MAX_VARCHAR_LENGTH`) e os textos livres e as listas
+    concatenadas (`TEXT_COLUMNS`) viram TEXT. Como a tabela não é recriada quando já existe,
+    nenhuma coluna vira ENUM por padrão: um valor novo exigiria um ALTER TABLE.
+
+    Args:
+        df (pd.DataFrame): O DataFrame final da transformação.
+        table (str): Nome da tabela.
+        primary_key (str, optional): Coluna usada como chave primária. Se None ou ausente do
+            DataFrame, é criada uma coluna `id` com AUTO_INCREMENT. Padrão é None.
+        index_columns (list): Colunas que recebem índices secundários (default: `INDEX_COLUMNS`).
+        enum_columns (list): Colunas candidatas a ENUM, por exemplo ['sex', 'race'] (default:
+            nenhuma).
+        text_columns (list): Colunas sempre criadas como TEXT (default: `TEXT_COLUMNS`).
+        compact_integer_columns (list): Colunas inteiras dimensionadas pelos valores observados
+            (default: as idades); as demais colunas inteiras viram BIGINT.
+        soft_delete_column (str, optional): Coluna DATETIME adicional usada na remoção lógica
+            de registros. Padrão é None.
+        min_varchar_length (int): Menor comprimento das colunas VARCHAR, que deixa folga para
+            valores maiores em cargas posteriores (default: `MIN_VARCHAR_LENGTH`).
+
+    Returns:
+        str: O comando CREATE TABLE.
+    """
+    definitions = []
+    column_types = {}
+
+    if primary_key is None or primary_key not in df.columns:
+        definitions.append("`id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT")
+        primary_key = "id"
+
+    for column in df.columns:
+        sql_type = infer_column_type(
+            df[column],
+            enum=column in enum_columns,
+            text=column in text_columns,
+            compact=column in compact_integer_columns,
+            min_varchar_length=min_varchar_length,
+        )
+        column_types[column] = sql_type
+        nullability = "NOT NULL" if column == primary_key else "NULL"
+        definitions.append(f"{_quote(column)} {sql_type} {nullability}")
+
+    if soft_delete_column is not None and soft_delete_column not in df.columns:
+        definitions.append(f"{_quote(soft_delete_column)} DATETIME NULL")
+
+    definitions.append(f"PRIMARY KEY ({_quote(primary_key)})")
+
+    for column in index_columns:
+        if column not in column_types or column == primary_key:
+            continue
+        if column_types[column] == "JSON":
+            continue
+        key_part = _quote(column)
+        if column_types[column].endswith("TEXT"):
+            key_part += f"({TEXT_INDEX_PREFIX})"
+        definitions.append(f"KEY {_quote(f'idx_{table}_{column}')} ({key_part})")
+
+    body = ",\n    ".join(definitions)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {_quote(table)} (\n    {body}\n)"
+        " ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+    )
+
+
+def generate_alter_table(
+    df,
+    table,
+    existing_columns,
+    primary_key=None,
+    index_columns=INDEX_COLUMNS,
+    text_columns=TEXT_COLUMNS,
+    compact_integer_columns=COMPACT_INTEGER_COLUMNS,
+    min_varchar_length=MIN_VARCHAR_LENGTH,
+):
+    """
+    Gera o ALTER TABLE que ajusta uma tabela existente às colunas e aos valores do DataFrame.
+
+    A tabela é criada a partir da primeira carga (ou do primeiro lote do modo `--pipeline`),
+    então uma carga posterior pode trazer colunas novas, como o `entity_id` de
+    `--resolve-entities`, ou textos maiores que a largura declarada. As colunas ausentes são
+    adicionadas como NULL, com os tipos de `generate_create_table`, e as colunas VARCHAR
+    estreitas recebem o VARCHAR calculado para os novos valores, até `MAX_VARCHAR_LENGTH`;
+    acima disso, as colunas sem índice viram TEXT.
+
+    Args:
+        df (pd.DataFrame): O DataFrame a ser carregado.
+        table (str): Nome da tabela.
+        existing_columns (dict): Tipo e comprimento máximo de cada coluna da tabela, no formato
+            {coluna: (tipo, comprimento)}, como retornado por `query_fuctions.read_table_columns`.
+        primary_key (str, optional): Coluna da chave primária, que continua NOT NULL. Padrão
+            é None.
+        index_columns (list): Colunas com índices secundários (default: `INDEX_COLUMNS`).
+        text_columns (list): Colunas adicionadas como TEXT (default: `TEXT_COLUMNS`).
+        compact_integer_columns (list): Colunas inteiras adicionadas com o menor tipo que
+            comporta os valores (default: as idades).
+        min_varchar_length (int): Menor comprimento das colunas VARCHAR adicionadas (default:
+            `MIN_VARCHAR_LENGTH`).
+
+    Returns:
+        str: O comando ALTER TABLE, ou None se nenhuma coluna precisar mudar.
+    """
+    if not existing_columns:
+        return None
+
+    changes = []
+    for column in df.columns:
+        indexed = column == primary_key or column in index_columns
+
+        if column not in existing_columns:
+            sql_type = infer_column_type(
+                df[column],
+                text=column in text_columns,
+                compact=column in compact_integer_columns,
+                min_varchar_length=min_varchar_length,
+            )
+            changes.append(f"ADD COLUMN {_quote(column)} {sql_type} NULL")
+            if indexed and sql_type != "JSON":
+                key_part = _quote(column)
+                if sql_type.endswith("TEXT"):
+                    key_part += f"({TEXT_INDEX_PREFIX})"
+                changes.append(f"ADD KEY {_quote(f'idx_{table}_{column}')} ({key_part})")
+            continue
+
+        data_type, length = existing_columns[column]
+        if data_type is None or data_type.lower() != "varchar":
+            continue
+        values = df[column].dropna().astype(str)
+        max_length = int(values.str.len().max()) if len(values) else 0
+        if max_length <= length:
+            continue
+
+        if max_length <= MAX_VARCHAR_LENGTH or indexed:
+            sql_type = f"VARCHAR({_varchar_length(max_length, minimum=length)})"
+        else:
+            sql_type = "TEXT" if max_length * 4 < 2**16 else "MEDIUMTEXT"
+        if sql_type == f"VARCHAR({length})":
+            continue
+        nullability = "NOT NULL" if column == primary_key else "NULL"
+        changes.append(f"MODIFY {_quote(column)} {sql_type} {nullability}")
+
+    if not changes:
+        return None
+    return f"ALTER TABLE {_quote(table)} " + ", ".join(changes)
@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from colorama import Fore, Style
+
+STAGES = ("fetched", "transformed", "loaded")
+
+
+class Checkpoint:
+    """Registro persistido das unidades de trabalho já concluídas em uma execução.
+
+    A unidade de trabalho é a página da API: cada página é marcada quando é recebida, quando
+    o lote que a contém é transformado e quando esse lote é confirmado no banco de dados.
+    Os números de página só identificam os mesmos registros dentro do mesmo plano de páginas,
+    então o checkpoint guarda o plano da execução (a origem, o total e o tamanho de página,
+    ou o arquivo reprocessado). Com `--resume`, o checkpoint existente só é usado quando o
+    plano informado em `bind_plan` é o mesmo; nesse caso, as páginas já carregadas são puladas
+    e apenas o restante é reprocessado. O arquivo é regravado de forma atômica a cada marcação,
+    e as marcações podem vir de threads diferentes do pipeline.
+
+    Args:
+        path (str): Caminho do arquivo JSON onde o checkpoint é persistido.
+        resume (bool): Se True, carrega o checkpoint existente; caso contrário, começa do zero.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.plan = None
+        self._lock = threading.Lock()
+        self._pages = {stage: set() for stage in STAGES}
+        self._stored = None
+
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self._stored = json.load(file)
+
+    def bind_plan(self, plan):
+        """
+        Associa o checkpoint ao plano de páginas da execução.
+
+        O checkpoint carregado com `resume=True` só é restaurado se tiver sido gravado com o
+        mesmo plano; caso contrário, ele é descartado e a execução começa do zero.
+
+        Args:
+            plan (dict): Identidade do plano, por exemplo {"source": url, "total": 1000,
+                "page_size": 50}. Os valores precisam ser serializáveis em JSON.
+
+        Returns:
+            set: As páginas já carregadas, que podem ser puladas.
+        """
+        with self._lock:
+            self.plan = plan
+            stored, self._stored = self._stored, None
+            if stored is not None and stored.get("plan") == plan:
+                for stage in STAGES:
+                    self._pages[stage] = set(stored.get(stage, []))
+                logging.info(
+                    Fore.YELLOW
+                    + f"Retomando a partir de {self.path}: {len(self._pages['loaded'])} páginas "
+                    + "já carregadas serão puladas."
+                    + Style.RESET_ALL
+                )
+            elif stored is not None:
+                logging.warning(
+                    Fore.YELLOW
+                    + f"O checkpoint {self.path} foi gravado com outro plano de páginas "
+                    + f"({stored.get('plan')}) e será descartado."
+                    + Style.RESET_ALL
+                )
+            return set(self._pages["loaded"])
+
+    def done(self, stage):
+        """Retorna o conjunto de páginas que já concluíram a etapa."""
+        with self._lock:
+            return set(self._pages[stage])
+
+    def mark(self, stage, pages):
+        """Marca as páginas como concluídas na etapa e grava o checkpoint."""
+        if stage not in STAGES:
+            raise ValueError(f"Etapa desconhecida: {stage}. Use uma de {STAGES}.")
+        with self._lock:
+            self._pages[stage].update(pages)
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {stage: sorted(pages) for stage, pages in self._pages.items()}
+        state["plan"] = self.plan
+        state["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove o checkpoint depois de uma execução concluída."""
+        with self._lock:
+            self._pages = {stage: set() for stage in STAGES}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def checkpoint_pages(pages, checkpoint):
+    """Marca cada página como recebida à medida que ela passa adiante.
+
+    Args:
+        pages (iterable): Páginas da API, como as geradas por `iter_wanted_pages`.
+        checkpoint (Checkpoint): Checkpoint da execução.
+
+    Yields:
+        dict: As mesmas páginas recebidas, na mesma ordem.
+    """
+    try:
+        for page_data in pages:
+            checkpoint.mark("fetched", [page_data.get("page")])
+            yield page_data
+    finally:
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
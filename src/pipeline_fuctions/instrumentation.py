@@ -0,0 +1,292 @@
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from colorama import Fore, Style
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+
+def peak_rss_bytes():
+    """Retorna o pico de memória residente (RSS) do processo até o momento, em bytes, ou None
+    onde o módulo `resource` não existe, como no Windows."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # O Linux informa ru_maxrss em KiB e o macOS em bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def count_rows(value):
+    """Conta as linhas de um valor: tamanho de listas e DataFrames ou o campo "rows" de um relatório."""
+    if isinstance(value, dict):
+        return value.get("rows")
+    if hasattr(value, "__len__") and not isinstance(value, (str, bytes)):
+        return len(value)
+    return None
+
+
+class HttpStats:
+    """Contadores de tráfego HTTP compartilhados pelas sessões de uma execução.
+
+    O método `record` é registrado como hook de resposta em `create_session`. Os retries
+    somam as novas tentativas feitas pelo urllib3 e pelo `RateLimitedAdapter`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_fetched = 0
+        self.retries = 0
+        self.status_codes = {}
+
+    def record(self, response, *args, **kwargs):
+        retries = getattr(getattr(response.raw, "retries", None), "history", ())
+        with self._lock:
+            self.requests += 1
+            self.bytes_fetched += len(response.content or b"")
+            self.retries += len(retries) + getattr(response, "throttle_retries", 0)
+            status = str(response.status_code)
+            self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        return response
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "bytes_fetched": self.bytes_fetched,
+                "retries": self.retries,
+                "status_codes": dict(self.status_codes),
+            }
+
+
+class RunReport:
+    """Coleta tempo, linhas e memória de cada etapa e grava um relatório JSON da execução.
+
+    As métricas de uma mesma etapa são acumuladas entre as chamadas, o que permite medir
+    etapas executadas lote a lote, inclusive a partir das threads do modo `--pipeline`.
+    Nesse modo os tempos das etapas se sobrepõem e a soma pode passar do tempo total.
+
+    O pico de RSS é do processo inteiro e só cresce, então cada etapa registra o pico do
+    processo ao final da última chamada (`process_peak_rss_bytes`) e quanto o pico cresceu
+    durante as suas chamadas (`peak_rss_growth_bytes`), que aponta as etapas que o elevaram.
+
+    Args:
+        arguments (dict, optional): Argumentos da execução, incluídos no relatório. Padrão é None.
+    """
+
+    def __init__(self, arguments=None):
+        self.arguments = arguments or {}
+        self.status = "failed"
+        self.http = HttpStats()
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def record(self, name, seconds, rows_in=None, rows_out=None, peak_rss_before=None):
+        """Acumula uma chamada da etapa `name`; `peak_rss_before` é o pico do processo no
+        início da chamada."""
+        peak_rss = peak_rss_bytes()
+        with self._lock:
+            stage = self._stages.setdefault(
+                name,
+                {
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "rows_in": None,
+                    "rows_out": None,
+                    "peak_rss_growth_bytes": None,
+                },
+            )
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+            for key, rows in (("rows_in", rows_in), ("rows_out", rows_out)):
+                if rows is not None:
+                    stage[key] = (stage[key] or 0) + rows
+            if peak_rss is not None and peak_rss_before is not None:
+                stage["peak_rss_growth_bytes"] = (
+                    (stage["peak_rss_growth_bytes"] or 0) + peak_rss - peak_rss_before
+                )
+            stage["process_peak_rss_bytes"] = peak_rss
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Mede o bloco como uma chamada da etapa; o número de linhas de saída pode ser
+        informado atribuindo `metrics["rows_out"]` ao dicionário retornado."""
+        metrics = {"rows_out": None}
+        peak_rss_before = peak_rss_bytes()
+        started_at = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            self.record(
+                name,
+                time.perf_counter() - started_at,
+                rows_in=rows_in,
+                rows_out=metrics["rows_out"],
+                peak_rss_before=peak_rss_before,
+            )
+
+    def instrument(self, name, function, rows_in=count_rows, rows_out=count_rows):
+        """Envolve uma função para que cada chamada seja medida como a etapa `name`.
+
+        Args:
+            name (str): Nome da etapa no relatório, por exemplo "transform.build_dataframe".
+            function (callable): A função de extração, transformação ou carga.
+            rows_in (callable): Conta as linhas de entrada a partir do primeiro argumento.
+            rows_out (callable): Conta as linhas de saída a partir do retorno.
+
+        Returns:
+            callable: A função instrumentada.
+        """
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            first = args[0] if args else next(iter(kwargs.values()), None)
+            with self.stage(name, rows_in=rows_in(first)) as metrics:
+                result = function(*args, **kwargs)
+                metrics["rows_out"] = rows_out(result)
+            return result
+
+        return wrapper
+
+    def instrument_iter(self, name, iterable, rows=count_rows):
+        """Mede o tempo gasto esperando cada item de um iterável, como as páginas da API.
+
+        Yields:
+            Os mesmos itens do iterável, na mesma ordem.
+        """
+        iterator = iter(iterable)
+        try:
+            while True:
+                peak_rss_before = peak_rss_bytes()
+                started_at = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                self.record(
+                    name,
+                    time.perf_counter() - started_at,
+                    rows_out=rows(item),
+                    peak_rss_before=peak_rss_before,
+                )
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def to_dict(self):
+        """Monta o relatório com as etapas, o tráfego HTTP e o pico de memória."""
+        wall_seconds = time.perf_counter() - self._start
+        with self._lock:
+            stages = {name: dict(values) for name, values in self._stages.items()}
+        for values in stages.values():
+            rows = values["rows_out"] if values["rows_out"] is not None else values["rows_in"]
+            values["seconds"] = round(values["seconds"], 6)
+            values["rows_per_second"] = (
+                round(rows / values["seconds"], 2) if rows and values["seconds"] else None
+            )
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "status": self.status,
+            "wall_seconds": round(wall_seconds, 6),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "arguments": self.arguments,
+            "stages": stages,
+            "http": self.http.to_dict(),
+        }
+
+    def write(self, path):
+        """Grava o relatório em JSON e retorna o dicionário gravado."""
+        report = self.to_dict()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, default=str)
+
+        peak_rss = report["peak_rss_bytes"]
+        logging.info(
+            Fore.GREEN
+            + f"Relatório da execução gravado em {path} ({report['wall_seconds']:.2f}s, "
+            + (
+                f"pico de RSS {peak_rss / 2**20:.1f} MiB)."
+                if peak_rss is not None
+                else "pico de RSS indisponível)."
+            )
+            + Style.RESET_ALL
+        )
+        return report
+
+
+@contextmanager
+def profiling(mode, output_path, top=20):
+    """Ativa o cProfile ou o tracemalloc durante o bloco e grava o resultado em disco.
+
+    O cProfile mede apenas a thread principal; no modo `--pipeline`, as etapas rodam em
+    outras threads e ficam de fora do perfil. O tracemalloc rastreia todas as threads.
+
+    Args:
+        mode (str): "cprofile", "tracemalloc" ou None para não medir nada.
+        output_path (str): Arquivo de saída (.pstats para o cProfile, .txt para o tracemalloc).
+        top (int): Número de linhas resumidas no log (default: 20).
+    """
+    if mode is None:
+        yield
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Modo de profiling desconhecido: {mode}. Use um de {PROFILE_MODES}.")
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output_path)
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(top)
+            logging.info(
+                Fore.BLUE + f"Perfil gravado em {output_path}:\n{summary.getvalue()}" + Style.RESET_ALL
+            )
+        return
+
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        statistics = snapshot.statistics("lineno")
+        with open(output_path, "w", encoding="utf-8") as file:
+            file.write(f"Pico de memória rastreada: {traced_peak} bytes\n")
+            for statistic in statistics:
+                file.write(f"{statistic}\n")
+        summary = "\n".join(str(statistic) for statistic in statistics[:top])
+        logging.info(
+            Fore.BLUE
+            + f"Pico de memória rastreada: {traced_peak / 2**20:.1f} MiB. Alocações em "
+            + f"{output_path}:\n{summary}"
+            + Style.RESET_ALL
+        )
@@ -0,0 +1,149 @@
+import logging
+import queue
+import threading
+import time
+from colorama import Fore, Style
+
+_END = object()
+_POLL_SECONDS = 0.1
+
+
+class PipelineError(RuntimeError):
+    """Erro levantado quando alguma etapa do pipeline falha."""
+
+    def __init__(self, stage, error):
+        super().__init__(f"Falha na etapa '{stage}': {error!r}")
+        self.stage = stage
+        self.error = error
+
+
+def _put(output, item, stop):
+    """Coloca um item na fila de saída, desistindo se o pipeline for interrompido."""
+    while not stop.is_set():
+        try:
+            output.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(source, stop):
+    """Retira um item da fila de entrada, desistindo se o pipeline for interrompido."""
+    while not stop.is_set():
+        try:
+            return source.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _END
+
+
+def run_pipeline(source, stages, queue_size=4):
+    """
+    Executa etapas encadeadas em threads separadas, ligadas por filas limitadas.
+
+    O iterável `source` é consumido em uma thread própria e cada item passa por todas as
+    etapas em ordem, de forma que a extração, a transformação e a carga se sobrepõem e o
+    tempo total se aproxima do tempo da etapa mais lenta. As filas limitadas a `queue_size`
+    itens aplicam backpressure: uma etapa rápida espera quando a seguinte está atrasada.
+    Se alguma etapa falhar, todas as threads são encerradas e o erro é relançado.
+
+    Args:
+        source (iterable): Itens de entrada, como os lotes gerados por `iter_batches`.
+        stages (list): Lista de tuplas (nome, função); cada função recebe o item da etapa
+            anterior e retorna o item da próxima. Um retorno None descarta o item.
+        queue_size (int): Número máximo de itens em espera entre duas etapas (default: 4).
+
+    Returns:
+        tuple: A lista com as saídas da última etapa e um dicionário com as estatísticas de
+               cada etapa (itens processados e segundos ocupados).
+
+    Raises:
+        PipelineError: Caso a leitura da fonte ou alguma etapa falhe.
+    """
+    stop = threading.Event()
+    errors = []
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    names = ["source"] + [name for name, _ in stages]
+    stats = {name: {"items": 0, "busy_seconds": 0.0} for name in names}
+    results = []
+
+    def fail(stage, error):
+        if not errors:
+            errors.append(PipelineError(stage, error))
+        stop.set()
+
+    def produce():
+        iterator = iter(source)
+        try:
+            while not stop.is_set():
+                started_at = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats["source"]["busy_seconds"] += time.perf_counter() - started_at
+                stats["source"]["items"] += 1
+                if not _put(queues[0], item, stop):
+                    break
+        except Exception as error:
+            fail("source", error)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            _put(queues[0], _END, stop)
+
+    def work(index, name, function):
+        try:
+            while True:
+                item = _get(queues[index], stop)
+                if item is _END:
+                    break
+                started_at = time.perf_counter()
+                output = function(item)
+                stats[name]["busy_seconds"] += time.perf_counter() - started_at
+                stats[name]["items"] += 1
+                if output is not None and not _put(queues[index + 1], output, stop):
+                    break
+        except Exception as error:
+            fail(name, error)
+        finally:
+            _put(queues[index + 1], _END, stop)
+
+    def collect():
+        while True:
+            item = _get(queues[-1], stop)
+            if item is _END:
+                break
+            results.append(item)
+
+    threads = [threading.Thread(target=produce, name="pipeline-source", daemon=True)]
+    threads += [
+        threading.Thread(
+            target=work, args=(index, name, function), name=f"pipeline-{name}", daemon=True
+        )
+        for index, (name, function) in enumerate(stages)
+    ]
+
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    collect()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        logging.error(Fore.RED + f"Pipeline interrompido: {errors[0]}" + Style.RESET_ALL)
+        raise errors[0] from errors[0].error
+
+    elapsed = time.perf_counter() - started_at
+    summary = ", ".join(
+        f"{name} {values['busy_seconds']:.2f}s" for name, values in stats.items()
+    )
+    logging.info(
+        Fore.GREEN
+        + f"Pipeline concluído em {elapsed:.2f}s (tempo ocupado por etapa: {summary})."
+        + Style.RESET_ALL
+    )
+    return results, stats
@@ -0,0 +1,497 @@
+import bisect
+import html
+import io
+import logging
+import os
+import re
+import unicodedata
+from array import array
+from collections import Counter
+import numpy as np
+import pandas as pd
+from colorama import Fore, Style
+from src.transform_fuctions.transform_data import TAG_PATTERN
+
+SEARCH_COLUMNS = ["details", "aliases", "scars_and_marks"]
+TOKEN_PATTERN = re.compile(r"\w+")
+PREFIX_WILDCARD = "*"
+OR_OPERATOR = "OR"
+AND_OPERATOR = "AND"
+# Número máximo de termos da consulta com scores em cache; o cache é esvaziado ao atingi-lo.
+SCORE_CACHE_SIZE = 1024
+
+
+def _fold(text):
+    """Converte o texto para minúsculas e remove os acentos."""
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return "".join(
+        char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char)
+    )
+
+
+def tokenize(text):
+    """
+    Divide um texto em termos normalizados.
+
+    Remove a marcação HTML, decodifica as entidades, converte para minúsculas e remove os
+    acentos, de forma que "Bogotá" e "<p>BOGOTA</p>" geram o mesmo termo.
+
+    Args:
+        text (str): O texto a ser dividido.
+
+    Returns:
+        list: Os termos do texto, na ordem em que aparecem.
+    """
+    if "<" in text:
+        text = TAG_PATTERN.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return TOKEN_PATTERN.findall(_fold(text))
+
+
+def _document_text(values):
+    """Une os valores das colunas indexadas de um registro, ignorando os ausentes."""
+    parts = []
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value)
+        elif isinstance(value, str):
+            parts.append(value)
+    return " ".join(parts)
+
+
+class InvertedIndex:
+    """Índice invertido em memória com ranqueamento BM25.
+
+    Cada documento recebe um número interno sequencial. As listas de postings guardam, por
+    termo, os números dos documentos em ordem crescente e a frequência do termo em cada um,
+    em `array` compactos que crescem a cada inserção. Na consulta, os scores BM25 de cada termo
+    são calculados com o numpy e mantidos em cache até a próxima alteração do índice; as
+    interseções e as uniões também são vetorizadas.
+
+    Atualizar um documento marca o número antigo como removido e indexa o novo texto no
+    final; os documentos removidos são descartados por `compact` e antes de `save`. O índice
+    não é thread-safe: consultas e atualizações devem vir da mesma thread.
+
+    Args:
+        columns (list): Colunas de texto indexadas (default: `SEARCH_COLUMNS`).
+        k1 (float): Saturação da frequência do termo no BM25 (default: 1.2).
+        b (float): Peso da normalização pelo tamanho do documento no BM25 (default: 0.75).
+    """
+
+    def __init__(self, columns=SEARCH_COLUMNS, k1=1.2, b=0.75):
+        self.columns = list(columns)
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._uids = []
+        self._hashes = []
+        self._lengths = array("I")
+        self._alive = bytearray()
+        self._doc_by_uid = {}
+        self._total_length = 0
+        self._deleted = 0
+        self._views = {}
+        self._sorted_terms = None
+
+    def __len__(self):
+        return len(self._doc_by_uid)
+
+    def __contains__(self, uid):
+        return uid in self._doc_by_uid
+
+    def _invalidate(self):
+        # O idf e o tamanho médio dependem de todos os documentos, então qualquer
+        # alteração descarta os scores já calculados.
+        if self._views:
+            self._views = {}
+
+    def add_document(self, uid, text, content_hash=None):
+        """
+        Indexa um documento, substituindo a versão anterior com o mesmo uid.
+
+        Args:
+            uid (str): Identificador do registro.
+            text (str): Texto a ser indexado.
+            content_hash (str, optional): Hash do conteúdo, usado por `update_from_dataframe`
+                para pular registros inalterados. Padrão é None.
+        """
+        if uid in self._doc_by_uid:
+            self.remove_document(uid)
+
+        terms = Counter(tokenize(text))
+        doc = len(self._uids)
+        self._invalidate()
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"))
+                self._sorted_terms = None
+            postings[0].append(doc)
+            postings[1].append(frequency)
+
+        length = sum(terms.values())
+        self._uids.append(uid)
+        self._hashes.append(content_hash)
+        self._lengths.append(length)
+        self._alive.append(1)
+        self._doc_by_uid[uid] = doc
+        self._total_length += length
+
+    def remove_document(self, uid):
+        """
+        Remove um documento do índice.
+
+        Returns:
+            bool: True se o documento existia.
+        """
+        doc = self._doc_by_uid.pop(uid, None)
+        if doc is None:
+            return False
+        self._alive[doc] = 0
+        self._total_length -= self._lengths[doc]
+        self._deleted += 1
+        self._invalidate()
+        return True
+
+    def update_from_dataframe(self, df, key="uid", hash_column="content_hash", remove_missing=False):
+        """
+        Atualiza o índice com os registros de um DataFrame.
+
+        Registros novos são indexados e registros já indexados são reindexados apenas quando o
+        `content_hash` mudou (ou quando o DataFrame não tem essa coluna).
+
+        Args:
+            df (pd.DataFrame): O DataFrame transformado, com as colunas de `columns`.
+            key (str): Coluna com o identificador do registro (default: "uid").
+            hash_column (str): Coluna com o hash do conteúdo (default: "content_hash").
+            remove_missing (bool): Se True, trata o DataFrame como a extração completa e remove
+                do índice os registros que não estão nele (default: False).
+
+        Returns:
+            dict: Quantidade de registros adicionados, atualizados, inalterados e removidos.
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        hashes = df[hash_column] if hash_column in df.columns else [None] * len(df)
+        rows = zip(df[key], hashes, *(df[column] for column in self.columns))
+
+        for uid, content_hash, *values in rows:
+            doc = self._doc_by_uid.get(uid)
+            if doc is None:
+                counts["added"] += 1
+            elif content_hash is not None and self._hashes[doc] == content_hash:
+                counts["unchanged"] += 1
+                continue
+            else:
+                counts["updated"] += 1
+            self.add_document(uid, _document_text(values), content_hash)
+
+        if remove_missing:
+            missing = set(self._doc_by_uid) - set(df[key])
+            for uid in missing:
+                self.remove_document(uid)
+            counts["removed"] = len(missing)
+
+        logging.info(
+            Fore.GREEN
+            + f"Índice atualizado: {counts['added']} adicionados, {counts['updated']} "
+            + f"atualizados, {counts['unchanged']} inalterados, {counts['removed']} removidos."
+            + Style.RESET_ALL
+        )
+        return counts
+
+    def _document_arrays(self):
+        """Retorna os tamanhos e a máscara de documentos ativos como arrays do numpy."""
+        arrays = self._views.get(None)
+        if arrays is None:
+            lengths = np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float32)
+            alive = np.frombuffer(bytes(self._alive), dtype=np.bool_)
+            arrays = self._views[None] = (lengths, alive)
+        return arrays
+
+    def _token_scores(self, token):
+        """
+        Calcula o BM25 de um termo da consulta para cada documento que o contém.
+
+        Um prefixo é expandido para todos os termos do vocabulário que começam com ele, e as
+        listas de postings desses termos são pontuadas de uma só vez; o score de um documento
+        é a soma dos scores dos termos expandidos.
+
+        Returns:
+            tuple: Arrays com os números dos documentos, em ordem crescente, e os scores; ou
+                None se nenhum termo do vocabulário corresponder.
+        """
+        if token in self._views:
+            return self._views[token]
+
+        terms = self._expand(token)
+        if not terms:
+            return None
+
+        postings = [self._postings[term] for term in terms]
+        counts = np.fromiter((len(docs) for docs, _ in postings), dtype=np.int64, count=len(terms))
+        docs = np.frombuffer(b"".join(docs for docs, _ in postings), dtype=np.uint32)
+        frequencies = np.frombuffer(
+            b"".join(frequencies for _, frequencies in postings), dtype=np.uint32
+        ).astype(np.float32)
+        term_numbers = np.repeat(np.arange(len(terms)), counts)
+
+        lengths, alive = self._document_arrays()
+        if self._deleted:
+            keep = alive[docs]
+            docs, frequencies, term_numbers = docs[keep], frequencies[keep], term_numbers[keep]
+            counts = np.bincount(term_numbers, minlength=len(terms))
+
+        total = len(self._doc_by_uid)
+        average_length = self._total_length / total if total else 1.0
+        idf = np.log1p((total - counts + 0.5) / (counts + 0.5)).astype(np.float32)
+        norm = self.k1 * (1 - self.b + self.b * lengths[docs] / (average_length or 1.0))
+        scores = idf[term_numbers] * frequencies * (self.k1 + 1) / (frequencies + norm)
+
+        result = (docs, scores) if len(terms) == 1 else _merge([(docs, scores)])
+        if len(self._views) >= SCORE_CACHE_SIZE:
+            self._invalidate()
+        self._views[token] = result
+        return result
+
+    def _expand(self, token):
+        """Retorna os termos do vocabulário correspondentes a um termo ou prefixo da consulta."""
+        if not token.endswith(PREFIX_WILDCARD):
+            return [token] if token in self._postings else []
+
+        prefix = token[: -len(PREFIX_WILDCARD)]
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        start = bisect.bisect_left(terms, prefix)
+        end = start
+        while end < len(terms) and terms[end].startswith(prefix):
+            end += 1
+        return terms[start:end]
+
+    def _clause_scores(self, tokens):
+        """Combina os termos de uma cláusula com AND, somando os scores."""
+        groups = []
+        for token in tokens:
+            group = self._token_scores(token)
+            if group is None:
+                return None
+            groups.append(group)
+
+        groups.sort(key=lambda group: len(group[0]))
+        docs, scores = groups[0]
+        for other_docs, other_scores in groups[1:]:
+            docs, left, right = np.intersect1d(
+                docs, other_docs, assume_unique=True, return_indices=True
+            )
+            scores = scores[left] + other_scores[right]
+            if not len(docs):
+                return None
+        return docs, scores
+
+    def search(self, query, limit=10):
+        """
+        Busca os documentos que atendem à consulta, ordenados pelo BM25.
+
+        Os termos separados por espaço são combinados com AND; `OR` separa cláusulas
+        alternativas, e o AND tem precedência (`dragon tattoo OR scar` equivale a
+        `(dragon AND tattoo) OR scar`). Um termo terminado em `*` busca pelo prefixo, por
+        exemplo `bogo*`. Os termos passam pela mesma normalização de `tokenize`.
+
+        Args:
+            query (str): A consulta.
+            limit (int, optional): Número máximo de resultados. Padrão é 10; None retorna todos.
+
+        Returns:
+            list: Tuplas (uid, score) em ordem decrescente de score.
+        """
+        clauses = [[]]
+        for token in query.split():
+            if token == OR_OPERATOR:
+                clauses.append([])
+            elif token != AND_OPERATOR:
+                terms = tokenize(token)
+                if terms and token.endswith(PREFIX_WILDCARD):
+                    terms[-1] += PREFIX_WILDCARD
+                clauses[-1].extend(terms)
+
+        matches = [
+            result
+            for result in (self._clause_scores(tokens) for tokens in clauses if tokens)
+            if result is not None
+        ]
+        if not matches:
+            return []
+        docs, scores = matches[0] if len(matches) == 1 else _merge(matches)
+
+        if limit is not None and limit < len(docs):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            docs, scores = docs[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [(self._uids[doc], float(scores[i])) for i, doc in zip(order, docs[order])]
+
+    def compact(self):
+        """Reconstrói as listas de postings sem os documentos removidos."""
+        if not self._deleted:
+            return
+        alive = np.frombuffer(bytes(self._alive), dtype=np.bool_)
+        new_numbers = np.cumsum(alive, dtype=np.int64) - 1
+
+        postings = {}
+        for term, (docs, frequencies) in self._postings.items():
+            docs = np.frombuffer(docs, dtype=np.uint32)
+            keep = alive[docs]
+            if keep.any():
+                postings[term] = (
+                    array("I", new_numbers[docs[keep]].astype(np.uint32).tobytes()),
+                    array("I", np.frombuffer(frequencies, dtype=np.uint32)[keep].tobytes()),
+                )
+
+        kept = np.flatnonzero(alive)
+        self._postings = postings
+        self._uids = [self._uids[doc] for doc in kept]
+        self._hashes = [self._hashes[doc] for doc in kept]
+        self._lengths = array("I", np.frombuffer(self._lengths, dtype=np.uint32)[kept].tobytes())
+        self._alive = bytearray(b"\x01" * len(kept))
+        self._doc_by_uid = {uid: doc for doc, uid in enumerate(self._uids)}
+        self._deleted = 0
+        self._views = {}
+        self._sorted_terms = None
+
+    def save(self, path):
+        """
+        Grava o índice em um arquivo .npz, de forma atômica.
+
+        Args:
+            path (str): Caminho do arquivo.
+        """
+        self.compact()
+        terms = sorted(self._postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(self._postings[term][0]) for term in terms])
+
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            columns=np.array(self.columns),
+            parameters=np.array([self.k1, self.b]),
+            terms=_encode_strings(terms),
+            offsets=offsets,
+            docs=np.frombuffer(
+                b"".join(self._postings[term][0].tobytes() for term in terms), dtype=np.uint32
+            ),
+            frequencies=np.frombuffer(
+                b"".join(self._postings[term][1].tobytes() for term in terms), dtype=np.uint32
+            ),
+            uids=_encode_strings(self._uids),
+            hashes=_encode_strings("" if value is None else value for value in self._hashes),
+            lengths=np.frombuffer(self._lengths, dtype=np.uint32),
+        )
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(buffer.getbuffer())
+        os.replace(tmp_path, path)
+
+        logging.info(
+            Fore.GREEN
+            + f"Índice com {len(self)} documentos e {len(terms)} termos salvo em {path}."
+            + Style.RESET_ALL
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carrega um índice gravado por `save`.
+
+        Args:
+            path (str): Caminho do arquivo .npz.
+
+        Returns:
+            InvertedIndex: O índice carregado.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            k1, b = data["parameters"].tolist()
+            index = cls(columns=data["columns"].tolist(), k1=k1, b=b)
+            offsets = data["offsets"]
+            docs = data["docs"]
+            frequencies = data["frequencies"]
+            for i, term in enumerate(_decode_strings(data["terms"], len(offsets) - 1)):
+                start, end = offsets[i], offsets[i + 1]
+                index._postings[term] = (
+                    array("I", docs[start:end].tobytes()),
+                    array("I", frequencies[start:end].tobytes()),
+                )
+            index._lengths = array("I", data["lengths"].tobytes())
+            count = len(index._lengths)
+            index._uids = _decode_strings(data["uids"], count)
+            index._hashes = [value or None for value in _decode_strings(data["hashes"], count)]
+
+        index._alive = bytearray(b"\x01" * len(index._uids))
+        index._doc_by_uid = {uid: doc for doc, uid in enumerate(index._uids)}
+        index._total_length = sum(index._lengths)
+        return index
+
+
+def _encode_strings(values):
+    """Une strings sem quebras de linha em um único array de bytes UTF-8.
+
+    Arrays de strings do numpy têm largura fixa de 4 bytes por caractere, o que deixaria o
+    arquivo maior e a compressão mais lenta.
+    """
+    return np.frombuffer("\n".join(values).encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_strings(data, count):
+    """Desfaz `_encode_strings`, que não distingue uma lista vazia de uma string vazia."""
+    return data.tobytes().decode("utf-8").split("\n") if count else []
+
+
+def _merge(results):
+    """Une listas (docs, scores), somando os scores dos documentos repetidos."""
+    docs = np.concatenate([result[0] for result in results])
+    scores = np.concatenate([result[1] for result in results])
+    docs, inverse = np.unique(docs, return_inverse=True)
+    return docs, np.bincount(inverse, weights=scores).astype(np.float32)
+
+
+def build_index(df, columns=SEARCH_COLUMNS, key="uid", hash_column="content_hash"):
+    """
+    Cria um índice invertido a partir do DataFrame transformado.
+
+    Args:
+        df (pd.DataFrame): O DataFrame com a coluna `key` e as colunas de texto.
+        columns (list): Colunas de texto indexadas (default: `SEARCH_COLUMNS`).
+        key (str): Coluna com o identificador do registro (default: "uid").
+        hash_column (str): Coluna com o hash do conteúdo, se existir (default: "content_hash").
+
+    Returns:
+        InvertedIndex: O índice com todos os registros do DataFrame.
+    """
+    index = InvertedIndex(columns=columns)
+    index.update_from_dataframe(df, key=key, hash_column=hash_column)
+    return index
+
+
+def search_dataframe(df, index, query, limit=10, key="uid"):
+    """
+    Busca os registros do DataFrame que atendem à consulta.
+
+    Args:
+        df (pd.DataFrame): O DataFrame indexado.
+        index (InvertedIndex): O índice do DataFrame.
+        query (str): A consulta, no formato aceito por `InvertedIndex.search`.
+        limit (int, optional): Número máximo de resultados (default: 10).
+        key (str): Coluna com o identificador do registro (default: "uid").
+
+    Returns:
+        pd.DataFrame: Os registros encontrados, em ordem de relevância, com a coluna `score`.
+    """
+    results = index.search(query, limit=limit)
+    scores = pd.DataFrame(results, columns=[key, "score"])
+    return scores.merge(df, on=key, how="left")[[*df.columns, "score"]]
@@ -0,0 +1,378 @@
+import logging
+import numpy as np
+import pandas as pd
+from colorama import Fore, Style
+from src.search_fuctions.inverted_index import tokenize
+
+ENTITY_COLUMN = "entity_id"
+ALIAS_SEPARATOR = ", "
+MIN_TOKEN_LENGTH = 2
+# Blocos maiores que este limite (nomes muito comuns) são ignorados; os registros continuam
+# sendo comparados pelos demais termos do nome, e o número de pares cresce de forma linear.
+MAX_BLOCK_SIZE = 100
+AGE_TOLERANCE = 5
+DEFAULT_THRESHOLD = 0.75
+KEY_SEPARATOR = "\x1f"
+
+
+def normalize_name(text):
+    """
+    Normaliza um nome para comparação.
+
+    Remove marcação, acentos e pontuação, converte para minúsculas e ordena os termos, de
+    forma que "DOE, John" e "John Doe" geram o mesmo texto.
+
+    Args:
+        text (str): O nome ou alias.
+
+    Returns:
+        str: Os termos normalizados, em ordem alfabética, separados por espaço.
+    """
+    return " ".join(sorted(tokenize(text)))
+
+
+def _aliases_as_list(value):
+    """Converte o valor da coluna `aliases`, em string ou lista, em uma lista de nomes."""
+    if isinstance(value, str):
+        return value.split(ALIAS_SEPARATOR)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return list(value)
+    return []
+
+
+def name_mentions(df, name_column="name", alias_column="aliases"):
+    """
+    Lista as variantes de nome de cada registro: o nome principal e os aliases.
+
+    Args:
+        df (pd.DataFrame): O DataFrame transformado.
+        name_column (str): Coluna com o nome principal (default: "name").
+        alias_column (str): Coluna com os aliases, em string ou lista (default: "aliases").
+
+    Returns:
+        pd.DataFrame: Uma linha por variante distinta, com a posição do registro (`record`), o
+            nome normalizado (`text`) e se a variante é um alias (`is_alias`).
+    """
+    records, texts, is_alias = [], [], []
+    rows = zip(df[name_column].tolist(), df[alias_column].tolist())
+    for position, (name, aliases) in enumerate(rows):
+        seen = set()
+        variants = [(name, False)] + [(alias, True) for alias in _aliases_as_list(aliases)]
+        for text, alias in variants:
+            if not isinstance(text, str):
+                continue
+            normalized = normalize_name(text)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                records.append(position)
+                texts.append(normalized)
+                is_alias.append(alias)
+
+    return pd.DataFrame({"record": records, "text": texts, "is_alias": is_alias})
+
+
+def _normalized_places(series):
+    """Normaliza o local de nascimento, normalizando cada valor distinto uma única vez."""
+    codes, uniques = pd.factorize(series.astype(object))
+    normalized = np.array(
+        [" ".join(tokenize(value)) if isinstance(value, str) else "" for value in uniques] + [""],
+        dtype=object,
+    )
+    return normalized[codes]
+
+
+def _age_ranges(df):
+    """Retorna os limites inferior e superior de idade, usando um pelo outro quando faltar."""
+    low = pd.to_numeric(df["age_min"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    high = pd.to_numeric(df["age_max"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isnan(low), high, low), np.where(np.isnan(high), low, high)
+
+
+def candidate_pairs(mentions, places, max_block_size=MAX_BLOCK_SIZE):
+    """
+    Gera os pares de variantes de nome que dividem algum bloco.
+
+    A chave de bloco é um termo do nome normalizado combinado com o local de nascimento
+    normalizado (vazio quando ausente). Só variantes de registros diferentes formam pares,
+    e blocos com mais de `max_block_size` registros são ignorados.
+
+    Args:
+        mentions (pd.DataFrame): Variantes geradas por `name_mentions`.
+        places (np.ndarray): Local de nascimento normalizado de cada registro.
+        max_block_size (int): Número máximo de registros por bloco (default: `MAX_BLOCK_SIZE`).
+
+    Returns:
+        tuple: Arrays com as variantes da esquerda e da direita de cada par, sem repetições,
+            e o número de blocos comparados.
+    """
+    tokens = mentions["text"].str.split(" ").explode()
+    tokens = tokens[tokens.str.len() >= MIN_TOKEN_LENGTH]
+    mention_ids = tokens.index.to_numpy()
+    records = mentions["record"].to_numpy()[mention_ids]
+    keys, uniques = pd.factorize(tokens.to_numpy() + KEY_SEPARATOR + places[records])
+
+    blocks = pd.DataFrame({"key": keys, "mention": mention_ids, "record": records})
+    block_records = blocks.drop_duplicates(["key", "record"])
+    sizes = np.bincount(block_records["key"].to_numpy(), minlength=len(uniques))
+    selected = (sizes >= 2) & (sizes <= max_block_size)
+    blocks = blocks[selected[blocks["key"].to_numpy()]].drop_duplicates(["key", "mention"])
+
+    pairs = blocks.merge(blocks, on="key", suffixes=("_left", "_right"))
+    pairs = pairs[pairs["record_left"].to_numpy() < pairs["record_right"].to_numpy()]
+    pairs = pairs.drop_duplicates(["mention_left", "mention_right"])
+    return (
+        pairs["mention_left"].to_numpy(),
+        pairs["mention_right"].to_numpy(),
+        int(selected.sum()),
+    )
+
+
+def trigram_sets(texts):
+    """
+    Calcula os conjuntos de trigramas de caracteres de cada texto, de forma vetorizada.
+
+    Os textos recebem um espaço antes e depois, para que o início e o fim das palavras
+    também formem trigramas. Cada trigrama vira um inteiro a partir dos três code points,
+    e os inteiros são renumerados de 0 a T - 1.
+
+    Args:
+        texts (list): Os textos, não vazios.
+
+    Returns:
+        tuple: `indptr` e `ids` no formato CSR (os trigramas do texto i são
+            `ids[indptr[i]:indptr[i + 1]]`, sem repetições) e o número de trigramas distintos T.
+    """
+    padded = [f" {text} " for text in texts]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+    counts = lengths - 2
+    text_numbers = np.repeat(np.arange(len(texts)), counts)
+    offset_in_text = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(np.cumsum(lengths) - lengths, counts) + offset_in_text
+    trigrams = (codes[positions] << 42) | (codes[positions + 1] << 21) | codes[positions + 2]
+
+    _, ids = np.unique(trigrams, return_inverse=True)
+    total = int(ids.max()) + 1 if len(ids) else 0
+    unique = np.unique(text_numbers * total + ids)
+    text_numbers, ids = unique // max(total, 1), unique % max(total, 1)
+    indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(text_numbers, minlength=len(texts)))
+    return indptr, ids, total
+
+
+def _gather(indptr, ids, total, mentions):
+    """Concatena os trigramas das variantes pedidas, identificando cada um pelo par."""
+    counts = indptr[mentions + 1] - indptr[mentions]
+    starts = np.repeat(indptr[mentions] - np.cumsum(counts) + counts, counts)
+    pair_numbers = np.repeat(np.arange(len(mentions), dtype=np.int64), counts)
+    return pair_numbers * total + ids[starts + np.arange(counts.sum())]
+
+
+def trigram_similarity(indptr, ids, total, left, right):
+    """
+    Calcula o coeficiente de Dice entre os trigramas de cada par de textos.
+
+    A interseção de todos os pares é calculada de uma só vez: cada trigrama é identificado
+    pelo par ao qual pertence, e os identificadores que aparecem dos dois lados são contados.
+
+    Args:
+        indptr, ids, total: Saída de `trigram_sets`.
+        left (np.ndarray): Índices dos textos da esquerda de cada par.
+        right (np.ndarray): Índices dos textos da direita de cada par.
+
+    Returns:
+        np.ndarray: A similaridade de cada par, entre 0 e 1.
+    """
+    if not len(left):
+        return np.zeros(0)
+    left_keys = _gather(indptr, ids, total, left)
+    right_keys = _gather(indptr, ids, total, right)
+    shared = left_keys[np.isin(left_keys, right_keys, assume_unique=True)]
+    intersection = np.bincount(shared // total, minlength=len(left))
+    sizes = np.diff(indptr)
+    return 2 * intersection / (sizes[left] + sizes[right])
+
+
+def find_duplicates(
+    df,
+    key="uid",
+    threshold=DEFAULT_THRESHOLD,
+    max_block_size=MAX_BLOCK_SIZE,
+    age_tolerance=AGE_TOLERANCE,
+):
+    """
+    Encontra pares de registros que provavelmente representam a mesma pessoa.
+
+    Os candidatos vêm de `candidate_pairs` (termos do nome e dos aliases e local de
+    nascimento) e são descartados quando as faixas de idade não se sobrepõem, com uma
+    tolerância de `age_tolerance` anos; idades ausentes não descartam o par. O score de um
+    par de registros é a maior similaridade de trigramas entre suas variantes de nome, de
+    forma que o alias de um registro pode casar com o nome de outro.
+
+    Args:
+        df (pd.DataFrame): O DataFrame transformado.
+        key (str): Coluna com o identificador do registro (default: "uid").
+        threshold (float): Score mínimo para considerar um par duplicado (default: 0.75).
+        max_block_size (int): Número máximo de registros por bloco (default: `MAX_BLOCK_SIZE`).
+        age_tolerance (int): Diferença de idade tolerada, em anos (default: 5).
+
+    Returns:
+        pd.DataFrame: Os pares duplicados, com as colunas `<key>_left`, `<key>_right`, `score`
+            e `alias_match` (se o melhor casamento envolveu um alias), em ordem decrescente de
+            score. As contagens de cada etapa ficam em `attrs["entity_resolution"]`.
+    """
+    mentions = name_mentions(df)
+    stats = {"records": len(df), "mentions": len(mentions)}
+    # Um delta incremental sem alterações não tem nenhuma variante de nome para comparar.
+    if mentions.empty:
+        pairs = pd.DataFrame(
+            {f"{key}_left": [], f"{key}_right": [], "score": [], "alias_match": []}
+        )
+        pairs.attrs["entity_resolution"] = {
+            **stats,
+            "blocks": 0,
+            "candidate_pairs": 0,
+            "compared_pairs": 0,
+            "matched_pairs": 0,
+        }
+        return pairs
+
+    places = _normalized_places(df["place_of_birth"])
+    left, right, blocks = candidate_pairs(mentions, places, max_block_size=max_block_size)
+    stats["blocks"] = blocks
+    stats["candidate_pairs"] = len(left)
+
+    records = mentions["record"].to_numpy()
+    left_records, right_records = records[left], records[right]
+    low, high = _age_ranges(df)
+    compatible = ~(
+        (low[left_records] > high[right_records] + age_tolerance)
+        | (low[right_records] > high[left_records] + age_tolerance)
+    )
+    left, right = left[compatible], right[compatible]
+    left_records, right_records = left_records[compatible], right_records[compatible]
+    stats["compared_pairs"] = len(left)
+
+    indptr, ids, total = trigram_sets(mentions["text"].tolist())
+    scores = trigram_similarity(indptr, ids, total, left, right)
+    is_alias = mentions["is_alias"].to_numpy()
+
+    matches = pd.DataFrame(
+        {
+            "left": left_records,
+            "right": right_records,
+            "score": scores,
+            "alias_match": is_alias[left] | is_alias[right],
+        }
+    )
+    matches = matches[matches["score"] >= threshold]
+    matches = matches.sort_values("score", ascending=False, kind="stable").drop_duplicates(
+        ["left", "right"]
+    )
+    stats["matched_pairs"] = len(matches)
+
+    keys = df[key].to_numpy()
+    pairs = pd.DataFrame(
+        {
+            f"{key}_left": keys[matches["left"].to_numpy()],
+            f"{key}_right": keys[matches["right"].to_numpy()],
+            "score": matches["score"].to_numpy().round(4),
+            "alias_match": matches["alias_match"].to_numpy(),
+        }
+    )
+    pairs.attrs["entity_resolution"] = stats
+    return pairs
+
+
+def connected_components(count, left, right):
+    """
+    Agrupa os registros ligados por pares, direta ou indiretamente.
+
+    Cada registro começa com o próprio índice como rótulo; a cada passo, os dois lados de
+    cada par recebem o menor rótulo entre eles e os rótulos são encurtados (`labels[labels]`)
+    até não mudarem mais.
+
+    Args:
+        count (int): Número de registros.
+        left (np.ndarray): Índices da esquerda de cada par.
+        right (np.ndarray): Índices da direita de cada par.
+
+    Returns:
+        np.ndarray: O rótulo de cada registro, igual ao menor índice do seu grupo.
+    """
+    labels = np.arange(count)
+    while True:
+        smallest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, smallest)
+        np.minimum.at(updated, right, smallest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def resolve_entities(
+    df,
+    key="uid",
+    threshold=DEFAULT_THRESHOLD,
+    max_block_size=MAX_BLOCK_SIZE,
+    age_tolerance=AGE_TOLERANCE,
+    entity_column=ENTITY_COLUMN,
+):
+    """
+    Identifica os registros duplicados e atribui a cada um o identificador da sua entidade.
+
+    Registros ligados por pares de `find_duplicates`, direta ou indiretamente, formam um
+    grupo, e o identificador da entidade é a menor chave do grupo. Registros sem duplicatas
+    recebem a própria chave.
+
+    Args:
+        df (pd.DataFrame): O DataFrame transformado.
+        key (str): Coluna com o identificador do registro (default: "uid").
+        threshold (float): Score mínimo para considerar um par duplicado (default: 0.75).
+        max_block_size (int): Número máximo de registros por bloco (default: `MAX_BLOCK_SIZE`).
+        age_tolerance (int): Diferença de idade tolerada, em anos (default: 5).
+        entity_column (str): Nome da coluna criada (default: "entity_id").
+
+    Returns:
+        pd.DataFrame: O DataFrame com a coluna `entity_column`. As contagens de cada etapa
+            ficam em `attrs["entity_resolution"]`; os pares podem ser obtidos com
+            `find_duplicates`.
+    """
+    # Um arquivo acrescentado por várias execuções repete os uids; só a última versão de
+    # cada registro é comparada, e as repetições recebem a entidade dela.
+    unique = df.drop_duplicates(subset=[key], keep="last")
+    pairs = find_duplicates(
+        unique,
+        key=key,
+        threshold=threshold,
+        max_block_size=max_block_size,
+        age_tolerance=age_tolerance,
+    )
+    positions = pd.Index(unique[key])
+    labels = connected_components(
+        len(unique),
+        positions.get_indexer(pairs[f"{key}_left"]),
+        positions.get_indexer(pairs[f"{key}_right"]),
+    )
+
+    # A menor chave do grupo não depende da ordem das linhas nem das páginas.
+    keys = unique[key].to_numpy()
+    entities = pd.Series(keys).groupby(labels).transform("min").to_numpy()
+    df[entity_column] = df[key].map(dict(zip(keys, entities)))
+    stats = dict(pairs.attrs["entity_resolution"])
+    sizes = np.bincount(labels, minlength=len(unique))
+    stats["clusters"] = int((sizes > 1).sum())
+    stats["duplicate_records"] = int(sizes[sizes > 1].sum())
+    df.attrs["entity_resolution"] = stats
+
+    logging.info(
+        Fore.GREEN
+        + f"Resolução de entidades: {stats['candidate_pairs']} pares candidatos, "
+        + f"{stats['matched_pairs']} duplicados, {stats['clusters']} grupos com "
+        + f"{stats['duplicate_records']} registros."
+        + Style.RESET_ALL
+    )
+    return df
@@ -0,0 +1,76 @@
+import pandas as pd
+import importlib.util
+from src.transform_fuctions.transform_data import LIST_COLUMNS
+
+CHILD_VALUE_NAMES = {
+    "occupations": "occupation",
+    "locations": "location",
+    "subjects": "subject",
+    "aliases": "alias",
+}
+
+
+def to_arrow_list_columns(df, columns=LIST_COLUMNS):
+    """
+    Converte as colunas de listas nativas para listas em Arrow, quando o pyarrow está instalado.
+
+    Args:
+        df (pd.DataFrame): DataFrame criado com `keep_lists=True`.
+        columns (list): Colunas de listas a converter (default: `LIST_COLUMNS`).
+
+    Returns:
+        pd.DataFrame: O DataFrame com as colunas em `list<string>` do Arrow, ou inalterado sem pyarrow.
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        return df
+
+    import pyarrow as pa
+
+    list_dtype = pd.ArrowDtype(pa.list_(pa.string()))
+    for column in columns:
+        df[column] = df[column].astype(list_dtype)
+    return df
+
+
+def explode_child_tables(df, columns=LIST_COLUMNS, id_column="uid"):
+    """
+    Gera tabelas filhas normalizadas (pessoa -> valor) a partir das colunas de listas.
+
+    Cada tabela tem uma linha por par pessoa/valor. Carregadas em tabelas com índice em
+    `person_id` e no valor, elas permitem que consultas como "quem é procurado na localização
+    X" sejam feitas por junção indexada em vez de busca textual. A criação e a carga dessas
+    tabelas ficam a cargo de quem chama a função: a carga da linha de comando não as gera.
+
+    Args:
+        df (pd.DataFrame): DataFrame criado com `keep_lists=True`.
+        columns (list): Colunas de listas a normalizar (default: `LIST_COLUMNS`).
+        id_column (str, optional): Coluna com o identificador estável da pessoa, que liga as
+            tabelas filhas à tabela `wanted`. Se None, usa o índice do DataFrame, que não é
+            estável entre execuções nem entre lotes (default: "uid").
+
+    Returns:
+        dict: Dicionário com o nome da coluna como chave e um DataFrame com as colunas
+              `person_id` e o valor no singular (ex: `location`) como valor.
+
+    Raises:
+        ValueError: Caso uma coluna tenha sido concatenada em strings.
+    """
+    person_ids = df.index if id_column is None else df[id_column]
+    child_tables = {}
+
+    for column in columns:
+        values = df[column]
+        if pd.api.types.infer_dtype(values, skipna=True) == "string":
+            raise ValueError(
+                f"A coluna '{column}' foi concatenada em strings; crie o DataFrame com keep_lists=True."
+            )
+
+        value_name = CHILD_VALUE_NAMES.get(column, column)
+        child = (
+            pd.DataFrame({"person_id": list(person_ids), value_name: list(values)})
+            .explode(value_name, ignore_index=True)
+            .dropna(subset=[value_name])
+        )
+        child_tables[column] = child.drop_duplicates(ignore_index=True)
+
+    return child_tables
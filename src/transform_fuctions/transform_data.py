@@ -1,7 +1,41 @@
 # transform_data.py
 import pandas as pd
 import numpy as np
+import hashlib
+import html
+import importlib.util
+import logging
 import re
+from colorama import Fore, Style
+
+COLUMNS = [
+    "uid",
+    "name",
+    "age_max",
+    "age_min",
+    "sex",
+    "warning_message",
+    "race",
+    "place_of_birth",
+    "details",
+    "occupations",
+    "locations",
+    "subjects",
+    "aliases",
+    "reward_text",
+    "scars_and_marks",
+    "caution",
+]
+LIST_COLUMNS = ["occupations", "locations", "subjects", "aliases"]
+INTEGER_COLUMNS = ["age_max", "age_min"]
+TEXT_COLUMNS = ["details", "reward_text", "caution"]
+CATEGORY_COLUMNS = ["sex", "race", "place_of_birth"]
+NULL_VALUE = "Null"
+HASH_SEPARATOR = "\x1f"
+
+# Tags HTML com ou sem atributos; o separador nunca é consumido para não unir valores vizinhos.
+TAG_PATTERN = re.compile(r"<[^>\x00]*>")
+VALUE_SEPARATOR = "\x00"
 
 
 def transform_data_for_columns(extracted_data):
@@ -13,29 +47,12 @@ def transform_data_for_columns(extracted_data):
     Returns:
         list of lists: Lista de listas de dados para cada coluna.
     """
-    columns_name = [
-        "name",
-        "age_max",
-        "age_min",
-        "sex",
-        "warning_message",
-        "race",
-        "place_of_birth",
-        "details",
-        "occupations",
-        "locations",
-        "subjects",
-        "aliases",
-        "reward_text",
-        "scars_and_marks",
-        "caution",
-    ]
-    column_data = {col: [] for col in columns_name}
+    column_data = {col: [] for col in COLUMNS}
     for item in extracted_data:
-        for col in columns_name:
+        for col in COLUMNS:
             column_data[col].append(item.get(col, None))
 
-    return [column_data[col] for col in columns_name]
+    return [column_data[col] for col in COLUMNS]
 
 
 def columns_with_values(extracted_data):
@@ -48,29 +65,12 @@ def columns_with_values(extracted_data):
     Returns:
         dict: Um dicionário com as chaves sendo os nomes das colunas e os valores sendo as listas de dados correspondentes.
     """
-    columns_name = [
-        "name",
-        "age_max",
-        "age_min",
-        "sex",
-        "warning_message",
-        "race",
-        "place_of_birth",
-        "details",
-        "occupations",
-        "locations",
-        "subjects",
-        "aliases",
-        "reward_text",
-        "scars_and_marks",
-        "caution",
-    ]
-    if len(columns_name) != len(extracted_data):
+    if len(COLUMNS) != len(extracted_data):
         raise ValueError(
             "O número de nomes de colunas deve ser igual ao número de listas de dados."
         )
 
-    return {columns_name[i]: extracted_data[i] for i in range(len(columns_name))}
+    return {COLUMNS[i]: extracted_data[i] for i in range(len(COLUMNS))}
 
 
 def create_dataframe(data_dict):
@@ -86,20 +86,80 @@ def create_dataframe(data_dict):
     return pd.DataFrame(data_dict)
 
 
-def separete_values(df):
+def _to_integer_array(values):
+    """Converte valores em um array de inteiros anulável, tratando valores inválidos como NA."""
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").astype("Int64")
+
+
+def build_dataframe(records, keep_lists=False):
+    """
+    Cria o DataFrame final a partir dos registros em uma única passada.
+
+    Substitui a sequência `transform_data_for_columns` -> `columns_with_values` ->
+    `create_dataframe` -> `separete_values` -> `transform_values_for_nan`: a passada sobre os
+    registros só guarda referências aos valores em buffers por coluna. Depois, cada coluna é
+    montada por vez (listas concatenadas, "Null" trocado por NaN e inteiros como `Int64`) e o
+    seu buffer é liberado antes da próxima, então as strings concatenadas de uma coluna não
+    ficam na memória junto com as das demais.
+
+    Args:
+        records (iterable): Dicionários gerados por `iteration_data_wanted` ou `iter_data_wanted`.
+        keep_lists (bool): Se True, mantém as colunas de `LIST_COLUMNS` como listas nativas em vez
+            de concatená-las em strings (default: False).
+
+    Returns:
+        pd.DataFrame: O DataFrame com as colunas definidas em `COLUMNS`.
+    """
+    buffers = {column: [] for column in COLUMNS}
+    appenders = [(column, buffers[column].append) for column in COLUMNS]
+
+    for record in records:
+        get = record.get
+        for column, append in appenders:
+            append(get(column))
+    del appenders
+
+    columns = {}
+    for column in COLUMNS:
+        values = buffers.pop(column)
+        if column in LIST_COLUMNS:
+            if keep_lists:
+                values = [value if isinstance(value, list) else [] for value in values]
+            else:
+                values = [
+                    ", ".join(value) if isinstance(value, list) else value for value in values
+                ]
+        if NULL_VALUE in values:
+            values = [np.nan if value == NULL_VALUE else value for value in values]
+
+        if column in INTEGER_COLUMNS:
+            columns[column] = _to_integer_array(values)
+        else:
+            columns[column] = pd.Series(values)
+        del values
+
+    return pd.DataFrame(columns, columns=COLUMNS)
+
+
+def separete_values(df, keep_lists=False):
     """
     Concatena os valores das colunas de listas em uma string separada por vírgulas.
 
     Args:
         df (pd.DataFrame): O DataFrame a ser transformado.
+        keep_lists (bool): Se True, mantém as colunas como listas nativas, trocando valores
+            ausentes por listas vazias (default: False).
 
     Returns:
         pd.DataFrame: O DataFrame transformado com as listas concatenadas em strings.
     """
-    for column in ["details", "occupations", "locations", "subjects", "aliases"]:
-        df[column] = df[column].apply(
-            lambda x: ", ".join(x) if isinstance(x, list) else x
-        )
+    for column in LIST_COLUMNS:
+        if keep_lists:
+            df[column] = df[column].apply(lambda x: x if isinstance(x, list) else [])
+        else:
+            df[column] = df[column].apply(
+                lambda x: ", ".join(x) if isinstance(x, list) else x
+            )
     return df
 
 
@@ -113,38 +173,62 @@ def transform_values_for_nan(df):
     Returns:
         pd.DataFrame: O DataFrame transformado com os valores especificados substituídos por NaN.
     """
-    return df.replace("Null", np.nan)
+    return df.replace(NULL_VALUE, np.nan)
+
 
+def _clean_markup(text):
+    """Remove tags e quebras de linha de um texto e decodifica as entidades HTML."""
+    text = TAG_PATTERN.sub("", text).replace("\r", "").replace("\n", "")
+    return html.unescape(text) if "&" in text else text
 
-def transform_values_str_with_replace(df):
+
+def strip_markup(series):
     """
-    Substitui substrings específicas na coluna 'details' de um DataFrame.
+    Remove a marcação HTML de uma coluna de texto em uma única passada.
+
+    Os textos da coluna são unidos por um separador e limpos de uma só vez, evitando uma
+    chamada de expressão regular por linha. Valores que não são strings são mantidos.
 
     Args:
-        df (pd.DataFrame): O DataFrame a ser transformado.
+        series (pd.Series): A coluna a ser limpa.
 
     Returns:
-        pd.DataFrame: O DataFrame com a coluna 'details' transformada.
-    """
-    strings_for_replace = [
-        "<p>",
-        "</p>",
-        "<ul>",
-        "</ul>",
-        "\r",
-        "\n",
-        "<li>",
-        "</li>",
-        "<a>",
-        "</a>",
-    ]
+        pd.Series: A coluna sem tags, quebras de linha e entidades HTML.
+    """
+    values = series.tolist()
+    positions = [i for i, value in enumerate(values) if isinstance(value, str)]
+    if not positions:
+        return series
 
-    for string in strings_for_replace:
-        df["details"] = df["details"].str.replace(re.escape(string), "", regex=True)
-        df["reward_text"] = df["reward_text"].str.replace(
-            re.escape(string), "", regex=True
-        )
-        df["caution"] = df["caution"].str.replace(re.escape(string), "", regex=True)
+    texts = [values[i] for i in positions]
+    joined = VALUE_SEPARATOR.join(texts)
+    if joined.count(VALUE_SEPARATOR) == len(texts) - 1:
+        cleaned = _clean_markup(joined).split(VALUE_SEPARATOR)
+    else:
+        cleaned = [_clean_markup(text) for text in texts]
+
+    for i, text in zip(positions, cleaned):
+        values[i] = text
+
+    return pd.Series(values, index=series.index, name=series.name, dtype=series.dtype)
+
+
+def transform_values_str_with_replace(df, columns=TEXT_COLUMNS):
+    """
+    Remove a marcação HTML e decodifica as entidades das colunas de texto de um DataFrame.
+
+    Remove tags com ou sem atributos (ex: `<a href=...>`) e quebras de linha, e decodifica
+    entidades como `&amp;`, percorrendo cada coluna uma única vez com `strip_markup`.
+
+    Args:
+        df (pd.DataFrame): O DataFrame a ser transformado.
+        columns (list): Colunas de texto a serem limpas (default: 'details', 'reward_text' e 'caution').
+
+    Returns:
+        pd.DataFrame: O DataFrame com as colunas de texto transformadas.
+    """
+    for column in columns:
+        df[column] = strip_markup(df[column])
 
     return df
 
@@ -159,7 +243,137 @@ def change_type_values(df):
     Returns:
         pd.DataFrame: O DataFrame com as colunas 'age_max' e 'age_min' com o tipo de dados alterado.
     """
-    for col in ["age_max", "age_min"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    for col in INTEGER_COLUMNS:
+        df[col] = _to_integer_array(df[col])
 
     return df
+
+
+def memory_usage_bytes(df):
+    """Retorna o uso de memória de um DataFrame em bytes, incluindo o conteúdo das strings."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _smallest_integer_dtype(series):
+    """Escolhe o menor tipo inteiro anulável capaz de representar os valores da coluna."""
+    if series.notna().sum() == 0:
+        return "Int8"
+    low, high = series.min(), series.max()
+    for dtype in ("Int8", "Int16", "Int32"):
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return dtype
+    return "Int64"
+
+
+def _string_dtype():
+    """Usa strings em Arrow quando o pyarrow está instalado, com fallback para o tipo string do pandas."""
+    if importlib.util.find_spec("pyarrow") is not None:
+        return pd.StringDtype("pyarrow")
+    return pd.StringDtype()
+
+
+def optimize_dtypes(df, category_columns=CATEGORY_COLUMNS, max_category_ratio=0.5):
+    """
+    Reduz o uso de memória do DataFrame ajustando o tipo de cada coluna.
+
+    As colunas de `category_columns` com poucos valores distintos viram `category`, as demais
+    colunas de texto passam a usar strings em Arrow (quando disponível) e as colunas inteiras
+    usam o menor tipo inteiro que comporta os valores. O uso de memória antes e depois fica
+    registrado no log e em `df.attrs["memory_usage"]`.
+
+    Args:
+        df (pd.DataFrame): O DataFrame retornado por `change_type_values`.
+        category_columns (list): Colunas candidatas a `category` (default: 'sex', 'race' e 'place_of_birth').
+        max_category_ratio (float): Proporção máxima de valores distintos por linha para usar `category` (default: 0.5).
+
+    Returns:
+        pd.DataFrame: O DataFrame com os tipos otimizados.
+    """
+    before = memory_usage_bytes(df)
+    string_dtype = _string_dtype()
+
+    for column in df.columns:
+        series = df[column]
+        if column in INTEGER_COLUMNS:
+            df[column] = series.astype(_smallest_integer_dtype(series))
+        elif pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+            continue
+        elif (
+            column in category_columns
+            and series.nunique(dropna=True) <= max_category_ratio * max(len(series), 1)
+        ):
+            df[column] = series.astype("category")
+        else:
+            df[column] = series.astype(string_dtype)
+
+    after = memory_usage_bytes(df)
+    df.attrs["memory_usage"] = {"before_bytes": before, "after_bytes": after}
+    logging.info(
+        Fore.GREEN
+        + f"Uso de memória do DataFrame: {before / 2**20:.2f} MiB -> {after / 2**20:.2f} MiB."
+        + Style.RESET_ALL
+    )
+    return df
+
+
+def _hash_value(value):
+    """Representa um valor de forma estável para o cálculo do hash de conteúdo."""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(map(str, value))
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return "\\N"
+    return str(value)
+
+
+def add_content_hash(df, key="uid", hash_column="content_hash"):
+    """
+    Adiciona a cada registro um hash SHA-1 calculado sobre os campos transformados.
+
+    O hash muda sempre que algum campo do registro muda, o que permite à carga gravar
+    somente os registros novos ou alterados. A coluna `key` não entra no cálculo.
+
+    Args:
+        df (pd.DataFrame): O DataFrame transformado.
+        key (str): Coluna com o identificador estável do registro (default: "uid").
+        hash_column (str): Nome da coluna de hash a ser criada (default: "content_hash").
+
+    Returns:
+        pd.DataFrame: O DataFrame com a coluna de hash.
+    """
+    columns = [column for column in df.columns if column not in (key, hash_column)]
+    df[hash_column] = [
+        hashlib.sha1(
+            HASH_SEPARATOR.join(map(_hash_value, row)).encode("utf-8")
+        ).hexdigest()
+        for row in df[columns].itertuples(index=False, name=None)
+    ]
+    return df
+
+
+def transform_batch(records):
+    """
+    Aplica todas as etapas de transformação a um lote de registros.
+
+    Args:
+        records (list): Lote de dicionários gerado por `iter_batches`.
+
+    Returns:
+        pd.DataFrame: O DataFrame transformado do lote.
+    """
+    df = build_dataframe(records=records)
+    return transform_values_str_with_replace(df=df)
+
+
+def iter_transformed_batches(batches):
+    """
+    Transforma lotes de registros à medida que são gerados.
+
+    Args:
+        batches (iterable): Lotes de registros, como os gerados por `iter_batches`.
+
+    Yields:
+        pd.DataFrame: Um DataFrame transformado para cada lote.
+    """
+    for records in batches:
+        yield transform_batch(records)
@@ -0,0 +1,187 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.load_fuctions.bulk_loader import (
+    _upsert_suffix,
+    count_rows,
+    insert_dataframe_batched,
+    upsert_dataframe,
+)
+from src.load_fuctions.parallel_loader import partition_dataframe
+
+TABLE = "wanted"
+
+
+class FakeMySQLConnection:
+    """Conexão mínima que só informa a versão do servidor, como a do `mysql.connector`."""
+
+    def __init__(self, server_info):
+        self.server_info = server_info
+
+    def get_server_info(self):
+        return self.server_info
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.execute(
+        f"CREATE TABLE {TABLE} (uid TEXT PRIMARY KEY, name TEXT, content_hash TEXT, "
+        "deleted_at TEXT)"
+    )
+    yield connection
+    connection.close()
+
+
+def make_frame(rows):
+    return pd.DataFrame(rows, columns=["uid", "name", "content_hash"])
+
+
+def read_table(connection):
+    return connection.execute(
+        f"SELECT uid, name, content_hash, deleted_at FROM {TABLE} ORDER BY uid"
+    ).fetchall()
+
+
+def test_insert_dataframe_batched_inserts_every_row_across_batches(connection):
+    df = make_frame([(f"u{i:02d}", f"Nome {i}", f"h{i}") for i in range(25)])
+
+    report = insert_dataframe_batched(connection, df, TABLE, batch_size=10)
+
+    assert report["rows"] == 25
+    assert count_rows(connection, TABLE) == 25
+    assert read_table(connection)[0] == ("u00", "Nome 0", "h0", None)
+
+
+def test_insert_dataframe_batched_writes_missing_values_as_null(connection):
+    df = make_frame([("a", None, "h1"), ("b", float("nan"), "h2")])
+
+    insert_dataframe_batched(connection, df, TABLE)
+
+    assert [row[1] for row in read_table(connection)] == [None, None]
+
+
+def test_insert_dataframe_batched_rolls_back_the_whole_load(connection):
+    df = make_frame([("a", "Ana", "h1"), ("a", "Ana", "h1")])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        insert_dataframe_batched(connection, df, TABLE, batch_size=1)
+
+    assert count_rows(connection, TABLE) == 0
+
+
+def test_upsert_dataframe_inserts_new_rows(connection):
+    df = make_frame([("a", "Ana", "h1"), ("b", "Bia", "h2")])
+
+    report = upsert_dataframe(connection, df, TABLE)
+
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (2, 0, 0)
+    assert count_rows(connection, TABLE) == 2
+
+
+def test_upsert_dataframe_skips_unchanged_rows(connection):
+    df = make_frame([("a", "Ana", "h1"), ("b", "Bia", "h2")])
+    upsert_dataframe(connection, df, TABLE)
+
+    report = upsert_dataframe(connection, df, TABLE)
+
+    assert report["rows"] == 0
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (0, 0, 2)
+
+
+def test_upsert_dataframe_updates_changed_rows(connection):
+    upsert_dataframe(connection, make_frame([("a", "Ana", "h1"), ("b", "Bia", "h2")]), TABLE)
+
+    report = upsert_dataframe(
+        connection, make_frame([("a", "Ana Maria", "h3"), ("b", "Bia", "h2")]), TABLE
+    )
+
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (0, 1, 1)
+    assert read_table(connection)[0] == ("a", "Ana Maria", "h3", None)
+
+
+def test_upsert_dataframe_soft_deletes_missing_rows(connection):
+    options = {"soft_delete_column": "deleted_at"}
+    df = make_frame([("a", "Ana", "h1"), ("b", "Bia", "h2")])
+    upsert_dataframe(connection, df, TABLE, **options)
+
+    report = upsert_dataframe(connection, df.iloc[:1], TABLE, **options)
+
+    assert report["deleted"] == 1
+    rows = read_table(connection)
+    assert rows[0][3] is None
+    assert rows[1][3] is not None
+    assert count_rows(connection, TABLE) == 2
+
+
+def test_upsert_dataframe_restores_rows_that_reappear(connection):
+    options = {"soft_delete_column": "deleted_at"}
+    df = make_frame([("a", "Ana", "h1"), ("b", "Bia", "h2")])
+    upsert_dataframe(connection, df, TABLE, **options)
+    upsert_dataframe(connection, df.iloc[:1], TABLE, **options)
+
+    report = upsert_dataframe(connection, df, TABLE, **options)
+
+    assert (report["inserted"], report["updated"], report["restored"]) == (0, 0, 1)
+    assert (report["unchanged"], report["deleted"]) == (1, 0)
+    assert [row[3] for row in read_table(connection)] == [None, None]
+
+
+def test_upsert_dataframe_uses_the_given_stored_hashes(connection):
+    upsert_dataframe(connection, make_frame([("a", "Ana", "h1")]), TABLE)
+
+    report = upsert_dataframe(
+        connection, make_frame([("a", "Ana", "h1")]), TABLE, stored_hashes={"a": "h0"}
+    )
+
+    assert (report["inserted"], report["updated"]) == (0, 1)
+
+
+@pytest.mark.parametrize("server_info", ["8.0.19", "8.0.36", "8.4.2-log"])
+def test_upsert_suffix_uses_the_row_alias_on_recent_mysql(server_info):
+    suffix = _upsert_suffix(FakeMySQLConnection(server_info), ["uid", "name"], "uid")
+
+    assert suffix == " AS `new` ON DUPLICATE KEY UPDATE `name` = `new`.`name`"
+
+
+@pytest.mark.parametrize(
+    "server_info", ["8.0.18", "5.7.44", "10.11.6-MariaDB", "5.5.5-10.6.12-MariaDB-log", ""]
+)
+def test_upsert_suffix_falls_back_to_values_function(server_info):
+    suffix = _upsert_suffix(FakeMySQLConnection(server_info), ["uid", "name"], "uid")
+
+    assert suffix == " ON DUPLICATE KEY UPDATE `name` = VALUES(`name`)"
+
+
+def test_upsert_suffix_uses_on_conflict_on_sqlite(connection):
+    suffix = _upsert_suffix(connection, ["uid", "name"], "uid")
+
+    assert suffix == " ON CONFLICT (`uid`) DO UPDATE SET `name` = excluded.`name`"
+
+
+def test_partition_dataframe_splits_every_row_once():
+    df = make_frame([(f"u{i}", f"Nome {i}", f"h{i}") for i in range(100)])
+
+    partitions = partition_dataframe(df, 4)
+
+    assert len(partitions) == 4
+    assert sum(len(partition) for partition in partitions) == 100
+    assert sorted(pd.concat(partitions)["uid"]) == sorted(df["uid"])
+
+
+def test_partition_dataframe_keeps_each_key_in_one_partition():
+    df = make_frame([(f"u{i % 10}", "Nome", f"h{i}") for i in range(50)])
+
+    partitions = partition_dataframe(df, 3)
+
+    owners = {}
+    for index, partition in enumerate(partitions):
+        for uid in partition["uid"]:
+            assert owners.setdefault(uid, index) == index
+
+
+def test_partition_dataframe_rejects_fewer_than_one_partition():
+    with pytest.raises(ValueError):
+        partition_dataframe(make_frame([]), 0)